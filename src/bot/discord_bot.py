@@ -17,6 +17,9 @@ from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Send order when the hourly quota can't cover every pending alert
+_SEVERITY_PRIORITY = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+
 
 class PolymarketBot(discord.Client):
     """Discord bot for Polymarket monitoring."""
@@ -28,7 +31,8 @@ class PolymarketBot(discord.Client):
         color_config: Optional[dict] = None,
         max_alerts_per_hour: int = 60,
         max_alerts_per_batch: int = 2,
-        delay_between_alerts: int = 15
+        delay_between_alerts: int = 15,
+        alert_queue: Optional[asyncio.Queue] = None
     ):
         """
         Initialize Polymarket Discord bot.
@@ -40,6 +44,9 @@ class PolymarketBot(discord.Client):
             max_alerts_per_hour: Maximum alerts per hour (default: 60)
             max_alerts_per_batch: Maximum alerts per check cycle (default: 2)
             delay_between_alerts: Seconds between individual alerts (default: 15)
+            alert_queue: Optional queue of new alert IDs from the monitoring
+                loop, sent as they arrive; unsent alerts are still picked up
+                from the database
         """
         # Set up intents
         intents = discord.Intents.default()
@@ -65,6 +72,13 @@ class PolymarketBot(discord.Client):
         self.max_alerts_per_batch = max_alerts_per_batch
         self.delay_between_alerts = delay_between_alerts
 
+        # Alert hand-off from the monitoring loop (same process only). The
+        # lock keeps the queue consumer and the database check from sending
+        # at the same time
+        self.alert_queue = alert_queue
+        self._alert_queue_task: Optional[asyncio.Task] = None
+        self._send_lock = asyncio.Lock()
+
         logger.info(f"Polymarket bot initialized with rate limiting: "
                    f"{max_alerts_per_hour}/hour, {max_alerts_per_batch}/batch, "
                    f"{delay_between_alerts}s delay")
@@ -76,6 +90,8 @@ class PolymarketBot(discord.Client):
 
         # Start background tasks
         self.check_alerts_task.start()
+        if self.alert_queue is not None:
+            self._alert_queue_task = asyncio.create_task(self._consume_alert_queue())
 
         logger.info("Bot setup hook complete")
 
@@ -343,22 +359,77 @@ class PolymarketBot(discord.Client):
             logger.error(f"Error handling alerts command: {e}", exc_info=True)
             await interaction.followup.send("Error retrieving alerts", ephemeral=True)
 
+    def _alerts_remaining(self) -> int:
+        """
+        Get how many alerts can still be sent under the hourly limit.
+
+        Returns:
+            Number of alerts remaining this hour
+        """
+        # Clean up old timestamps (older than 1 hour)
+        now = datetime.utcnow()
+        self.alerts_sent_last_hour = [
+            ts for ts in self.alerts_sent_last_hour
+            if (now - ts).total_seconds() < 3600
+        ]
+        return self.max_alerts_per_hour - len(self.alerts_sent_last_hour)
+
+    async def _consume_alert_queue(self):
+        """
+        Send alerts pushed by the monitoring loop as soon as they arrive.
+
+        Everything queued at that point is sent as one batch, most severe
+        first, so low severity alerts can't use up the hourly quota ahead
+        of a critical one.
+        """
+        await self.wait_until_ready()
+
+        while not self.is_closed():
+            alert_ids = [await self.alert_queue.get()]
+            while not self.alert_queue.empty():
+                alert_ids.append(self.alert_queue.get_nowait())
+            try:
+                # Alerts that can't be sent now stay unsent in the database
+                # and are retried by check_alerts_task
+                if not self.is_ready or not self.alert_channel:
+                    continue
+
+                async with self._send_lock:
+                    alerts = [self.db.get_alert(alert_id) for alert_id in alert_ids]
+                    alerts = sorted(
+                        (a for a in alerts if a is not None and not a.sent_to_discord),
+                        key=lambda a: _SEVERITY_PRIORITY.get(a.severity, 999)
+                    )
+
+                    for alert in alerts:
+                        if self._alerts_remaining() <= 0:
+                            logger.warning("Hourly rate limit reached, leaving queued alerts unsent")
+                            break
+
+                        await self.send_alert(alert)
+                        self.alerts_sent_last_hour.append(datetime.utcnow())
+                        await asyncio.sleep(self.delay_between_alerts)
+
+            except Exception as e:
+                logger.error(f"Error sending queued alerts {alert_ids}: {e}", exc_info=True)
+            finally:
+                for _ in alert_ids:
+                    self.alert_queue.task_done()
+
     @tasks.loop(seconds=60)  # Check every 60 seconds instead of 10
     async def check_alerts_task(self):
         """Background task to check for unsent alerts with rate limiting."""
         if not self.is_ready or not self.alert_channel:
             return
 
-        try:
-            # Clean up old timestamps (older than 1 hour)
-            now = datetime.utcnow()
-            self.alerts_sent_last_hour = [
-                ts for ts in self.alerts_sent_last_hour
-                if (now - ts).total_seconds() < 3600
-            ]
+        async with self._send_lock:
+            await self._send_unsent_alerts()
 
+    async def _send_unsent_alerts(self):
+        """Send unsent alerts from the database with rate limiting."""
+        try:
             # Check if we've hit the hourly limit
-            alerts_remaining = self.max_alerts_per_hour - len(self.alerts_sent_last_hour)
+            alerts_remaining = self._alerts_remaining()
             if alerts_remaining <= 0:
                 logger.warning(f"Rate limit reached: {self.max_alerts_per_hour} alerts sent in last hour")
                 return
@@ -369,10 +440,9 @@ class PolymarketBot(discord.Client):
             unsent_alerts = self.db.get_unsent_alerts(limit=fetch_limit)
 
             # Filter and sort by severity (critical, high, medium, low)
-            severity_priority = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
             unsent_alerts_sorted = sorted(
                 unsent_alerts,
-                key=lambda a: severity_priority.get(a.severity, 999)
+                key=lambda a: _SEVERITY_PRIORITY.get(a.severity, 999)
             )
 
             # Send alerts with rate limiting
@@ -466,6 +536,8 @@ class PolymarketBot(discord.Client):
         # Stop background tasks
         if self.check_alerts_task.is_running():
             self.check_alerts_task.cancel()
+        if self._alert_queue_task is not None:
+            self._alert_queue_task.cancel()
 
         # Send shutdown message
         if self.alert_channel:
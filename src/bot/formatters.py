@@ -7,8 +7,8 @@ Creates rich embeds with color-coding and comprehensive information.
 import discord
 from datetime import datetime
 from typing import Dict, Any, Optional
-import json
 
+from utils.json_codec import loads as json_loads
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -51,7 +51,7 @@ class AlertFormatter:
 
         # Parse details if it's a JSON string
         if isinstance(details, str):
-            details = json.loads(details)
+            details = json_loads(details)
 
         bet_size = details.get('bet_size', 0)
         address = details.get('address', 'unknown')
@@ -186,7 +186,7 @@ class AlertFormatter:
 
         # Parse details if it's a JSON string
         if isinstance(details, str):
-            details = json.loads(details)
+            details = json_loads(details)
 
         bet_size = details.get('bet_size', 0)
         address = details.get('address', 'unknown')
@@ -309,7 +309,7 @@ class AlertFormatter:
 
         # Parse details if it's a JSON string
         if isinstance(details, str):
-            details = json.loads(details)
+            details = json_loads(details)
 
         alert_type = alert_data.get('alert_type', 'pattern')
         address = details.get('address', 'unknown')
@@ -423,7 +423,7 @@ class AlertFormatter:
 
         # Parse details if it's a JSON string
         if isinstance(details, str):
-            details = json.loads(details)
+            details = json_loads(details)
 
         detections = details.get('detections', [])
         bet_size = details.get('bet_size', 0)
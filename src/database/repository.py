@@ -5,13 +5,15 @@ Provides data access methods for all database operations.
 """
 
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
-from sqlalchemy import create_engine, desc, and_, func, text
+from typing import List, Optional, Dict, Any, Tuple, Iterator
+from sqlalchemy import create_engine, desc, and_, or_, func, text, event
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.exc import SQLAlchemyError
-import json
 
 from .models import Base, Market, Bet, Alert, MarketStatistics, SystemState
+from utils.json_codec import dumps as json_dumps
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -20,21 +22,55 @@ logger = get_logger(__name__)
 class DatabaseRepository:
     """Repository for database operations."""
 
-    def __init__(self, database_path: str, echo: bool = False):
+    def __init__(
+        self,
+        database_path: str,
+        echo: bool = False,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pragmas: Optional[Dict[str, Any]] = None
+    ):
         """
         Initialize database repository.
 
+        One repository (and so one connection pool) is shared by the
+        monitoring and Discord loops.
+
         Args:
-            database_path: Path to SQLite database file
+            database_path: Path to SQLite database file, or ':memory:' for
+                a private in-memory database
             echo: Whether to echo SQL queries to console
+            pool_size: Connections kept open in the pool
+            max_overflow: Extra connections allowed beyond pool_size
+            pragmas: SQLite pragmas run on every new connection
+                (e.g. {'synchronous': 'NORMAL'})
         """
         self.database_path = database_path
+        if database_path == ':memory:':
+            # Each connection would otherwise open its own empty database
+            pool_args = {'poolclass': StaticPool}
+        else:
+            pool_args = {'pool_size': pool_size, 'max_overflow': max_overflow}
         self.engine = create_engine(
             f'sqlite:///{database_path}',
             echo=echo,
-            connect_args={'check_same_thread': False}  # Needed for SQLite with threads
+            connect_args={'check_same_thread': False},  # Needed for SQLite with threads
+            **pool_args
         )
 
+        # Per-connection settings must be applied as each connection opens
+        if pragmas:
+            statements = [f'PRAGMA {name}={value}' for name, value in pragmas.items()]
+
+            @event.listens_for(self.engine, 'connect')
+            def _apply_pragmas(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                try:
+                    for statement in statements:
+                        cursor.execute(statement)
+                finally:
+                    cursor.close()
+
         # Enable WAL mode for better concurrency
         with self.engine.connect() as conn:
             conn.execute(text('PRAGMA journal_mode=WAL'))
@@ -87,6 +123,37 @@ class DatabaseRepository:
         finally:
             session.close()
 
+    def upsert_markets_bulk(self, markets_data: List[Dict[str, Any]]) -> int:
+        """
+        Insert or update many markets in a single statement.
+
+        Args:
+            markets_data: Market data dictionaries (same keys in each)
+
+        Returns:
+            Number of markets written
+        """
+        if not markets_data:
+            return 0
+
+        session = self.get_session()
+        try:
+            stmt = sqlite_insert(Market).values(markets_data)
+            update_columns = {
+                key: stmt.excluded[key] for key in markets_data[0] if key != 'id'
+            }
+            update_columns['last_updated'] = datetime.utcnow()
+            session.execute(stmt.on_conflict_do_update(index_elements=['id'], set_=update_columns))
+            session.commit()
+            return len(markets_data)
+
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error(f"Error upserting markets: {e}", extra={'market_count': len(markets_data)})
+            raise
+        finally:
+            session.close()
+
     def get_market(self, market_id: str) -> Optional[Market]:
         """Get market by ID."""
         session = self.get_session()
@@ -146,6 +213,49 @@ class DatabaseRepository:
         finally:
             session.close()
 
+    def insert_bets_bulk(self, bets_data: List[Dict[str, Any]]) -> List[Bet]:
+        """
+        Insert many bets in a single transaction.
+
+        Bets whose order_id already exists, in the database or earlier in
+        the batch, are skipped.
+
+        Args:
+            bets_data: Bet data dictionaries
+
+        Returns:
+            Newly inserted Bet instances, in input order
+        """
+        if not bets_data:
+            return []
+
+        session = self.get_session()
+        session.expire_on_commit = False  # Returned bets stay readable after close
+        try:
+            order_ids = [bet_data['order_id'] for bet_data in bets_data]
+            seen = {
+                row.order_id
+                for row in session.query(Bet.order_id).filter(Bet.order_id.in_(order_ids))
+            }
+
+            bets = []
+            for bet_data in bets_data:
+                if bet_data['order_id'] in seen:
+                    continue
+                seen.add(bet_data['order_id'])
+                bets.append(Bet(**bet_data))
+
+            session.add_all(bets)
+            session.commit()
+            return bets
+
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error(f"Error inserting bets: {e}", extra={'bet_count': len(bets_data)})
+            raise
+        finally:
+            session.close()
+
     def get_bets_by_market(
         self,
         market_id: str,
@@ -179,6 +289,173 @@ class DatabaseRepository:
         finally:
             session.close()
 
+    def iter_bets_by_market(
+        self,
+        market_id: str,
+        since: Optional[datetime] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Bet]:
+        """
+        Stream bets for a market without loading them all at once.
+
+        Rows are fetched from the cursor in batches of batch_size; the
+        session stays open until the iterator is exhausted or closed.
+
+        Args:
+            market_id: Market ID
+            since: Only return bets after this timestamp
+            batch_size: Number of rows fetched per round trip
+
+        Yields:
+            Bet instances in chronological order
+        """
+        session = self.get_session()
+        try:
+            query = session.query(Bet).filter_by(market_id=market_id)
+
+            if since:
+                query = query.filter(Bet.timestamp >= since)
+
+            yield from query.order_by(Bet.timestamp, Bet.id).yield_per(batch_size)
+        finally:
+            session.close()
+
+    def get_bets_by_markets(
+        self,
+        market_ids: List[str],
+        since: Optional[datetime] = None
+    ) -> Dict[str, List[Bet]]:
+        """
+        Get bets for several markets in a single query.
+
+        Args:
+            market_ids: List of market IDs
+            since: Only return bets after this timestamp
+
+        Returns:
+            Dictionary mapping market ID to its bets, newest first
+        """
+        if not market_ids:
+            return {}
+
+        session = self.get_session()
+        try:
+            query = session.query(Bet).filter(Bet.market_id.in_(market_ids))
+
+            if since:
+                query = query.filter(Bet.timestamp >= since)
+
+            bets_by_market: Dict[str, List[Bet]] = {}
+            for bet in query.order_by(desc(Bet.timestamp)):
+                bets_by_market.setdefault(bet.market_id, []).append(bet)
+
+            return bets_by_market
+        finally:
+            session.close()
+
+    def get_recent_bets(
+        self,
+        since: Optional[datetime] = None,
+        market_ids: Optional[List[str]] = None,
+        after: Optional[Tuple[datetime, int]] = None,
+        limit: Optional[int] = None
+    ) -> List[Bet]:
+        """
+        Get bets in chronological order with keyset pagination.
+
+        Pass the (timestamp, id) of the last bet of the previous page as
+        `after` to fetch the next page without OFFSET scans.
+
+        Args:
+            since: Only return bets after this timestamp
+            market_ids: Optional list of market IDs to filter by
+            after: Cursor of (timestamp, id) to resume after
+            limit: Maximum number of bets to return
+
+        Returns:
+            List of Bet instances ordered by (timestamp, id)
+        """
+        session = self.get_session()
+        try:
+            filters = []
+
+            if since:
+                filters.append(Bet.timestamp >= since)
+
+            if market_ids is not None:
+                filters.append(Bet.market_id.in_(market_ids))
+
+            if after:
+                after_timestamp, after_id = after
+                filters.append(or_(
+                    Bet.timestamp > after_timestamp,
+                    and_(Bet.timestamp == after_timestamp, Bet.id > after_id)
+                ))
+
+            query = session.query(Bet).filter(*filters).order_by(Bet.timestamp, Bet.id)
+
+            if limit:
+                query = query.limit(limit)
+
+            return query.all()
+        finally:
+            session.close()
+
+    def get_bet_sizes_after_id(
+        self,
+        market_id: str,
+        after_id: int = 0,
+        since: Optional[datetime] = None
+    ) -> List[Tuple[int, datetime, float]]:
+        """
+        Get lightweight bet rows for a market added after a given bet ID.
+
+        Used to incrementally sync in-memory per-market buffers: bet IDs
+        only increase, so passing the highest ID already seen returns just
+        the new bets.
+
+        Args:
+            market_id: Market ID
+            after_id: Only return bets with a higher ID
+            since: Only return bets after this timestamp
+
+        Returns:
+            List of (id, timestamp, size) rows ordered by ID
+        """
+        session = self.get_session()
+        try:
+            query = session.query(Bet.id, Bet.timestamp, Bet.size).filter(
+                Bet.market_id == market_id,
+                Bet.id > after_id
+            )
+
+            if since:
+                query = query.filter(Bet.timestamp >= since)
+
+            return query.order_by(Bet.id).all()
+        finally:
+            session.close()
+
+    def get_bets_by_ids(self, bet_ids: List[int]) -> List[Bet]:
+        """
+        Get bets by primary key.
+
+        Args:
+            bet_ids: Bet IDs
+
+        Returns:
+            List of Bet instances in the order of bet_ids (missing IDs skipped)
+        """
+        if not bet_ids:
+            return []
+
+        session = self.get_session()
+        try:
+            bets = {bet.id: bet for bet in session.query(Bet).filter(Bet.id.in_(bet_ids))}
+            return [bets[bet_id] for bet_id in bet_ids if bet_id in bets]
+        finally:
+            session.close()
+
     def get_bets_by_address(
         self,
         address: str,
@@ -217,6 +494,56 @@ class DatabaseRepository:
         finally:
             session.close()
 
+    def address_exists(self, address: str) -> bool:
+        """
+        Check whether any bet from a wallet address has been stored.
+
+        Args:
+            address: Wallet address
+
+        Returns:
+            True if at least one bet exists for the address
+        """
+        session = self.get_session()
+        try:
+            return session.query(
+                session.query(Bet.id).filter(Bet.address == address).exists()
+            ).scalar()
+        finally:
+            session.close()
+
+    def get_bet_summaries_by_address(
+        self,
+        address: str,
+        limit: Optional[int] = None
+    ) -> List[Tuple[float, str, datetime, str]]:
+        """
+        Get lightweight bet rows for a wallet address.
+
+        Only loads the columns needed for account statistics instead of
+        full Bet ORM objects. Rows support both tuple indexing and
+        attribute access (row.size, row.market_id, ...).
+
+        Args:
+            address: Wallet address
+            limit: Maximum number of rows to return
+
+        Returns:
+            List of (size, market_id, timestamp, order_id) rows
+        """
+        session = self.get_session()
+        try:
+            query = session.query(
+                Bet.size, Bet.market_id, Bet.timestamp, Bet.order_id
+            ).filter(Bet.address == address).order_by(desc(Bet.timestamp))
+
+            if limit:
+                query = query.limit(limit)
+
+            return query.all()
+        finally:
+            session.close()
+
     # Alert operations
     def create_alert(self, alert_data: Dict[str, Any]) -> Alert:
         """
@@ -232,7 +559,7 @@ class DatabaseRepository:
         try:
             # Convert details dict to JSON string if needed
             if isinstance(alert_data.get('details'), dict):
-                alert_data['details'] = json.dumps(alert_data['details'])
+                alert_data['details'] = json_dumps(alert_data['details'])
 
             alert = Alert(**alert_data)
             session.add(alert)
@@ -247,6 +574,40 @@ class DatabaseRepository:
         finally:
             session.close()
 
+    def create_alerts_bulk(self, alerts_data: List[Dict[str, Any]]) -> List[Alert]:
+        """
+        Create many alerts in a single transaction.
+
+        Args:
+            alerts_data: Alert data dictionaries
+
+        Returns:
+            Created Alert instances, in input order
+        """
+        if not alerts_data:
+            return []
+
+        session = self.get_session()
+        session.expire_on_commit = False  # Returned alerts stay readable after close
+        try:
+            alerts = []
+            for alert_data in alerts_data:
+                # Convert details dict to JSON string if needed
+                if isinstance(alert_data.get('details'), dict):
+                    alert_data['details'] = json_dumps(alert_data['details'])
+                alerts.append(Alert(**alert_data))
+
+            session.add_all(alerts)
+            session.commit()
+            return alerts
+
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error(f"Error creating alerts: {e}", extra={'alert_count': len(alerts_data)})
+            raise
+        finally:
+            session.close()
+
     def mark_alert_sent(self, alert_id: int, discord_message_id: Optional[str] = None):
         """
         Mark alert as sent to Discord.
@@ -271,6 +632,14 @@ class DatabaseRepository:
         finally:
             session.close()
 
+    def get_alert(self, alert_id: int) -> Optional[Alert]:
+        """Get alert by ID."""
+        session = self.get_session()
+        try:
+            return session.query(Alert).filter_by(id=alert_id).first()
+        finally:
+            session.close()
+
     def get_unsent_alerts(self, limit: Optional[int] = None) -> List[Alert]:
         """Get alerts that haven't been sent to Discord yet."""
         session = self.get_session()
@@ -345,6 +714,52 @@ class DatabaseRepository:
         finally:
             session.close()
 
+    def upsert_market_statistics_bulk(self, stats_list: List[Dict[str, Any]]) -> int:
+        """
+        Insert or update statistics for many markets in one transaction.
+
+        Args:
+            stats_list: Statistics data dictionaries
+
+        Returns:
+            Number of markets written
+        """
+        if not stats_list:
+            return 0
+
+        session = self.get_session()
+        try:
+            # Load the latest existing row per (market, window) in one query
+            market_ids = list({stats_data['market_id'] for stats_data in stats_list})
+            existing = {}
+            query = session.query(MarketStatistics).filter(
+                MarketStatistics.market_id.in_(market_ids)
+            ).order_by(MarketStatistics.calculated_at)
+            for stats in query:
+                existing[(stats.market_id, stats.window_hours)] = stats
+
+            now = datetime.utcnow()
+            for stats_data in stats_list:
+                stats = existing.get((stats_data['market_id'], stats_data['window_hours']))
+                if stats:
+                    # Update existing stats
+                    for key, value in stats_data.items():
+                        setattr(stats, key, value)
+                    stats.calculated_at = now
+                else:
+                    # Create new stats
+                    session.add(MarketStatistics(**stats_data))
+
+            session.commit()
+            return len(stats_list)
+
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error(f"Error upserting market statistics: {e}", extra={'market_count': len(stats_list)})
+            raise
+        finally:
+            session.close()
+
     def get_market_statistics(
         self,
         market_id: str,
@@ -455,6 +870,124 @@ class DatabaseRepository:
         finally:
             session.close()
 
+    def get_unique_address_counts(
+        self,
+        market_ids: List[str],
+        since: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        """
+        Get count of unique addresses for several markets in one query.
+
+        Args:
+            market_ids: List of market IDs
+            since: Only count bets after this timestamp
+
+        Returns:
+            Dictionary mapping market ID to unique address count
+        """
+        if not market_ids:
+            return {}
+
+        session = self.get_session()
+        try:
+            query = session.query(
+                Bet.market_id,
+                func.count(func.distinct(Bet.address))
+            ).filter(Bet.market_id.in_(market_ids))
+
+            if since:
+                query = query.filter(Bet.timestamp >= since)
+
+            return dict(query.group_by(Bet.market_id).all())
+        finally:
+            session.close()
+
+    def get_bet_sizes_by_markets(
+        self,
+        market_ids: List[str],
+        since: Optional[datetime] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Get bet sizes for several markets in one query.
+
+        Args:
+            market_ids: List of market IDs
+            since: Only return bets after this timestamp
+
+        Returns:
+            List of (market_id, size) rows, grouped by market with sizes ascending
+        """
+        if not market_ids:
+            return []
+
+        session = self.get_session()
+        try:
+            query = session.query(Bet.market_id, Bet.size).filter(Bet.market_id.in_(market_ids))
+
+            if since:
+                query = query.filter(Bet.timestamp >= since)
+
+            return query.order_by(Bet.market_id, Bet.size).all()
+        finally:
+            session.close()
+
+    def get_address_statistics(self, address: str) -> Dict[str, Any]:
+        """
+        Get aggregate betting statistics for a wallet address.
+
+        Args:
+            address: Wallet address
+
+        Returns:
+            Dictionary with total_bets, total_volume, first_seen and markets_traded
+        """
+        session = self.get_session()
+        try:
+            total_bets, total_volume, first_seen, markets_traded = session.query(
+                func.count(Bet.id),
+                func.sum(Bet.size),
+                func.min(Bet.timestamp),
+                func.count(func.distinct(Bet.market_id))
+            ).filter(Bet.address == address).one()
+
+            return {
+                'total_bets': total_bets or 0,
+                'total_volume': total_volume or 0.0,
+                'first_seen': first_seen,
+                'markets_traded': markets_traded or 0,
+            }
+        finally:
+            session.close()
+
+    def get_distinct_addresses(
+        self,
+        market_ids: List[str],
+        since: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Get unique wallet addresses that bet on any of the given markets.
+
+        Args:
+            market_ids: List of market IDs
+            since: Only consider bets after this timestamp
+
+        Returns:
+            List of distinct wallet addresses
+        """
+        if not market_ids:
+            return []
+
+        session = self.get_session()
+        try:
+            query = session.query(Bet.address).filter(Bet.market_id.in_(market_ids)).distinct()
+
+            if since:
+                query = query.filter(Bet.timestamp >= since)
+
+            return [row.address for row in query.all()]
+        finally:
+            session.close()
+
     def close(self):
         """Close database connection."""
         self.engine.dispose()
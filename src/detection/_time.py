@@ -0,0 +1,73 @@
+"""
+Time helpers for detection hot paths.
+
+Bet timestamps are stored as naive UTC datetimes; detection code compares
+them as float unix seconds and only builds datetimes at the database and
+reporting boundaries.
+"""
+
+import time
+from datetime import datetime, timedelta
+import numpy as np
+
+# Reference point for converting naive UTC datetimes to unix seconds
+EPOCH = datetime(1970, 1, 1)
+
+
+def utcnow_unix() -> float:
+    """Current time in unix seconds."""
+    return time.time()
+
+
+def hours_ago(hours: float) -> float:
+    """
+    Get the unix time a number of hours before now.
+
+    Args:
+        hours: Hours to look back
+
+    Returns:
+        Unix timestamp in seconds
+    """
+    return time.time() - 3600.0 * hours
+
+
+def to_unix(dt: datetime) -> float:
+    """
+    Convert a naive UTC datetime to unix seconds.
+
+    Args:
+        dt: Naive UTC datetime
+
+    Returns:
+        Unix timestamp in seconds
+    """
+    return (dt - EPOCH).total_seconds()
+
+
+def from_unix(ts: float) -> datetime:
+    """
+    Convert unix seconds to a naive UTC datetime.
+
+    Args:
+        ts: Unix timestamp in seconds
+
+    Returns:
+        Naive UTC datetime
+    """
+    return EPOCH + timedelta(seconds=ts)
+
+
+def to_unix_seconds(timestamps) -> np.ndarray:
+    """
+    Convert naive UTC datetimes to float64 unix seconds.
+
+    The conversion runs in NumPy rather than building a timedelta per value.
+
+    Args:
+        timestamps: Sequence of naive UTC datetimes
+
+    Returns:
+        Array of unix timestamps in seconds
+    """
+    return np.array(timestamps, dtype='datetime64[us]').astype(np.int64) / 1e6
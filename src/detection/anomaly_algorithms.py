@@ -22,6 +22,125 @@ class AnomalyResult:
     details: dict
 
 
+class WelfordState:
+    """Running count, mean and variance using Welford's single-pass algorithm."""
+
+    def __init__(self):
+        """Initialize empty state."""
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared deviations from the mean
+
+    @classmethod
+    def from_values(cls, values) -> 'WelfordState':
+        """
+        Build state from a batch of values.
+
+        Args:
+            values: Numerical values
+
+        Returns:
+            WelfordState summarizing the values
+        """
+        state = cls()
+        state.update_batch(values)
+        return state
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1), 0.0 with fewer than two values."""
+        if self.count < 2:
+            return 0.0
+        return max(self.m2 / (self.count - 1), 0.0)
+
+    @property
+    def std_dev(self) -> float:
+        """Sample standard deviation (ddof=1)."""
+        return float(np.sqrt(self.variance))
+
+    def update(self, value: float):
+        """
+        Add a single value.
+
+        Args:
+            value: Value to add
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def update_batch(self, values):
+        """
+        Add a batch of values, merging its statistics in one step.
+
+        Args:
+            values: Values to add
+        """
+        values = np.asarray(values, dtype=np.float64)
+        n_b = len(values)
+        if n_b == 0:
+            return
+
+        mean_b = float(np.mean(values))
+        m2_b = float(np.sum((values - mean_b) ** 2))
+
+        # Chan et al. parallel combination of (count, mean, M2)
+        n_a = self.count
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * n_a * n_b / n
+        self.count = n
+
+    def remove(self, value: float):
+        """
+        Remove a single value previously added.
+
+        Args:
+            value: Value to remove
+        """
+        if self.count <= 1:
+            self.__init__()
+            return
+
+        n = self.count - 1
+        old_mean = self.mean
+        self.mean = (self.count * old_mean - value) / n
+        self.m2 = max(self.m2 - (value - old_mean) * (value - self.mean), 0.0)
+        self.count = n
+
+    def remove_batch(self, values):
+        """
+        Remove a batch of values previously added.
+
+        Args:
+            values: Values to remove
+        """
+        values = np.asarray(values, dtype=np.float64)
+        n_b = len(values)
+        if n_b == 0:
+            return
+        if n_b >= self.count:
+            self.__init__()
+            return
+
+        mean_b = float(np.mean(values))
+        m2_b = float(np.sum((values - mean_b) ** 2))
+
+        # Inverse of the combination in update_batch
+        n = self.count
+        n_a = n - n_b
+        mean_a = (n * self.mean - n_b * mean_b) / n_a
+        delta = mean_b - mean_a
+        self.m2 = max(self.m2 - m2_b - delta * delta * n_a * n_b / n, 0.0)
+        self.mean = mean_a
+        self.count = n_a
+
+
 class ZScoreDetector:
     """Detect anomalies using z-score (standard deviation) method."""
 
@@ -45,7 +164,7 @@ class ZScoreDetector:
         Returns:
             AnomalyResult with detection details
         """
-        if not data or len(data) < 2:
+        if len(data) < 2:
             return AnomalyResult(
                 is_anomaly=False,
                 score=0.0,
@@ -85,6 +204,91 @@ class ZScoreDetector:
             }
         )
 
+    def detect_from_state(self, value: float, state: WelfordState) -> AnomalyResult:
+        """
+        Detect if value is anomalous against running statistics.
+
+        Same rules as detect(), but reads the mean and standard deviation
+        from a WelfordState instead of recomputing them, so each check is O(1).
+
+        Args:
+            value: Value to test
+            state: Running statistics of the historical data
+
+        Returns:
+            AnomalyResult with detection details
+        """
+        if state.count < 2:
+            return AnomalyResult(
+                is_anomaly=False,
+                score=0.0,
+                threshold=self.threshold,
+                method='z_score',
+                details={'error': 'insufficient_data', 'data_size': state.count}
+            )
+
+        mean = state.mean
+        std_dev = state.std_dev
+
+        # Handle zero standard deviation
+        if std_dev == 0:
+            return AnomalyResult(
+                is_anomaly=value != mean,
+                score=float('inf') if value != mean else 0.0,
+                threshold=self.threshold,
+                method='z_score',
+                details={'mean': mean, 'std_dev': 0.0, 'note': 'zero_variance'}
+            )
+
+        z_score = abs((value - mean) / std_dev)
+
+        return AnomalyResult(
+            is_anomaly=z_score > self.threshold,
+            score=z_score,
+            threshold=self.threshold,
+            method='z_score',
+            details={
+                'mean': float(mean),
+                'std_dev': float(std_dev),
+                'z_score': float(z_score),
+                'value': value,
+                'data_size': state.count
+            }
+        )
+
+    def detect_batch(self, values: np.ndarray, reference) -> np.ndarray:
+        """
+        Flag anomalous values against reference data in one vectorized pass.
+
+        Uses the same rules as detect(), but computes the mean and standard
+        deviation of the reference once for all values.
+
+        Args:
+            values: Values to test
+            reference: Historical data for comparison, or a WelfordState
+                holding its running statistics
+
+        Returns:
+            Boolean array, True where the value is anomalous
+        """
+        values = np.asarray(values, dtype=np.float64)
+
+        if len(reference) < 2:
+            return np.zeros(values.shape, dtype=bool)
+
+        if isinstance(reference, WelfordState):
+            mean = reference.mean
+            std_dev = reference.std_dev
+        else:
+            mean = np.mean(reference)
+            std_dev = np.std(reference, ddof=1)  # Sample standard deviation
+
+        # Handle zero standard deviation
+        if std_dev == 0:
+            return values != mean
+
+        return np.abs((values - mean) / std_dev) > self.threshold
+
 
 class IQRDetector:
     """Detect anomalies using IQR (Interquartile Range) method."""
@@ -109,7 +313,7 @@ class IQRDetector:
         Returns:
             AnomalyResult with detection details
         """
-        if not data or len(data) < 4:
+        if len(data) < 4:
             return AnomalyResult(
                 is_anomaly=False,
                 score=0.0,
@@ -181,7 +385,7 @@ class MovingAverageDetector:
         Returns:
             AnomalyResult with detection details
         """
-        if not data or len(data) < self.window_size:
+        if len(data) < self.window_size:
             return AnomalyResult(
                 is_anomaly=False,
                 score=0.0,
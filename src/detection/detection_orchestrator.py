@@ -7,7 +7,6 @@ Coordinates large bet detection, pattern detection, and new account detection.
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, asdict
 from datetime import datetime
-import json
 
 from database.repository import DatabaseRepository
 from database.models import Bet
@@ -15,6 +14,7 @@ from detection.large_bet_detector import LargeBetDetector, LargeBetDetection
 from detection.pattern_detector import PatternDetector, PatternDetection
 from detection.new_account_detector import NewAccountDetector, NewAccountDetection
 from detection.statistics_calculator import MarketStatisticsCalculator
+from utils.json_codec import dumps as json_dumps
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -220,6 +220,61 @@ class DetectionOrchestrator:
 
         return 'low'
 
+    def _build_alert_data(self, detection: UnifiedDetection) -> Dict[str, Any]:
+        """
+        Build the alert row for a unified detection.
+
+        Args:
+            detection: Unified detection result
+
+        Returns:
+            Alert data dictionary
+        """
+        # Prepare alert details
+        alert_details = {
+            'bet_id': detection.bet_id,
+            'bet_size': detection.bet_size,
+            'address': detection.address,
+            'timestamp': detection.timestamp.isoformat(),
+            'detections': detection.detections,
+            'large_bet': detection.large_bet,
+            'patterns': detection.patterns,
+            'new_account': detection.new_account,
+        }
+
+        # Determine primary alert type
+        if 'large_bet' in detection.detections:
+            alert_type = 'large_bet'
+        elif 'new_account' in detection.detections:
+            alert_type = 'new_account'
+        elif 'rapid_succession' in detection.detections:
+            alert_type = 'rapid_succession'
+        elif 'statistical_anomaly' in detection.detections:
+            alert_type = 'statistical_anomaly'
+        else:
+            alert_type = 'composite'
+
+        return {
+            'alert_type': alert_type,
+            'severity': detection.max_severity,
+            'market_id': detection.market_id,
+            'bet_id': detection.bet_id,
+            'details': json_dumps(alert_details),
+            'sent_to_discord': False,
+        }
+
+    def _log_alert_created(self, alert) -> None:
+        """Log a newly created alert."""
+        logger.info(
+            f"Alert created: {alert.alert_type} (severity: {alert.severity})",
+            extra={
+                'alert_id': alert.id,
+                'alert_type': alert.alert_type,
+                'severity': alert.severity,
+                'market_id': alert.market_id
+            }
+        )
+
     def create_alert_from_detection(
         self,
         detection: UnifiedDetection
@@ -234,56 +289,40 @@ class DetectionOrchestrator:
             Alert ID if created, None otherwise
         """
         try:
-            # Prepare alert details
-            alert_details = {
-                'bet_id': detection.bet_id,
-                'bet_size': detection.bet_size,
-                'address': detection.address,
-                'timestamp': detection.timestamp.isoformat(),
-                'detections': detection.detections,
-                'large_bet': detection.large_bet,
-                'patterns': detection.patterns,
-                'new_account': detection.new_account,
-            }
-
-            # Determine primary alert type
-            if 'large_bet' in detection.detections:
-                alert_type = 'large_bet'
-            elif 'new_account' in detection.detections:
-                alert_type = 'new_account'
-            elif 'rapid_succession' in detection.detections:
-                alert_type = 'rapid_succession'
-            elif 'statistical_anomaly' in detection.detections:
-                alert_type = 'statistical_anomaly'
-            else:
-                alert_type = 'composite'
-
             # Create alert in database
-            alert = self.db.create_alert({
-                'alert_type': alert_type,
-                'severity': detection.max_severity,
-                'market_id': detection.market_id,
-                'bet_id': detection.bet_id,
-                'details': json.dumps(alert_details),
-                'sent_to_discord': False,
-            })
-
-            logger.info(
-                f"Alert created: {alert_type} (severity: {detection.max_severity})",
-                extra={
-                    'alert_id': alert.id,
-                    'alert_type': alert_type,
-                    'severity': detection.max_severity,
-                    'market_id': detection.market_id
-                }
-            )
-
+            alert = self.db.create_alert(self._build_alert_data(detection))
+            self._log_alert_created(alert)
             return alert.id
 
         except Exception as e:
             logger.error(f"Error creating alert from detection: {e}", exc_info=True)
             return None
 
+    def create_alerts_bulk(self, detections: List[UnifiedDetection]) -> List[int]:
+        """
+        Create alerts for many detections in a single transaction.
+
+        Args:
+            detections: Unified detection results
+
+        Returns:
+            Created alert IDs, in detection order (empty on failure)
+        """
+        if not detections:
+            return []
+
+        try:
+            alerts = self.db.create_alerts_bulk(
+                [self._build_alert_data(detection) for detection in detections]
+            )
+        except Exception as e:
+            logger.error(f"Error creating alerts from detections: {e}", exc_info=True)
+            return []
+
+        for alert in alerts:
+            self._log_alert_created(alert)
+        return [alert.id for alert in alerts]
+
     def process_bet(self, bet: Bet) -> Optional[int]:
         """
         Process a bet through all detection systems and create alert if needed.
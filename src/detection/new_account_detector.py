@@ -5,7 +5,8 @@ Detects suspicious patterns where newly seen wallet addresses place
 large bets within their first few transactions.
 """
 
-from typing import Dict, List, Optional, Any, Tuple
+import logging
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
@@ -15,8 +16,18 @@ from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Severity decision table for early bets from new accounts.
+# Rows: first bet, very new account (< 24h), early bet (position <= 5), other.
+# Columns: bet >= suspicious threshold, bet >= 2x large threshold, smaller.
+_SEVERITY_TABLE = (
+    ('critical', 'high', 'high'),  # Any large first bet is at least high
+    ('critical', 'high', 'medium'),
+    ('high', 'medium', 'medium'),
+    ('medium', 'medium', 'medium'),
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class NewAccountDetection:
     """Result of new account detection."""
     is_new_account_alert: bool
@@ -40,7 +51,8 @@ class NewAccountDetector:
         new_account_threshold_hours: int = 72,  # 3 days
         first_n_bets: int = 10,
         large_bet_threshold: float = 10000.0,
-        suspicious_first_bet_threshold: float = 50000.0
+        suspicious_first_bet_threshold: float = 50000.0,
+        aggregation_window_seconds: int = 300
     ):
         """
         Initialize new account detector.
@@ -51,12 +63,22 @@ class NewAccountDetector:
             first_n_bets: Number of first bets to monitor
             large_bet_threshold: What constitutes a "large" bet
             suspicious_first_bet_threshold: Higher threshold for very first bet
+            aggregation_window_seconds: Seconds during which scans emit at most
+                one detection per address (0 disables aggregation)
         """
         self.db = db
         self.new_account_threshold_hours = new_account_threshold_hours
         self.first_n_bets = first_n_bets
         self.large_bet_threshold = large_bet_threshold
         self.suspicious_first_bet_threshold = suspicious_first_bet_threshold
+        self.aggregation_window = timedelta(seconds=aggregation_window_seconds)
+
+        # Last time a scan emitted a detection for each address
+        self._recent_alerts: Dict[str, datetime] = {}
+
+        # Derived thresholds, precomputed for the detection hot path
+        self._two_large_threshold = large_bet_threshold * 2
+        self._min_alert_threshold = min(large_bet_threshold, suspicious_first_bet_threshold)
 
         logger.info(
             "New account detector initialized",
@@ -68,20 +90,25 @@ class NewAccountDetector:
             }
         )
 
-    def get_account_info(self, address: str) -> Dict[str, Any]:
+    def get_account_info(
+        self,
+        address: str,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
         """
         Get comprehensive account information.
 
         Args:
             address: Wallet address
+            now: Reference time for account age (defaults to current UTC time)
 
         Returns:
             Dictionary with account information
         """
-        # Get all bets from this address (ordered by timestamp)
-        all_bets = self.db.get_bets_by_address(address, limit=None)
+        # Aggregate account statistics in the database
+        stats = self.db.get_address_statistics(address)
 
-        if not all_bets:
+        if not stats['total_bets']:
             return {
                 'exists': False,
                 'first_seen': None,
@@ -92,39 +119,39 @@ class NewAccountDetector:
                 'markets_traded': 0,
             }
 
-        # Sort by timestamp to get chronological order
-        all_bets.sort(key=lambda b: b.timestamp)
-
-        # Calculate account statistics
-        first_bet_time = all_bets[0].timestamp
-        account_age = datetime.utcnow() - first_bet_time
+        if now is None:
+            now = datetime.utcnow()
+        first_bet_time = stats['first_seen']
+        account_age = now - first_bet_time
         account_age_hours = account_age.total_seconds() / 3600
 
-        total_volume = sum(bet.size for bet in all_bets)
-        unique_markets = set(bet.market_id for bet in all_bets)
-
         return {
             'exists': True,
+            'address': address,
             'first_seen': first_bet_time,
-            'total_bets': len(all_bets),
-            'total_volume': total_volume,
-            'avg_bet_size': total_volume / len(all_bets),
+            'total_bets': stats['total_bets'],
+            'total_volume': stats['total_volume'],
+            'avg_bet_size': stats['total_volume'] / stats['total_bets'],
             'account_age_hours': account_age_hours,
-            'markets_traded': len(unique_markets),
-            'all_bets': all_bets,
+            'markets_traded': stats['markets_traded'],
         }
 
-    def is_new_account(self, address: str) -> Tuple[bool, Dict[str, Any]]:
+    def is_new_account(
+        self,
+        address: str,
+        now: Optional[datetime] = None
+    ) -> Tuple[bool, Dict[str, Any]]:
         """
         Check if account is considered "new".
 
         Args:
             address: Wallet address
+            now: Reference time for account age (defaults to current UTC time)
 
         Returns:
             Tuple of (is_new, account_info)
         """
-        account_info = self.get_account_info(address)
+        account_info = self.get_account_info(address, now=now)
 
         if not account_info['exists']:
             # Never seen before - brand new
@@ -135,35 +162,50 @@ class NewAccountDetector:
 
         return (is_new, account_info)
 
-    def detect(self, bet: Bet) -> Optional[NewAccountDetection]:
+    def detect(
+        self,
+        bet: Bet,
+        now: Optional[datetime] = None
+    ) -> Optional[NewAccountDetection]:
         """
         Detect if a bet represents suspicious new account activity.
 
         Args:
             bet: Bet to analyze
+            now: Reference time for account age (defaults to current UTC time)
 
         Returns:
             NewAccountDetection if pattern found, None otherwise
         """
-        # Get account information
-        is_new, account_info = self.is_new_account(bet.address)
-
-        # If account is old or doesn't exist yet, no detection
-        if not is_new and account_info['exists']:
+        # Bets below both alert thresholds can never trigger a detection
+        if bet.size < self._min_alert_threshold:
             return None
 
+        # Cheap existence check first - brand new accounts need no history
+        account_exists = self.db.address_exists(bet.address)
+
+        if account_exists:
+            # Get account information
+            is_new, account_info = self.is_new_account(bet.address, now=now)
+
+            # If account is old, no detection
+            if not is_new:
+                return None
+
         # For brand new accounts (first bet we've seen)
-        if not account_info['exists']:
+        if not account_exists:
             # Check if first bet is suspiciously large
             if bet.size >= self.suspicious_first_bet_threshold:
-                logger.warning(
-                    f"New account placing very large first bet: {bet.address}",
-                    extra={
-                        'address': bet.address,
-                        'bet_size': bet.size,
-                        'market_id': bet.market_id
-                    }
-                )
+                if logger.isEnabledFor(logging.WARNING):
+                    logger.warning(
+                        "New account placing very large first bet: %s",
+                        bet.address,
+                        extra={
+                            'address': bet.address,
+                            'bet_size': bet.size,
+                            'market_id': bet.market_id
+                        }
+                    )
 
                 return NewAccountDetection(
                     is_new_account_alert=True,
@@ -183,14 +225,16 @@ class NewAccountDetector:
                     }
                 )
             elif bet.size >= self.large_bet_threshold:
-                logger.info(
-                    f"New account placing large first bet: {bet.address}",
-                    extra={
-                        'address': bet.address,
-                        'bet_size': bet.size,
-                        'market_id': bet.market_id
-                    }
-                )
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "New account placing large first bet: %s",
+                        bet.address,
+                        extra={
+                            'address': bet.address,
+                            'bet_size': bet.size,
+                            'market_id': bet.market_id
+                        }
+                    )
 
                 return NewAccountDetection(
                     is_new_account_alert=True,
@@ -212,18 +256,10 @@ class NewAccountDetector:
 
         # For new accounts (within threshold hours)
         else:
-            all_bets = account_info['all_bets']
-
             # Find position of current bet in chronological order
-            bet_position = None
-            for i, historical_bet in enumerate(all_bets, start=1):
-                if historical_bet.order_id == bet.order_id:
-                    bet_position = i
-                    break
-
-            # If we can't find the bet position, it's a new bet
-            if bet_position is None:
-                bet_position = len(all_bets) + 1
+            # (unknown order IDs are new bets, placed after all history)
+            order_index = self._get_order_index(account_info)
+            bet_position = order_index.get(bet.order_id, len(order_index) + 1)
 
             # Check if bet is within first N bets
             if bet_position <= self.first_n_bets:
@@ -236,16 +272,19 @@ class NewAccountDetector:
                         account_age_hours=account_info['account_age_hours']
                     )
 
-                    logger.info(
-                        f"New account large bet detected: position {bet_position}/{account_info['total_bets']}",
-                        extra={
-                            'address': bet.address,
-                            'bet_size': bet.size,
-                            'bet_position': bet_position,
-                            'account_age_hours': account_info['account_age_hours'],
-                            'severity': severity
-                        }
-                    )
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(
+                            "New account large bet detected: position %d/%d",
+                            bet_position,
+                            account_info['total_bets'],
+                            extra={
+                                'address': bet.address,
+                                'bet_size': bet.size,
+                                'bet_position': bet_position,
+                                'account_age_hours': account_info['account_age_hours'],
+                                'severity': severity
+                            }
+                        )
 
                     return NewAccountDetection(
                         is_new_account_alert=True,
@@ -271,6 +310,30 @@ class NewAccountDetector:
 
         return None
 
+    def _get_order_index(self, account_info: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Get mapping of order ID to chronological bet position.
+
+        The bet history is only loaded when the index is first needed; the
+        index is then cached on the account info dict.
+
+        Args:
+            account_info: Account information from get_account_info()
+
+        Returns:
+            Dictionary mapping order_id to 1-based position
+        """
+        order_index = account_info.get('order_index')
+        if order_index is None:
+            # Sort by timestamp to get chronological order
+            all_bets = sorted(
+                self.db.get_bet_summaries_by_address(account_info['address']),
+                key=lambda b: b.timestamp
+            )
+            order_index = {b.order_id: i for i, b in enumerate(all_bets, start=1)}
+            account_info['order_index'] = order_index
+        return order_index
+
     def _calculate_severity(
         self,
         bet_position: int,
@@ -288,88 +351,139 @@ class NewAccountDetector:
         Returns:
             Severity level
         """
-        # First bet gets higher severity
+        # Row: which account bucket the bet falls into
         if bet_position == 1:
-            if bet_size >= self.suspicious_first_bet_threshold:
-                return 'critical'
-            elif bet_size >= self.large_bet_threshold * 2:
-                return 'high'
-            else:
-                return 'high'  # Any large first bet is at least high
-
-        # Very new accounts (< 24 hours)
-        if account_age_hours < 24:
-            if bet_size >= self.suspicious_first_bet_threshold:
-                return 'critical'
-            elif bet_size >= self.large_bet_threshold * 2:
-                return 'high'
-            else:
-                return 'medium'
-
-        # Newer accounts (24-72 hours)
-        if bet_position <= 5:
-            if bet_size >= self.suspicious_first_bet_threshold:
-                return 'high'
-            else:
-                return 'medium'
-
-        # Within first 10 bets but older account
-        return 'medium'
+            row = 0  # First bet
+        elif account_age_hours < 24:
+            row = 1  # Very new account (< 24 hours)
+        elif bet_position <= 5:
+            row = 2  # Newer account (24-72 hours), early bet
+        else:
+            row = 3  # Within first N bets but older account
 
-    def scan_recent_bets_for_new_accounts(
+        # Column: bet size tier
+        if bet_size >= self.suspicious_first_bet_threshold:
+            col = 0
+        elif bet_size >= self._two_large_threshold:
+            col = 1
+        else:
+            col = 2
+
+        return _SEVERITY_TABLE[row][col]
+
+    def iter_new_account_detections(
         self,
         hours: int = 24,
-        limit: Optional[int] = None
-    ) -> List[NewAccountDetection]:
+        limit: Optional[int] = None,
+        limit_detections: Optional[int] = None,
+        batch_size: int = 500
+    ) -> Iterator[NewAccountDetection]:
         """
-        Scan recent bets across all markets for new account activity.
+        Stream new account detections from recent bets across all markets.
+
+        Bets are read in pages of `batch_size` using a (timestamp, id)
+        cursor, so memory stays bounded and DB work stops as soon as the
+        consumer stops iterating. Addresses that already produced a
+        detection within the aggregation window are skipped.
 
         Args:
             hours: Hours to look back
             limit: Maximum number of markets to check
+            limit_detections: Maximum number of detections to yield
+            batch_size: Number of bets to fetch per page
 
-        Returns:
-            List of new account detections
+        Yields:
+            New account detections
         """
-        detections = []
-        since = datetime.utcnow() - timedelta(hours=hours)
+        detection_count = 0
+        now = datetime.utcnow()
+        since = now - timedelta(hours=hours)
+
+        # Drop addresses whose aggregation window has expired
+        window_start = now - self.aggregation_window
+        recent_alerts = self._recent_alerts
+        for address in [a for a, t in recent_alerts.items() if t <= window_start]:
+            del recent_alerts[address]
 
         try:
             # Get active markets
             markets = self.db.get_active_markets(limit=limit)
+            market_ids = [market.id for market in markets]
 
             logger.info(f"Scanning {len(markets)} markets for new account activity")
 
-            for market in markets:
-                # Get recent bets for this market
-                bets = self.db.get_bets_by_market(market.id, since=since)
+            # Bind hot lookups outside the per-bet loop
+            detect = self.detect
+            aggregate = bool(self.aggregation_window)
+
+            cursor = None
+            while market_ids:
+                bets = self.db.get_recent_bets(
+                    since=since,
+                    market_ids=market_ids,
+                    after=cursor,
+                    limit=batch_size
+                )
 
                 for bet in bets:
-                    detection = self.detect(bet)
+                    if bet.address in recent_alerts:
+                        continue
+
+                    detection = detect(bet, now=now)
                     if detection:
-                        detections.append(detection)
+                        if aggregate:
+                            recent_alerts[bet.address] = now
+                        detection_count += 1
+                        yield detection
+
+                        if limit_detections and detection_count >= limit_detections:
+                            return
+
+                if len(bets) < batch_size:
+                    break
+                cursor = (bets[-1].timestamp, bets[-1].id)
 
             logger.info(
-                f"Found {len(detections)} new account alerts in last {hours} hours",
-                extra={'detection_count': len(detections), 'hours': hours}
+                f"Found {detection_count} new account alerts in last {hours} hours",
+                extra={'detection_count': detection_count, 'hours': hours}
             )
 
         except Exception as e:
             logger.error(f"Error scanning for new accounts: {e}", exc_info=True)
 
-        return detections
+    def scan_recent_bets_for_new_accounts(
+        self,
+        hours: int = 24,
+        limit: Optional[int] = None
+    ) -> List[NewAccountDetection]:
+        """
+        Scan recent bets across all markets for new account activity.
+
+        Args:
+            hours: Hours to look back
+            limit: Maximum number of markets to check
+
+        Returns:
+            List of new account detections
+        """
+        return list(self.iter_new_account_detections(hours=hours, limit=limit))
 
-    def get_account_risk_profile(self, address: str) -> Dict[str, Any]:
+    def get_account_risk_profile(
+        self,
+        address: str,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
         """
         Generate risk profile for an account.
 
         Args:
             address: Wallet address
+            now: Reference time for account age (defaults to current UTC time)
 
         Returns:
             Risk profile dictionary
         """
-        is_new, account_info = self.is_new_account(address)
+        is_new, account_info = self.is_new_account(address, now=now)
 
         if not account_info['exists']:
             return {
@@ -444,7 +558,8 @@ class NewAccountDetector:
         Returns:
             Summary dictionary
         """
-        since = datetime.utcnow() - timedelta(hours=hours)
+        now = datetime.utcnow()
+        since = now - timedelta(hours=hours)
         summary = {
             'total_new_accounts': 0,
             'total_new_account_volume': 0.0,
@@ -455,19 +570,17 @@ class NewAccountDetector:
         try:
             # Get all unique addresses with bets in time window
             markets = self.db.get_active_markets(limit=50)
-            addresses_seen = set()
-
-            for market in markets:
-                bets = self.db.get_bets_by_market(market.id, since=since)
-                for bet in bets:
-                    addresses_seen.add(bet.address)
+            addresses_seen = self.db.get_distinct_addresses(
+                [market.id for market in markets],
+                since=since
+            )
 
             # Check each address
             for address in addresses_seen:
-                is_new, account_info = self.is_new_account(address)
+                is_new, account_info = self.is_new_account(address, now=now)
 
                 if is_new:
-                    risk_profile = self.get_account_risk_profile(address)
+                    risk_profile = self.get_account_risk_profile(address, now=now)
 
                     summary['total_new_accounts'] += 1
                     summary['total_new_account_volume'] += account_info['total_volume']
@@ -7,30 +7,201 @@ Detects:
 3. Other suspicious patterns
 """
 
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from bisect import bisect_right
+from typing import List, Dict, Any, Optional, Union, Iterable, Tuple, NamedTuple, Callable
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
+import numpy as np
 
 from database.repository import DatabaseRepository
 from database.models import Bet
-from detection.anomaly_algorithms import ZScoreDetector, IQRDetector, calculate_statistics
+from detection.anomaly_algorithms import ZScoreDetector, IQRDetector, WelfordState, calculate_statistics
 from detection.statistics_calculator import MarketStatisticsCalculator
+from detection._time import to_unix, to_unix_seconds
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Severity lookup tables. Thresholds are sorted ascending; bisect_right
+# gives how many are met (value >= threshold), which indexes the labels
+_RAPID_COUNT_BINS = (7, 10)
+_RAPID_VOLUME_BINS = (50000, 100000)
+_RAPID_SEVERITIES = ('medium', 'medium', 'high')
+
+_ANOMALY_SEVERITY_TABLES = {
+    'z_score': ((4.5, 6.0), ('medium', 'high', 'critical')),
+    'iqr': ((2.0, 3.0), ('medium', 'medium', 'high')),
+}
+
+
+def find_first_rapid_cluster(
+    ts: np.ndarray,
+    sizes: np.ndarray,
+    k: int,
+    window_seconds: float
+) -> Optional[Tuple[int, int, float]]:
+    """
+    Find the earliest run of k consecutive bets within a time window.
+
+    Equivalent to the first cluster a left/right two-pointer sweep would
+    emit. The window test is evaluated for all start positions at once in
+    NumPy; no Python loop runs over the bets.
+
+    Args:
+        ts: Bet timestamps in unix seconds, sorted ascending
+        sizes: Bet sizes aligned with ts
+        k: Number of bets in a cluster
+        window_seconds: Maximum time span of a cluster
+
+    Returns:
+        (start, end, total_volume) of the earliest cluster, where start and
+        end are inclusive indices into ts, or None if there is no cluster
+    """
+    n = len(ts)
+    if k < 1 or n < k:
+        return None
+
+    # Span of the window starting at each position i is ts[i+k-1] - ts[i]
+    candidates = np.flatnonzero(ts[k - 1:] - ts[:n - k + 1] <= window_seconds)
+    if not len(candidates):
+        return None
+
+    start = int(candidates[0])
+    return start, start + k - 1, float(sizes[start:start + k].sum())
+
+
+def group_indices(keys: np.ndarray, min_size: int = 1) -> List[Tuple[Any, np.ndarray]]:
+    """
+    Group positions of equal keys by sorting instead of hashing per item.
+
+    Args:
+        keys: Key for each item
+        min_size: Skip groups with fewer items than this
+
+    Returns:
+        List of (key, indices) pairs, indices ascending within each group
+    """
+    if len(keys) == 0:
+        return []
+
+    uniques, codes, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    order = np.argsort(codes, kind='stable')
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    uniques = uniques.tolist()
+
+    return [
+        (uniques[g], order[starts[g]:ends[g]])
+        for g in np.flatnonzero(counts >= min_size)
+    ]
 
-@dataclass
+
+class RapidSuccessionSummary(NamedTuple):
+    """Raw measurements of a rapid succession cluster."""
+    time_span_minutes: float
+    total_volume: float
+    first_bet_time: datetime
+    last_bet_time: datetime
+    outcomes: Tuple[str, ...]
+
+
+@dataclass(slots=True, init=False)
 class PatternDetection:
-    """Result of pattern detection."""
+    """
+    Result of pattern detection.
+
+    Rapid succession detections keep only the IDs of their bets plus a
+    RapidSuccessionSummary; the Bet rows are re-loaded on first access to
+    `bets`, and `details` is formatted from the summary on first access.
+    """
     pattern_type: str  # 'rapid_succession', 'statistical_anomaly', etc.
     severity: str  # 'critical', 'high', 'medium', 'low'
     market_id: str
     address: Optional[str]  # Wallet address if applicable
-    bets: List[Bet]  # Bets involved in pattern
-    details: Dict[str, Any]
+    bet_ids: Tuple[int, ...]  # IDs of bets involved in pattern
     detected_at: datetime
+    _bets: Optional[List[Bet]] = field(repr=False)
+    _bet_loader: Optional[Callable[[List[int]], List[Bet]]] = field(repr=False, compare=False)
+    _details: Optional[Dict[str, Any]] = field(repr=False)
+    _summary: Optional[RapidSuccessionSummary] = field(repr=False)
+
+    def __init__(
+        self,
+        pattern_type: str,
+        severity: str,
+        market_id: str,
+        address: Optional[str],
+        bets: Optional[List[Bet]] = None,
+        detected_at: Optional[datetime] = None,
+        details: Optional[Dict[str, Any]] = None,
+        summary: Optional[RapidSuccessionSummary] = None,
+        bet_ids: Optional[Tuple[int, ...]] = None,
+        bet_loader: Optional[Callable[[List[int]], List[Bet]]] = None
+    ):
+        """
+        Initialize pattern detection.
+
+        Args:
+            pattern_type: Pattern type
+            severity: Severity level
+            market_id: Market ID
+            address: Wallet address if applicable
+            bets: Bets involved in pattern (or pass bet_ids and bet_loader)
+            detected_at: Detection time
+            details: Pattern details
+            summary: Raw rapid succession measurements, formatted into
+                details on first access
+            bet_ids: IDs of bets involved in pattern
+            bet_loader: Loads bets by ID when `bets` is first accessed
+        """
+        self.pattern_type = pattern_type
+        self.severity = severity
+        self.market_id = market_id
+        self.address = address
+        self.bet_ids = tuple(bet_ids) if bet_ids is not None else tuple(bet.id for bet in bets or ())
+        self.detected_at = detected_at
+        self._bets = bets
+        self._bet_loader = bet_loader
+        self._details = details
+        self._summary = summary
+
+    @property
+    def bets(self) -> List[Bet]:
+        """Bets involved in pattern, loaded by ID if not held."""
+        if self._bets is None:
+            self._bets = self._bet_loader(list(self.bet_ids)) if self._bet_loader else []
+        return self._bets
+
+    @property
+    def bet_count(self) -> int:
+        """Number of bets involved in pattern, without loading them."""
+        return len(self._bets) if self._bets is not None else len(self.bet_ids)
+
+    @property
+    def details(self) -> Dict[str, Any]:
+        """Pattern details, formatted from the raw summary if needed."""
+        if self._details is None:
+            self._details = self._format_details()
+        return self._details
+
+    def _format_details(self) -> Dict[str, Any]:
+        """Build the details dict for a rapid succession cluster."""
+        if self._summary is None:
+            return {}
+
+        summary = self._summary
+        bet_count = len(summary.outcomes)
+
+        return {
+            'bet_count': bet_count,
+            'time_span_minutes': summary.time_span_minutes,
+            'total_volume': summary.total_volume,
+            'avg_bet_size': summary.total_volume / bet_count,
+            'first_bet_time': summary.first_bet_time.isoformat(),
+            'last_bet_time': summary.last_bet_time.isoformat(),
+            'outcomes': list(summary.outcomes)
+        }
 
 
 class PatternDetector:
@@ -63,6 +234,9 @@ class PatternDetector:
         self.z_score_detector = ZScoreDetector(z_score_threshold)
         self.iqr_detector = IQRDetector(iqr_multiplier)
 
+        # Per-bet scan loop specialized for the thresholds above
+        self._scan_pass = self._build_scan_pass()
+
         logger.info(
             "Pattern detector initialized",
             extra={
@@ -100,61 +274,95 @@ class PatternDetector:
         if len(bets) < self.rapid_succession_bet_count:
             return None
 
-        # Check if bets are within time window
-        bets_sorted = sorted(bets, key=lambda b: b.timestamp)
+        ts = to_unix_seconds([bet.timestamp for bet in bets])
+        sizes = np.fromiter((bet.size for bet in bets), dtype=np.float64, count=len(bets))
 
-        # Find clusters of bets within time window
-        for i in range(len(bets_sorted) - self.rapid_succession_bet_count + 1):
-            cluster = bets_sorted[i:i + self.rapid_succession_bet_count]
-            time_span = (cluster[-1].timestamp - cluster[0].timestamp).total_seconds() / 60
+        return self._find_rapid_succession(market_id, address, bets, ts, sizes, lookback_minutes)
 
-            if time_span <= lookback_minutes:
-                # Rapid succession detected
-                total_volume = sum(bet.size for bet in cluster)
-                avg_bet_size = total_volume / len(cluster)
+    def _find_rapid_succession(
+        self,
+        market_id: str,
+        address: str,
+        bets: List[Bet],
+        ts: np.ndarray,
+        sizes: np.ndarray,
+        lookback_minutes: int
+    ) -> Optional[PatternDetection]:
+        """
+        Detect rapid successive bets among already-loaded bets.
 
-                # Determine severity based on bet count and volume
-                severity = self._calculate_rapid_succession_severity(
-                    bet_count=len(cluster),
-                    total_volume=total_volume,
-                    time_span_minutes=time_span
-                )
+        Args:
+            market_id: Market ID
+            address: Wallet address
+            bets: Bets from this address on this market
+            ts: Bet timestamps in unix seconds, aligned with bets
+            sizes: Bet sizes, aligned with bets
+            lookback_minutes: Time window for a cluster
 
-                logger.info(
-                    f"Rapid succession detected: {len(cluster)} bets in {time_span:.1f} minutes",
-                    extra={
-                        'market_id': market_id,
-                        'address': address,
-                        'bet_count': len(cluster),
-                        'time_span_minutes': time_span,
-                        'total_volume': total_volume
-                    }
-                )
+        Returns:
+            PatternDetection if pattern found, None otherwise
+        """
+        # Sort bets chronologically
+        order = np.argsort(ts, kind='stable')
+        ts = ts[order]
+
+        # Find the earliest cluster of bets within the time window
+        first_cluster = find_first_rapid_cluster(
+            ts,
+            sizes[order],
+            self.rapid_succession_bet_count,
+            lookback_minutes * 60
+        )
 
-                return PatternDetection(
-                    pattern_type='rapid_succession',
-                    severity=severity,
-                    market_id=market_id,
-                    address=address,
-                    bets=cluster,
-                    details={
-                        'bet_count': len(cluster),
-                        'time_span_minutes': time_span,
-                        'total_volume': total_volume,
-                        'avg_bet_size': avg_bet_size,
-                        'first_bet_time': cluster[0].timestamp.isoformat(),
-                        'last_bet_time': cluster[-1].timestamp.isoformat(),
-                        'outcomes': [bet.outcome for bet in cluster]
-                    },
-                    detected_at=datetime.utcnow()
-                )
+        if first_cluster is None:
+            return None
 
-        return None
+        # Rapid succession detected - report the earliest cluster
+        start, end, total_volume = first_cluster
+
+        cluster = [bets[i] for i in order[start:end + 1]]
+        time_span = float(ts[end] - ts[start]) / 60
+
+        # Determine severity based on bet count and volume
+        severity = self._calculate_rapid_succession_severity(
+            bet_count=len(cluster),
+            total_volume=total_volume,
+            time_span_minutes=time_span
+        )
+
+        logger.info(
+            f"Rapid succession detected: {len(cluster)} bets in {time_span:.1f} minutes",
+            extra={
+                'market_id': market_id,
+                'address': address,
+                'bet_count': len(cluster),
+                'time_span_minutes': time_span,
+                'total_volume': total_volume
+            }
+        )
+
+        return PatternDetection(
+            pattern_type='rapid_succession',
+            severity=severity,
+            market_id=market_id,
+            address=address,
+            bet_ids=tuple(bet.id for bet in cluster),
+            bet_loader=self.db.get_bets_by_ids,
+            detected_at=datetime.utcnow(),
+            summary=RapidSuccessionSummary(
+                time_span,
+                total_volume,
+                cluster[0].timestamp,
+                cluster[-1].timestamp,
+                tuple(bet.outcome for bet in cluster)
+            )
+        )
 
     def detect_statistical_anomaly(
         self,
         bet: Bet,
-        method: str = 'z_score'
+        method: str = 'z_score',
+        bet_sizes: Optional[Union[np.ndarray, WelfordState]] = None
     ) -> Optional[PatternDetection]:
         """
         Detect if bet is statistical anomaly.
@@ -162,12 +370,20 @@ class PatternDetector:
         Args:
             bet: Bet to analyze
             method: Detection method ('z_score' or 'iqr')
+            bet_sizes: Pre-fetched 24h bet sizes for the bet's market, or
+                their running statistics. If not provided, the market's
+                rolling 24h window is used
 
         Returns:
             PatternDetection if anomaly found, None otherwise
         """
-        # Get historical bet sizes for this market
-        bet_sizes = self.stats_calculator.get_recent_bet_sizes(bet.market_id, hours=24)
+        # Get historical bet sizes for this market. Z-scores only need the
+        # rolling window's running mean/std; IQR needs the sizes themselves
+        if bet_sizes is None:
+            if method == 'z_score':
+                bet_sizes = self.stats_calculator.get_market_buffer(bet.market_id).stats
+            else:
+                bet_sizes = self.stats_calculator.get_recent_bet_sizes(bet.market_id, hours=24)
 
         if len(bet_sizes) < 10:
             logger.debug(
@@ -177,7 +393,9 @@ class PatternDetector:
             return None
 
         # Detect anomaly
-        if method == 'z_score':
+        if method == 'z_score' and isinstance(bet_sizes, WelfordState):
+            result = self.z_score_detector.detect_from_state(bet.size, bet_sizes)
+        elif method == 'z_score':
             result = self.z_score_detector.detect(bet.size, bet_sizes)
         elif method == 'iqr':
             result = self.iqr_detector.detect(bet.size, bet_sizes)
@@ -233,43 +451,83 @@ class PatternDetector:
         Returns:
             List of detected patterns
         """
-        detections = []
         since = datetime.utcnow() - timedelta(hours=hours)
 
+        # Stream recent bets instead of loading the whole window up front
+        bets = self.db.iter_bets_by_market(market_id, since=since)
+
+        return self.scan_bets_for_patterns(market_id, bets, since=since)
+
+    def scan_bets_for_patterns(
+        self,
+        market_id: str,
+        bets: Iterable[Bet],
+        bet_sizes: Optional[Union[np.ndarray, WelfordState]] = None,
+        since: Optional[datetime] = None
+    ) -> List[PatternDetection]:
+        """
+        Scan bets from one market for all pattern types in a single pass.
+
+        Args:
+            market_id: Market ID
+            bets: Bets to scan in chronological order, all from this market
+                (any iterable, consumed once)
+            bet_sizes: Pre-fetched 24h bet sizes for the market, or their
+                running statistics. If not provided, the market's rolling 24h
+                window is used
+            since: Start of the window the bets cover. When it spans the
+                rapid succession lookback, clusters are found in the scanned
+                bets instead of re-querying each address
+
+        Returns:
+            List of detected patterns
+        """
+        detections = []
+
         try:
-            # Get recent bets
-            bets = self.db.get_bets_by_market(market_id, since=since)
+            # Statistical anomalies are checked against the running mean/std
+            # of the market's 24h bet sizes, so each bet costs O(1)
+            if bet_sizes is None:
+                state = self.stats_calculator.get_market_buffer(market_id).stats
+            elif isinstance(bet_sizes, WelfordState):
+                state = bet_sizes
+            else:
+                state = WelfordState.from_values(bet_sizes)
 
-            if not bets:
+            cutoff = self._rapid_succession_cutoff(since)
+            bet_count, clusters, bet_counts, flagged = self._scan_pass(bets, cutoff, state)
+
+            anomalies = []
+            for bet in flagged:
+                pattern = self.detect_statistical_anomaly(bet, method='z_score', bet_sizes=state)
+                if pattern:
+                    anomalies.append(pattern)
+
+            if not bet_count:
                 logger.debug(f"No recent bets for market {market_id}")
                 return detections
 
-            logger.info(f"Scanning {len(bets)} bets for patterns on market {market_id}")
+            logger.info(f"Scanned {bet_count} bets for patterns on market {market_id}")
 
-            # Group bets by address for rapid succession detection
-            bets_by_address = defaultdict(list)
-            for bet in bets:
-                bets_by_address[bet.address].append(bet)
+            for address, cluster in clusters.items():
+                pattern = self._find_rapid_succession(
+                    market_id,
+                    address,
+                    cluster,
+                    to_unix_seconds([bet.timestamp for bet in cluster]),
+                    np.fromiter((bet.size for bet in cluster), dtype=np.float64, count=len(cluster)),
+                    self.rapid_succession_time_window_minutes
+                )
+                if pattern:
+                    detections.append(pattern)
 
-            # Check for rapid succession patterns
-            for address, address_bets in bets_by_address.items():
-                if len(address_bets) >= self.rapid_succession_bet_count:
+            for address, count in bet_counts.items():
+                if count >= self.rapid_succession_bet_count:
                     pattern = self.detect_rapid_succession(market_id, address)
                     if pattern:
                         detections.append(pattern)
 
-            # Check for statistical anomalies
-            for bet in bets:
-                # Z-score method
-                pattern = self.detect_statistical_anomaly(bet, method='z_score')
-                if pattern:
-                    detections.append(pattern)
-
-                # IQR method (optional, may duplicate)
-                # Uncomment if you want both methods
-                # pattern = self.detect_statistical_anomaly(bet, method='iqr')
-                # if pattern:
-                #     detections.append(pattern)
+            detections.extend(anomalies)
 
             logger.info(
                 f"Found {len(detections)} patterns in market {market_id}",
@@ -308,17 +566,20 @@ class PatternDetector:
 
             logger.info(f"Scanning {len(bets)} bets from address {address}")
 
-            # Group bets by market
-            bets_by_market = defaultdict(list)
-            for bet in bets:
-                bets_by_market[bet.market_id].append(bet)
-
-            # Check each market for rapid succession
-            for market_id, market_bets in bets_by_market.items():
-                if len(market_bets) >= self.rapid_succession_bet_count:
-                    pattern = self.detect_rapid_succession(market_id, address)
-                    if pattern:
-                        detections.append(pattern)
+            # Group bets by market and check each for rapid succession
+            ts = to_unix_seconds([bet.timestamp for bet in bets])
+            sizes = np.fromiter((bet.size for bet in bets), dtype=np.float64, count=len(bets))
+            cutoff = self._rapid_succession_cutoff(since)
+            groups = group_indices(
+                np.array([bet.market_id for bet in bets]),
+                self.rapid_succession_bet_count
+            )
+            for market_id, idx in groups:
+                pattern = self._detect_rapid_succession_in_group(
+                    market_id, address, bets, ts, sizes, idx, cutoff
+                )
+                if pattern:
+                    detections.append(pattern)
 
             logger.info(
                 f"Found {len(detections)} patterns for address {address}",
@@ -330,6 +591,128 @@ class PatternDetector:
 
         return detections
 
+    def _build_scan_pass(self):
+        """
+        Build the fused per-bet loop used by scan_bets_for_patterns.
+
+        Thresholds are read once here and bound as closure constants, so the
+        loop does no attribute lookups. They are fixed for the detector's
+        lifetime.
+
+        Returns:
+            Function (bets, cutoff, state) -> (bet_count, clusters,
+            bet_counts, flagged). clusters maps address to its earliest
+            rapid succession cluster; bet_counts holds per-address counts
+            when cutoff is None; flagged lists z-score anomalies
+        """
+        k = self.rapid_succession_bet_count
+        window = timedelta(minutes=self.rapid_succession_time_window_minutes)
+        z_threshold = self.z_score_detector.threshold
+
+        def scan_pass(bets, cutoff, state):
+            # Z-score method: |size - mean| > threshold * std (size != mean
+            # when std is zero); detections are only built for flagged bets
+            check_anomalies = state.count >= 10
+            mean = state.mean
+            limit = z_threshold * state.std_dev
+
+            # Rapid succession: keep each address's last k bets inside the
+            # lookback; the first time they span no more than the window they
+            # are the address's earliest cluster. Without a usable cutoff,
+            # count bets per address so qualifying ones can be queried
+            recent_by_address: Dict[str, deque] = {}
+            clusters: Dict[str, List[Bet]] = {}
+            bet_counts: Dict[str, int] = defaultdict(int)
+            flagged = []
+            bet_count = 0
+
+            for bet in bets:
+                bet_count += 1
+                address = bet.address
+
+                if cutoff is None:
+                    bet_counts[address] += 1
+                elif bet.timestamp >= cutoff and address not in clusters:
+                    recent = recent_by_address.get(address)
+                    if recent is None:
+                        recent = recent_by_address[address] = deque(maxlen=k)
+                    recent.append(bet)
+                    if len(recent) == k and recent[-1].timestamp - recent[0].timestamp <= window:
+                        clusters[address] = list(recent)
+
+                if check_anomalies and abs(bet.size - mean) > limit:
+                    flagged.append(bet)
+
+                # IQR method (optional, may duplicate)
+                # Uncomment if you want both methods
+                # pattern = self.detect_statistical_anomaly(bet, method='iqr')
+                # if pattern:
+                #     iqr_anomalies.append(pattern)
+
+            return bet_count, clusters, bet_counts, flagged
+
+        return scan_pass
+
+    def _rapid_succession_cutoff(self, since: Optional[datetime]) -> Optional[datetime]:
+        """
+        Get the start of the rapid succession lookback for in-memory scans.
+
+        Args:
+            since: Start of the scanned window, if known
+
+        Returns:
+            Lookback start, or None if the scanned window does not cover
+            the full lookback
+        """
+        cutoff = datetime.utcnow() - timedelta(minutes=self.rapid_succession_time_window_minutes)
+
+        if since is None or since > cutoff:
+            return None
+
+        return cutoff
+
+    def _detect_rapid_succession_in_group(
+        self,
+        market_id: str,
+        address: str,
+        bets: List[Bet],
+        ts: np.ndarray,
+        sizes: np.ndarray,
+        idx: np.ndarray,
+        cutoff: Optional[datetime]
+    ) -> Optional[PatternDetection]:
+        """
+        Detect rapid succession for one (market, address) group of scanned bets.
+
+        Args:
+            market_id: Market ID
+            address: Wallet address
+            bets: All scanned bets
+            ts: Unix-second timestamps aligned with bets
+            sizes: Bet sizes aligned with bets
+            idx: Positions of this group's bets
+            cutoff: Lookback start from _rapid_succession_cutoff(); None
+                queries the database instead
+
+        Returns:
+            PatternDetection if pattern found, None otherwise
+        """
+        if cutoff is None:
+            return self.detect_rapid_succession(market_id, address)
+
+        idx = idx[ts[idx] >= to_unix(cutoff)]
+        if len(idx) < self.rapid_succession_bet_count:
+            return None
+
+        return self._find_rapid_succession(
+            market_id,
+            address,
+            [bets[i] for i in idx],
+            ts[idx],
+            sizes[idx],
+            self.rapid_succession_time_window_minutes
+        )
+
     def _calculate_rapid_succession_severity(
         self,
         bet_count: int,
@@ -348,12 +731,11 @@ class PatternDetector:
             Severity level
         """
         # Higher bet count or volume = higher severity
-        if bet_count >= 10 or total_volume >= 100000:
-            return 'high'
-        elif bet_count >= 7 or total_volume >= 50000:
-            return 'medium'
-        else:
-            return 'medium'  # Default for detected patterns
+        level = max(
+            bisect_right(_RAPID_COUNT_BINS, bet_count),
+            bisect_right(_RAPID_VOLUME_BINS, total_volume)
+        )
+        return _RAPID_SEVERITIES[level]
 
     def _calculate_anomaly_severity(self, score: float, method: str) -> str:
         """
@@ -366,21 +748,12 @@ class PatternDetector:
         Returns:
             Severity level
         """
-        if method == 'z_score':
-            if score >= 6.0:
-                return 'critical'
-            elif score >= 4.5:
-                return 'high'
-            else:
-                return 'medium'
-        elif method == 'iqr':
-            if score >= 3.0:
-                return 'high'
-            elif score >= 2.0:
-                return 'medium'
-            else:
-                return 'medium'
-        return 'medium'
+        table = _ANOMALY_SEVERITY_TABLES.get(method)
+        if table is None:
+            return 'medium'
+
+        thresholds, severities = table
+        return severities[bisect_right(thresholds, score)]
 
     def get_pattern_summary(
         self,
@@ -409,8 +782,29 @@ class PatternDetector:
             markets = self.db.get_active_markets(limit=limit)
             summary['markets_scanned'] = len(markets)
 
+            # Fetch every market's bets in one query, covering both the scan
+            # window and the 24h window used as anomaly reference data
+            now = datetime.utcnow()
+            since = now - timedelta(hours=hours)
+            reference_since = now - timedelta(hours=24)
+            bets_by_market = self.db.get_bets_by_markets(
+                [market.id for market in markets],
+                since=min(since, reference_since)
+            )
+
             for market in markets:
-                patterns = self.scan_market_for_patterns(market.id, hours=hours)
+                market_bets = bets_by_market.get(market.id, [])
+                bet_sizes = np.array(
+                    [bet.size for bet in market_bets if bet.timestamp >= reference_since],
+                    dtype=np.float64
+                )
+                # market_bets are newest first; scans expect chronological order
+                patterns = self.scan_bets_for_patterns(
+                    market.id,
+                    [bet for bet in reversed(market_bets) if bet.timestamp >= since],
+                    bet_sizes=bet_sizes,
+                    since=since
+                )
 
                 for pattern in patterns:
                     summary['total_patterns'] += 1
@@ -421,7 +815,7 @@ class PatternDetector:
                         'severity': pattern.severity,
                         'market_id': pattern.market_id,
                         'address': pattern.address,
-                        'bet_count': len(pattern.bets),
+                        'bet_count': pattern.bet_count,
                         'details': pattern.details
                     })
 
@@ -4,20 +4,186 @@ Market statistics calculator.
 Calculates rolling statistics for markets to enable anomaly detection.
 """
 
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 
 from database.repository import DatabaseRepository
 from database.models import Bet
+from detection.anomaly_algorithms import WelfordState
+from detection._time import from_unix, hours_ago, to_unix_seconds
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_INT32 = np.iinfo(np.int32)
+
+# Smallest array capacity a bet buffer is allocated with
+_MIN_CAPACITY = 64
+
+
+def to_cents(sizes) -> np.ndarray:
+    """
+    Quantize bet sizes to whole cents.
+
+    Sizes are clamped to the int32 range (about $21M per bet).
+
+    Args:
+        sizes: Bet sizes in dollars
+
+    Returns:
+        int32 array of sizes in cents
+    """
+    cents = np.rint(np.asarray(sizes, dtype=np.float64) * 100)
+    return np.clip(cents, _INT32.min, _INT32.max).astype(np.int32)
+
+
+class MarketBetBuffer:
+    """
+    Chronologically sorted bet timestamps and sizes for one market.
+
+    Stored as contiguous NumPy arrays (structure of arrays) so statistics
+    run over sequential memory. Sizes are kept as int32 cents to halve the
+    bytes scanned per bet. Arrays are never modified in place behind a live
+    region, so slices handed out stay valid after later updates.
+    """
+
+    def __init__(self):
+        """Initialize an empty buffer."""
+        self._ts = np.empty(0, dtype=np.float64)
+        self._cents = np.empty(0, dtype=np.int32)
+        self._start = 0
+        self._end = 0
+        self.last_bet_id = 0  # Highest bet ID loaded into the buffer
+        self.stats = WelfordState()  # Running mean/variance of buffered sizes
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Bet timestamps in unix seconds, ascending."""
+        return self._ts[self._start:self._end]
+
+    @property
+    def cents(self) -> np.ndarray:
+        """Bet sizes in cents aligned with timestamps."""
+        return self._cents[self._start:self._end]
+
+    @property
+    def sizes(self) -> np.ndarray:
+        """Bet sizes in dollars aligned with timestamps."""
+        return self.cents / 100.0
+
+    def extend(self, ts: np.ndarray, sizes: np.ndarray):
+        """
+        Add bets to the buffer, keeping it sorted by timestamp.
+
+        Args:
+            ts: Bet timestamps in unix seconds
+            sizes: Bet sizes aligned with ts
+        """
+        n = len(ts)
+        if n == 0:
+            return
+
+        order = np.argsort(ts, kind='stable')
+        ts = ts[order]
+        cents = to_cents(sizes)[order]
+        self.stats.update_batch(cents / 100.0)
+
+        if len(self) and ts[0] < self._ts[self._end - 1]:
+            # Bets arrived out of order - merge into freshly allocated arrays
+            merged_ts = np.concatenate((self.timestamps, ts))
+            merged_cents = np.concatenate((self.cents, cents))
+            order = np.argsort(merged_ts, kind='stable')
+            self._ts = merged_ts[order]
+            self._cents = merged_cents[order]
+            self._start = 0
+            self._end = len(merged_ts)
+            return
+
+        if self._end + n > len(self._ts):
+            # Grow (doubling) and compact the live region into new arrays
+            self._reallocate(max(2 * (len(self) + n), _MIN_CAPACITY))
+
+        self._ts[self._end:self._end + n] = ts
+        self._cents[self._end:self._end + n] = cents
+        self._end += n
+
+    def trim(self, before: float):
+        """
+        Drop bets older than a cutoff.
+
+        Args:
+            before: Cutoff in unix seconds
+        """
+        dropped = int(np.searchsorted(self.timestamps, before, side='left'))
+        if dropped:
+            self.stats.remove_batch(self.cents[:dropped] / 100.0)
+            self._start += dropped
+
+            # Give memory back once the live region is a small part of the arrays
+            capacity = len(self._ts)
+            if capacity > _MIN_CAPACITY and 4 * len(self) <= capacity:
+                self._reallocate(max(2 * len(self), _MIN_CAPACITY))
+
+    def _reallocate(self, capacity: int):
+        """
+        Copy the live region to the start of newly allocated arrays.
+
+        Args:
+            capacity: Length of the new arrays
+        """
+        live = len(self)
+        new_ts = np.empty(capacity, dtype=np.float64)
+        new_cents = np.empty(capacity, dtype=np.int32)
+        new_ts[:live] = self.timestamps
+        new_cents[:live] = self.cents
+        self._ts = new_ts
+        self._cents = new_cents
+        self._start = 0
+        self._end = live
+
+    def cents_since(self, since: float) -> np.ndarray:
+        """
+        Get sizes in cents of bets at or after a point in time.
+
+        Args:
+            since: Start time in unix seconds
+
+        Returns:
+            Array view of bet sizes in cents (O(log N), no copy)
+        """
+        i = self._start + int(np.searchsorted(self.timestamps, since, side='left'))
+        return self._cents[i:self._end]
+
+    def sizes_since(self, since: float) -> np.ndarray:
+        """
+        Get sizes in dollars of bets at or after a point in time.
+
+        Args:
+            since: Start time in unix seconds
+
+        Returns:
+            Array of bet sizes
+        """
+        return self.cents_since(since) / 100.0
+
 
 class MarketStatisticsCalculator:
     """Calculate and store rolling statistics for markets."""
 
+    # Bets older than this are dropped from the per-market buffers
+    BUFFER_WINDOW_HOURS = 24
+
+    # How often buffers of markets that are no longer queried are swept out
+    BUFFER_SWEEP_SECONDS = 600
+
+    # How long sorted bet sizes are reused for percentile ranking
+    SORTED_CACHE_SECONDS = 60
+
     def __init__(self, db: DatabaseRepository):
         """
         Initialize statistics calculator.
@@ -26,6 +192,67 @@ class MarketStatisticsCalculator:
             db: Database repository instance
         """
         self.db = db
+        self._buffers: Dict[str, MarketBetBuffer] = {}
+        self._last_buffer_sweep = time.monotonic()
+        self._sorted_cache: Dict[Tuple[str, int], Tuple[float, np.ndarray]] = {}
+
+    def get_market_buffer(self, market_id: str) -> MarketBetBuffer:
+        """
+        Get a market's bet buffer, loading any bets added since the last call.
+
+        The first call loads the market's last BUFFER_WINDOW_HOURS of bets;
+        later calls only fetch bets with a higher ID than already loaded.
+        Buffers left empty by the window are not kept, so markets that stop
+        trading don't hold memory.
+
+        Args:
+            market_id: Market ID
+
+        Returns:
+            MarketBetBuffer covering the buffer window
+        """
+        window_start = hours_ago(self.BUFFER_WINDOW_HOURS)
+
+        now = time.monotonic()
+        if now - self._last_buffer_sweep >= self.BUFFER_SWEEP_SECONDS:
+            self._last_buffer_sweep = now
+            self._sweep_buffers(window_start)
+
+        buffer = self._buffers.get(market_id)
+        if buffer is None:
+            buffer = self._buffers[market_id] = MarketBetBuffer()
+
+        rows = self.db.get_bet_sizes_after_id(
+            market_id,
+            after_id=buffer.last_bet_id,
+            since=from_unix(window_start)
+        )
+        if rows:
+            buffer.extend(
+                to_unix_seconds([row.timestamp for row in rows]),
+                np.fromiter((row.size for row in rows), dtype=np.float64, count=len(rows))
+            )
+            buffer.last_bet_id = rows[-1].id
+
+        buffer.trim(window_start)
+        if not len(buffer):
+            del self._buffers[market_id]
+        return buffer
+
+    def _sweep_buffers(self, window_start: float):
+        """
+        Trim every buffer and drop the ones left empty.
+
+        Catches markets whose buffers are no longer requested; once they go
+        untouched for BUFFER_WINDOW_HOURS all of their bets have expired.
+
+        Args:
+            window_start: Buffer window start in unix seconds
+        """
+        for market_id, buffer in list(self._buffers.items()):
+            buffer.trim(window_start)
+            if not len(buffer):
+                del self._buffers[market_id]
 
     def calculate_market_statistics(
         self,
@@ -42,31 +269,35 @@ class MarketStatisticsCalculator:
         Returns:
             Dictionary with statistics or None if insufficient data
         """
-        # Get bets within time window
-        since = datetime.utcnow() - timedelta(hours=window_hours)
-        bets = self.db.get_bets_by_market(market_id, since=since)
-
-        if not bets or len(bets) < 2:
+        # Get bet sizes within time window; the rolling buffer already carries
+        # running mean/variance for its own window (sizes in cents)
+        if window_hours == self.BUFFER_WINDOW_HOURS:
+            buffer = self.get_market_buffer(market_id)
+            since = datetime.utcnow() - timedelta(hours=window_hours)
+            bet_sizes_arr = buffer.cents
+            scale = 100.0
+            state = buffer.stats
+        else:
+            since = datetime.utcnow() - timedelta(hours=window_hours)
+            rows = self.db.get_bet_sizes_after_id(market_id, since=since)
+            bet_sizes_arr = np.fromiter((row.size for row in rows), dtype=np.float64, count=len(rows))
+            scale = 1.0
+            state = WelfordState.from_values(bet_sizes_arr)
+
+        if state.count < 2:
             logger.debug(
                 f"Insufficient data for market statistics",
-                extra={'market_id': market_id, 'bet_count': len(bets) if bets else 0}
+                extra={'market_id': market_id, 'bet_count': state.count}
             )
             return None
 
-        # Extract bet sizes
-        bet_sizes = [bet.size for bet in bets]
-        addresses = set(bet.address for bet in bets)
-
         # Calculate statistics
-        bet_sizes_arr = np.array(bet_sizes)
-
-        mean = float(np.mean(bet_sizes_arr))
-        std_dev = float(np.std(bet_sizes_arr, ddof=1))
-        median = float(np.median(bet_sizes_arr))
-        q1 = float(np.percentile(bet_sizes_arr, 25))
-        q3 = float(np.percentile(bet_sizes_arr, 75))
+        mean = float(state.mean)
+        std_dev = state.std_dev
+        # One partition pass for all three quantiles
+        q1, median, q3 = (float(q) / scale for q in np.quantile(bet_sizes_arr, [0.25, 0.5, 0.75]))
         iqr = q3 - q1
-        total_volume = float(np.sum(bet_sizes_arr))
+        total_volume = float(np.sum(bet_sizes_arr, dtype=np.result_type(bet_sizes_arr, np.int64))) / scale
 
         stats = {
             'market_id': market_id,
@@ -77,9 +308,9 @@ class MarketStatisticsCalculator:
             'q1': q1,
             'q3': q3,
             'iqr': iqr,
-            'total_bets': len(bets),
+            'total_bets': state.count,
             'total_volume': total_volume,
-            'unique_addresses': len(addresses),
+            'unique_addresses': self.db.get_unique_addresses_count(market_id, since=since),
             'window_start': since,
             'window_end': datetime.utcnow(),
         }
@@ -89,7 +320,7 @@ class MarketStatisticsCalculator:
             extra={
                 'market_id': market_id,
                 'window_hours': window_hours,
-                'bet_count': len(bets),
+                'bet_count': state.count,
                 'mean': mean,
                 'std_dev': std_dev
             }
@@ -97,6 +328,64 @@ class MarketStatisticsCalculator:
 
         return stats
 
+    def calculate_market_statistics_bulk(
+        self,
+        market_ids: List[str],
+        window_hours: int = 24
+    ) -> List[Dict[str, Any]]:
+        """
+        Calculate statistics for several markets from two bulk queries.
+
+        Args:
+            market_ids: Market IDs
+            window_hours: Time window in hours
+
+        Returns:
+            List of statistics dictionaries for markets with enough data
+        """
+        since = datetime.utcnow() - timedelta(hours=window_hours)
+        rows = self.db.get_bet_sizes_by_markets(market_ids, since=since)
+        if not rows:
+            return []
+
+        unique_addresses = self.db.get_unique_address_counts(market_ids, since=since)
+        window_end = datetime.utcnow()
+
+        # Rows arrive grouped by market with sizes ascending; split at the
+        # points where the market ID changes
+        ids = np.array([row.market_id for row in rows])
+        sizes = np.fromiter((row.size for row in rows), dtype=np.float64, count=len(rows))
+        bounds = np.concatenate(([0], np.flatnonzero(ids[1:] != ids[:-1]) + 1, [len(ids)])).tolist()
+
+        stats_list = []
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            market_id = str(ids[start])
+            if end - start < 2:
+                continue
+
+            bet_sizes_arr = sizes[start:end]
+            mean = float(np.mean(bet_sizes_arr))
+            std_dev = float(np.std(bet_sizes_arr, ddof=1))
+            q1, median, q3 = (float(q) for q in np.quantile(bet_sizes_arr, [0.25, 0.5, 0.75]))
+
+            stats_list.append({
+                'market_id': market_id,
+                'window_hours': window_hours,
+                'mean_bet_size': mean,
+                'std_dev_bet_size': std_dev,
+                'median_bet_size': median,
+                'q1': q1,
+                'q3': q3,
+                'iqr': q3 - q1,
+                'total_bets': end - start,
+                'total_volume': float(np.sum(bet_sizes_arr)),
+                'unique_addresses': unique_addresses.get(market_id, 0),
+                'window_start': since,
+                'window_end': window_end,
+            })
+
+        return stats_list
+
     def update_market_statistics(
         self,
         market_id: str,
@@ -145,6 +434,9 @@ class MarketStatisticsCalculator:
         """
         Update statistics for all active markets.
 
+        Statistics for every market are computed from bulk queries and
+        written back in a single transaction.
+
         Args:
             window_hours: Time window in hours
             max_markets: Maximum number of markets to process
@@ -154,11 +446,12 @@ class MarketStatisticsCalculator:
         """
         try:
             markets = self.db.get_active_markets(limit=max_markets)
-            updated_count = 0
 
-            for market in markets:
-                if self.update_market_statistics(market.id, window_hours):
-                    updated_count += 1
+            stats_list = self.calculate_market_statistics_bulk(
+                [market.id for market in markets],
+                window_hours
+            )
+            updated_count = self.db.upsert_market_statistics_bulk(stats_list)
 
             logger.info(
                 f"Updated statistics for {updated_count}/{len(markets)} markets",
@@ -176,9 +469,9 @@ class MarketStatisticsCalculator:
         market_id: str,
         since: Optional[datetime] = None,
         limit: Optional[int] = None
-    ) -> List[float]:
+    ) -> np.ndarray:
         """
-        Get list of bet sizes for statistical analysis.
+        Get bet sizes for statistical analysis.
 
         Args:
             market_id: Market ID
@@ -186,28 +479,35 @@ class MarketStatisticsCalculator:
             limit: Maximum number of bets to return
 
         Returns:
-            List of bet sizes
+            Array of bet sizes (call .tolist() where a list is needed)
         """
         bets = self.db.get_bets_by_market(market_id, since=since, limit=limit)
-        return [bet.size for bet in bets]
+        return np.fromiter((bet.size for bet in bets), dtype=np.float64, count=len(bets))
 
     def get_recent_bet_sizes(
         self,
         market_id: str,
         hours: int = 24
-    ) -> List[float]:
+    ) -> np.ndarray:
         """
         Get bet sizes for recent time period.
 
+        Windows up to BUFFER_WINDOW_HOURS are served from the market's
+        in-memory buffer; longer windows query the database.
+
         Args:
             market_id: Market ID
             hours: Number of hours to look back
 
         Returns:
-            List of bet sizes
+            Array of bet sizes
         """
-        since = datetime.utcnow() - timedelta(hours=hours)
-        return self.get_bet_sizes_for_analysis(market_id, since=since)
+        if hours > self.BUFFER_WINDOW_HOURS:
+            since = datetime.utcnow() - timedelta(hours=hours)
+            return self.get_bet_sizes_for_analysis(market_id, since=since)
+
+        buffer = self.get_market_buffer(market_id)
+        return buffer.sizes_since(hours_ago(hours))
 
     def calculate_percentile_rank(
         self,
@@ -226,12 +526,47 @@ class MarketStatisticsCalculator:
         Returns:
             Percentile rank (0-100)
         """
-        bet_sizes = self.get_recent_bet_sizes(market_id, hours)
+        sorted_cents = self._get_sorted_bet_cents(market_id, hours)
 
-        if not bet_sizes:
+        if sorted_cents.size == 0:
             return 0.0
 
-        # Calculate percentile
-        percentile = (sum(1 for size in bet_sizes if size <= value) / len(bet_sizes)) * 100
+        # Count of sizes <= value via binary search, both quantized to cents
+        value_cents = np.rint(value * 100)
+        return float(np.searchsorted(sorted_cents, value_cents, side='right')) / sorted_cents.size * 100.0
+
+    def _get_sorted_bet_cents(self, market_id: str, hours: int) -> np.ndarray:
+        """
+        Get recent bet sizes in cents sorted ascending, rebuilt at most once per SORTED_CACHE_SECONDS.
+
+        Args:
+            market_id: Market ID
+            hours: Time window in hours
 
-        return float(percentile)
+        Returns:
+            Sorted int32 array of bet sizes in cents
+        """
+        key = (market_id, hours)
+        now = time.monotonic()
+
+        cached = self._sorted_cache.get(key)
+        if cached is not None and now - cached[0] < self.SORTED_CACHE_SECONDS:
+            return cached[1]
+
+        if hours > self.BUFFER_WINDOW_HOURS:
+            cents = to_cents(self.get_recent_bet_sizes(market_id, hours))
+        else:
+            buffer = self.get_market_buffer(market_id)
+            cents = buffer.cents_since(hours_ago(hours))
+
+        sorted_cents = np.sort(cents)
+
+        # Expired entries are only replaced on read; drop them here so keys
+        # for markets that are no longer ranked don't accumulate
+        sorted_cache = self._sorted_cache
+        for stale_key in [k for k, (built, _) in sorted_cache.items()
+                          if now - built >= self.SORTED_CACHE_SECONDS]:
+            del sorted_cache[stale_key]
+
+        sorted_cache[key] = (now, sorted_cents)
+        return sorted_cents
@@ -5,31 +5,55 @@ This bot monitors Polymarket for suspicious betting activity and sends
 alerts to Discord.
 """
 
+import argparse
 import asyncio
+import random
 import signal
 import sys
+from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 
 from monitoring.config import init_config, get_config
+from monitoring.data_collector import PolymarketDataCollector, create_connector
 from database.repository import DatabaseRepository
-from utils.logger import init_logging, get_logger
+from detection.detection_orchestrator import DetectionOrchestrator
+from utils.logger import init_logging, get_logger, shutdown_logging
 
 
 # Global flag for graceful shutdown
 shutdown_event = asyncio.Event()
 
 
-def signal_handler(signum, frame):
-    """Handle shutdown signals (SIGTERM, SIGINT)."""
+def signal_handler(signum):
+    """Handle shutdown signals (SIGTERM, SIGINT) on the event loop thread."""
     logger = get_logger()
     logger.info(f"Received signal {signum}, initiating graceful shutdown...")
     shutdown_event.set()
 
 
-async def initialize_bot() -> tuple:
+async def wait_for_shutdown(timeout: float):
+    """
+    Sleep until the timeout expires or shutdown is requested.
+
+    Args:
+        timeout: Maximum seconds to wait
+    """
+    try:
+        async with asyncio.timeout(timeout):
+            await shutdown_event.wait()
+    except TimeoutError:
+        # Timeout is expected - the caller carries on
+        pass
+
+
+async def initialize_bot(component: str = 'all') -> tuple:
     """
     Initialize bot components.
 
+    Args:
+        component: Which loops this process runs ('all', 'monitor' or 'discord')
+
     Returns:
         Tuple of (config, database_repository, logger)
     """
@@ -39,11 +63,18 @@ async def initialize_bot() -> tuple:
     print(f"Environment: {config.environment}")
     print(f"Log level: {config.log_level}")
 
+    # Separate processes each get their own log file, since rotating one
+    # file from two processes would clobber it
+    log_file_path = config.log_file_path
+    if component != 'all' and log_file_path:
+        path = Path(log_file_path)
+        log_file_path = str(path.with_name(f"{path.stem}.{component}{path.suffix}"))
+
     # Initialize logging
     logger = init_logging(
         log_level=config.log_level,
         log_format=config.log_format,
-        log_file_path=config.log_file_path,
+        log_file_path=log_file_path,
         max_bytes=config.log_max_bytes,
         backup_count=config.log_backup_count,
         console_output=config.log_console_output
@@ -59,7 +90,10 @@ async def initialize_bot() -> tuple:
     # Initialize database
     db = DatabaseRepository(
         database_path=config.database_path,
-        echo=config.database_echo
+        echo=config.database_echo,
+        pool_size=config.database_pool_size,
+        max_overflow=config.database_max_overflow,
+        pragmas=config.database_pragmas
     )
     db.create_tables()
     logger.info(f"Database initialized at {config.database_path}")
@@ -67,7 +101,79 @@ async def initialize_bot() -> tuple:
     return config, db, logger
 
 
-async def monitoring_loop(config, db, logger):
+def store_markets(db, markets, logger):
+    """
+    Store markets, falling back to per-market upserts if the batch fails.
+
+    Args:
+        db: Database repository instance
+        markets: Market data dictionaries
+        logger: Logger instance
+    """
+    try:
+        db.upsert_markets_bulk(markets)
+    except Exception as e:
+        # One bad row fails the whole statement; store the rest one by one
+        logger.warning(f"Bulk market upsert failed, retrying per market: {e}")
+        for market in markets:
+            try:
+                db.upsert_market(market)
+            except Exception as e:
+                logger.error("Error storing market: %s", e)
+
+
+def analyze_bets(detector, bets, logger) -> list:
+    """
+    Run detection on bets one after another.
+
+    Args:
+        detector: Detection orchestrator instance
+        bets: Bets to analyze
+        logger: Logger instance
+
+    Returns:
+        List of detections for bets that triggered
+    """
+    detections = []
+    for bet in bets:
+        try:
+            detection = detector.analyze_bet(bet)
+            if detection:
+                detections.append(detection)
+        except Exception as e:
+            logger.error("Error processing bet: %s", e)
+    return detections
+
+
+def create_alerts(detector, detections, logger) -> list:
+    """
+    Create alerts for detections in one transaction, in order.
+
+    Args:
+        detector: Detection orchestrator instance
+        detections: Detections to alert on
+        logger: Logger instance
+
+    Returns:
+        IDs of the alerts created
+    """
+    alert_ids = detector.create_alerts_bulk(detections)
+    if alert_ids or not detections:
+        return alert_ids
+
+    # The batch was rolled back; create the alerts one by one
+    logger.warning("Bulk alert insert failed, retrying per alert")
+    for detection in detections:
+        try:
+            alert_id = detector.create_alert_from_detection(detection)
+            if alert_id:
+                alert_ids.append(alert_id)
+        except Exception as e:
+            logger.error("Error creating alert: %s", e)
+    return alert_ids
+
+
+async def monitoring_loop(config, db, logger, alert_queue=None):
     """
     Main monitoring loop - polls Polymarket and detects suspicious activity.
 
@@ -75,14 +181,15 @@ async def monitoring_loop(config, db, logger):
         config: Configuration instance
         db: Database repository instance
         logger: Logger instance
+        alert_queue: Optional queue that new alert IDs are handed to the
+            Discord loop through
     """
     logger.info("Starting monitoring loop...")
     logger.info(f"Poll interval: {config.poll_interval_seconds} seconds")
 
-    logger.info("Importing monitoring modules...")
-    from monitoring.data_collector import PolymarketDataCollector
-    from detection.detection_orchestrator import DetectionOrchestrator
-    logger.info("Modules imported successfully")
+    # One long-lived connection pool for all Polymarket HTTP calls, so
+    # connections are kept alive across polls instead of re-handshaking
+    connector = create_connector()
 
     # Initialize data collector
     logger.info("Initializing Polymarket data collector...")
@@ -93,7 +200,10 @@ async def monitoring_loop(config, db, logger):
         api_passphrase=config.polymarket_passphrase,
         timeout_seconds=config.api_timeout_seconds,
         max_retries=config.api_max_retries,
-        backoff_factor=config.api_backoff_factor
+        backoff_factor=config.api_backoff_factor,
+        connector=connector,
+        max_concurrent_requests=config.api_max_concurrent_requests,
+        markets_disk_cache_dir=config.markets_cache_dir
     )
     logger.info("Data collector initialized")
 
@@ -121,40 +231,76 @@ async def monitoring_loop(config, db, logger):
     if not is_healthy:
         logger.error("Polymarket API health check failed. Continuing anyway...")
 
-    # Main monitoring loop
+    # Cap concurrent detection threads (each holds its own DB session)
+    detection_semaphore = asyncio.Semaphore(config.database_pool_size)
+
+    async def analyze_market_bets(bets):
+        async with detection_semaphore:
+            return await asyncio.to_thread(analyze_bets, detector, bets, logger)
+
+    # Minimum date filter, parsed once
+    min_date = datetime.fromisoformat(config.min_bet_date)
+
+    stats_update_interval = 5  # Update statistics every 5 poll intervals
+
+    async def refresh_market_statistics():
+        # Runs beside the poll loop so a statistics rebuild never delays
+        # trade processing
+        while not shutdown_event.is_set():
+            await wait_for_shutdown(config.poll_interval_seconds * stats_update_interval)
+            if shutdown_event.is_set():
+                break
+            try:
+                logger.info("Updating market statistics...")
+                updated = await asyncio.to_thread(
+                    detector.update_market_statistics,
+                    max_markets=config.max_markets
+                )
+                logger.info("Updated statistics for %d markets", updated)
+            except Exception as e:
+                logger.error(f"Error updating market statistics: {e}", exc_info=True)
+
+    stats_task = asyncio.create_task(refresh_market_statistics())
+
+    # Main monitoring loop. Per-poll and per-bet messages use lazy %-style
+    # arguments so they are only formatted when the level is enabled
     poll_count = 0
-    stats_update_interval = 5  # Update statistics every 5 polls
+
+    # Retry delay after a failed poll; grows by api_backoff_factor up to
+    # the cap and resets after a successful poll
+    min_error_backoff = 10
+    max_error_backoff = 300
+    error_backoff = min_error_backoff
 
     while not shutdown_event.is_set():
         try:
             poll_count += 1
-            logger.info(f"Poll #{poll_count}: Fetching markets and trades...")
-
-            # Update market statistics periodically
-            if poll_count % stats_update_interval == 0:
-                logger.info("Updating market statistics...")
-                updated = detector.update_market_statistics(max_markets=config.max_markets)
-                logger.info(f"Updated statistics for {updated} markets")
+            logger.info("Poll #%d: Fetching markets and trades...", poll_count)
 
             # Fetch active markets
             markets = await collector.fetch_active_markets(limit=config.max_markets)
-            logger.info(f"Found {len(markets)} active markets")
+            logger.info("Found %d active markets", len(markets))
 
-            # Store markets in database
-            for market in markets:
-                try:
-                    db.upsert_market(market)
-                except Exception as e:
-                    logger.error(f"Error storing market: {e}")
+            # Store markets in a worker thread while trades are fetched
+            store_markets_task = asyncio.create_task(
+                asyncio.to_thread(store_markets, db, markets, logger)
+            )
+
+            # Fetch recent trades for markets. Markets must be stored before
+            # their bets, and a failed fetch must not leave the upsert running
+            # into the next poll's
+            try:
+                if markets:
+                    market_ids = list(map(itemgetter('id'), markets))
+                    trades = await collector.fetch_all_recent_trades(
+                        market_ids=market_ids,
+                        limit_per_market=20
+                    )
+                    logger.info("Found %d recent trades", len(trades))
+            finally:
+                await store_markets_task
 
-            # Fetch recent trades for markets
             if markets:
-                market_ids = [m['id'] for m in markets]
-                trades = await collector.fetch_all_recent_trades(
-                    market_ids=market_ids,
-                    limit_per_market=20
-                )
-                logger.info(f"Found {len(trades)} recent trades")
 
                 # Process each trade through detection system
                 detections_count = 0
@@ -162,80 +308,113 @@ async def monitoring_loop(config, db, logger):
                 filtered_count = 0
                 duplicate_count = 0
 
-                # Parse minimum date filter
-                from datetime import datetime as dt
-                min_date = dt.fromisoformat(config.min_bet_date)
-
+                # Apply filters before processing
+                accepted_trades = []
                 for trade in trades:
-                    try:
-                        # Apply filters before processing
-                        bet_size = trade.get('size', 0)
-                        bet_timestamp = trade.get('timestamp')
-
-                        # Filter 1: Minimum bet size
-                        if bet_size < config.min_bet_size:
-                            filtered_count += 1
-                            continue
-
-                        # Filter 2: Minimum date (skip old transactions)
-                        if bet_timestamp and bet_timestamp < min_date:
-                            filtered_count += 1
-                            continue
-
-                        # Store bet in database (returns tuple: bet, is_new)
-                        bet, is_new = db.insert_bet(trade)
-
-                        # Only run detection on NEW bets to avoid duplicate alerts
-                        if not is_new:
-                            duplicate_count += 1
-                            continue
-
-                        # Run detection on bet
-                        detection = detector.analyze_bet(bet)
-
-                        if detection:
-                            detections_count += 1
-                            # Create alert
-                            alert_id = detector.create_alert_from_detection(detection)
-                            if alert_id:
-                                alerts_created += 1
-
-                    except Exception as e:
-                        logger.error(f"Error processing bet: {e}")
+                    bet_size = trade.get('size', 0)
+                    bet_timestamp = trade.get('timestamp')
+
+                    # Filter 1: Minimum bet size
+                    if bet_size < config.min_bet_size:
+                        filtered_count += 1
+                        continue
+
+                    # Filter 2: Minimum date (skip old transactions)
+                    if bet_timestamp and bet_timestamp < min_date:
+                        filtered_count += 1
+                        continue
+
+                    accepted_trades.append(trade)
+
+                # Store bets in one transaction; only NEW bets are returned,
+                # so detection never re-alerts on already processed trades
+                try:
+                    new_bets = db.insert_bets_bulk(accepted_trades)
+                    duplicate_count = len(accepted_trades) - len(new_bets)
+                except Exception as e:
+                    # One bad row rolls back the batch; store the rest one by one
+                    logger.warning(f"Bulk bet insert failed, retrying per bet: {e}")
+                    new_bets = []
+                    for trade in accepted_trades:
+                        try:
+                            bet, is_new = db.insert_bet(trade)
+                            if is_new:
+                                new_bets.append(bet)
+                            else:
+                                duplicate_count += 1
+                        except Exception as e:
+                            logger.error("Error processing bet: %s", e)
+
+                # Run detection concurrently across markets. Bets of the same
+                # market stay in one thread, in order, since they share that
+                # market's rolling statistics buffer
+                bets_by_market = {}
+                for bet in new_bets:
+                    bets_by_market.setdefault(bet.market_id, []).append(bet)
+
+                market_detections = await asyncio.gather(
+                    *(analyze_market_bets(bets) for bets in bets_by_market.values())
+                )
+                # Restore insertion order so alerts follow trade order
+                detections = sorted(
+                    (d for market in market_detections for d in market),
+                    key=lambda d: d.bet_id
+                )
+                detections_count = len(detections)
+
+                # SQLite allows one writer at a time, so alerts are written
+                # from a single worker thread
+                if detections:
+                    alert_ids = await asyncio.to_thread(
+                        create_alerts, detector, detections, logger
+                    )
+                    alerts_created = len(alert_ids)
+
+                    # Hand new alerts straight to the Discord loop. Never
+                    # wait on it: alerts that don't fit are still unsent in
+                    # the database and get picked up from there
+                    if alert_queue is not None:
+                        for alert_id in alert_ids:
+                            try:
+                                alert_queue.put_nowait(alert_id)
+                            except asyncio.QueueFull:
+                                break
 
                 if filtered_count > 0:
-                    logger.info(f"Filtered out {filtered_count} trades (below ${config.min_bet_size} or before {config.min_bet_date})")
+                    logger.info(
+                        "Filtered out %d trades (below $%s or before %s)",
+                        filtered_count, config.min_bet_size, config.min_bet_date
+                    )
 
                 if duplicate_count > 0:
-                    logger.info(f"Skipped {duplicate_count} duplicate trades (already processed)")
+                    logger.info("Skipped %d duplicate trades (already processed)", duplicate_count)
 
                 if detections_count > 0:
                     logger.info(
-                        f"Poll #{poll_count}: Found {detections_count} detections, "
-                        f"created {alerts_created} alerts"
+                        "Poll #%d: Found %d detections, created %d alerts",
+                        poll_count, detections_count, alerts_created
                     )
 
-            logger.info(f"Poll #{poll_count} complete. Waiting {config.poll_interval_seconds}s...")
+            logger.info("Poll #%d complete. Waiting %ss...", poll_count, config.poll_interval_seconds)
+            error_backoff = min_error_backoff
 
             # Wait for next poll (or shutdown signal)
-            try:
-                await asyncio.wait_for(
-                    shutdown_event.wait(),
-                    timeout=config.poll_interval_seconds
-                )
-            except asyncio.TimeoutError:
-                # Timeout is expected - continue to next poll
-                pass
+            await wait_for_shutdown(config.poll_interval_seconds)
 
         except Exception as e:
             logger.error(f"Error in monitoring loop: {e}", exc_info=True)
-            # Wait before retrying
-            await asyncio.sleep(10)
-
+            # Wait before retrying, with jitter so restarts don't line up
+            # with other clients hitting the same outage
+            await wait_for_shutdown(error_backoff + random.uniform(0, error_backoff / 2))
+            error_backoff = min(error_backoff * config.api_backoff_factor, max_error_backoff)
+
+    await stats_task
+    await collector.aclose()
+    await connector.close()
     logger.info("Monitoring loop stopped")
 
 
-async def discord_bot_loop(config, db, logger):
+async def discord_bot_loop(config, db, logger, alert_queue=None):
     """
     Discord bot loop - handles Discord connection and commands.
 
@@ -243,6 +422,7 @@ async def discord_bot_loop(config, db, logger):
         config: Configuration instance
         db: Database repository instance
         logger: Logger instance
+        alert_queue: Optional queue of new alert IDs from the monitoring loop
     """
     logger.info("Starting Discord bot...")
 
@@ -266,7 +446,8 @@ async def discord_bot_loop(config, db, logger):
             color_config=color_config,
             max_alerts_per_hour=config.discord_max_alerts_per_hour,
             max_alerts_per_batch=config.discord_max_alerts_per_batch,
-            delay_between_alerts=config.discord_delay_between_alerts
+            delay_between_alerts=config.discord_delay_between_alerts,
+            alert_queue=alert_queue
         )
         logger.info("Bot instance created")
         logger.info(f"Rate limiting: {config.discord_max_alerts_per_hour} alerts/hour max, "
@@ -290,15 +471,31 @@ async def discord_bot_loop(config, db, logger):
     logger.info("Discord bot loop stopped")
 
 
-async def main():
-    """Main async entry point."""
-    # Register signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+async def main(component: str = 'all'):
+    """
+    Main async entry point.
+
+    Args:
+        component: Which loops to run: 'all' runs monitoring and Discord in
+            this process; 'monitor' or 'discord' runs only one of them, so
+            the two can run as separate processes sharing the database
+    """
+    # Register signal handlers; the loop runs them on its own thread, so
+    # shutdown_event is never set from a raw signal context
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, signal_handler, sig)
+        except NotImplementedError:
+            # Windows event loops don't support add_signal_handler
+            signal.signal(
+                sig,
+                lambda signum, frame: loop.call_soon_threadsafe(signal_handler, signum)
+            )
 
     try:
         # Initialize bot components
-        config, db, logger = await initialize_bot()
+        config, db, logger = await initialize_bot(component)
 
         logger.info("Bot initialization complete")
         logger.info("=" * 60)
@@ -306,12 +503,17 @@ async def main():
         logger.info("Press Ctrl+C to stop")
         logger.info("=" * 60)
 
-        # Run monitoring and Discord loops concurrently
-        await asyncio.gather(
-            monitoring_loop(config, db, logger),
-            discord_bot_loop(config, db, logger),
-            return_exceptions=True
-        )
+        # Run monitoring and Discord loops concurrently. Alerts reach the
+        # Discord loop through the database, so either one can also run in
+        # its own process and keep CPU-heavy detection off the gateway. In a
+        # single process new alerts are also handed over in memory
+        alert_queue = asyncio.Queue(maxsize=1000) if component == 'all' else None
+        loops = []
+        if component in ('all', 'monitor'):
+            loops.append(monitoring_loop(config, db, logger, alert_queue))
+        if component in ('all', 'discord'):
+            loops.append(discord_bot_loop(config, db, logger, alert_queue))
+        await asyncio.gather(*loops, return_exceptions=True)
 
     except KeyboardInterrupt:
         if 'logger' in locals():
@@ -334,14 +536,52 @@ async def main():
             db.close()
         if 'logger' in locals():
             logger.info("Shutdown complete")
+        shutdown_logging()
 
     return 0
 
 
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Polymarket Discord Monitoring Bot")
+    parser.add_argument(
+        '--component',
+        choices=('all', 'monitor', 'discord'),
+        default='all',
+        help="Loops to run in this process (default: all)"
+    )
+    return parser.parse_args(argv)
+
+
+def event_loop_factory():
+    """
+    Get the event loop factory to run the bot on.
+
+    Returns:
+        uvloop's loop factory if uvloop is installed, otherwise None
+        (the default asyncio loop)
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
 if __name__ == "__main__":
     """Entry point when running as script."""
     try:
-        exit_code = asyncio.run(main())
+        args = parse_args()
+        with asyncio.Runner(loop_factory=event_loop_factory()) as runner:
+            exit_code = runner.run(main(args.component))
         sys.exit(exit_code)
     except Exception as e:
         print(f"Fatal error: {e}", file=sys.stderr)
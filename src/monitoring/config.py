@@ -9,12 +9,27 @@ Loads configuration from:
 import os
 import yaml
 from pathlib import Path
-from typing import Any, Dict
+from functools import cached_property, lru_cache
+from typing import Any, Dict, Optional
 from dotenv import load_dotenv
 
+# Prefer libyaml's C parser; PyYAML builds without it fall back to pure Python
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Marks a dot path that is not present in the YAML configuration
+_MISSING = object()
+
 
 class Config:
-    """Configuration manager that loads from YAML and environment variables."""
+    """
+    Configuration manager that loads from YAML and environment variables.
+
+    YAML-backed settings are resolved on first access and cached, since
+    the file is only read once at startup.
+    """
 
     def __init__(self, config_path: str = "config/config.yaml"):
         """
@@ -32,11 +47,40 @@ class Config:
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
 
         with open(self.config_path, 'r') as f:
-            self._config: Dict[str, Any] = yaml.safe_load(f)
+            self._config: Dict[str, Any] = yaml.load(f, Loader=_YamlLoader)
+
+        # Memoize dot-path resolution per instance; _config is not modified
+        # after loading, so cached entries never go stale
+        self._resolve = lru_cache(maxsize=256)(self._resolve_uncached)
+
+        # Lookup tables built once instead of on every call
+        self._large_bet_thresholds: Dict[str, float] = {
+            'critical': self.get('detection.large_bet.thresholds.critical', 100000),
+            'high': self.get('detection.large_bet.thresholds.high', 50000),
+            'medium': self.get('detection.large_bet.thresholds.medium', 10000),
+        }
+        self._embed_colors: Dict[str, int] = {
+            'critical': self.get('discord.embed_color.critical', 0xFF0000),
+            'high': self.get('discord.embed_color.high', 0xFF6B35),
+            'medium': self.get('discord.embed_color.medium', 0xFFD700),
+            'low': self.get('discord.embed_color.low', 0x4169E1),
+        }
 
         # Validate required environment variables
         self._validate_env_vars()
 
+        # Snapshot environment variables once; they don't change at runtime
+        env = os.environ
+        self._discord_bot_token = env.get('DISCORD_BOT_TOKEN', '')
+        self._discord_channel_id = int(env.get('DISCORD_CHANNEL_ID', '0'))
+        self._polymarket_api_key = env.get('POLYMARKET_API_KEY', '')
+        self._polymarket_api_secret = env.get('POLYMARKET_API_SECRET', '')
+        self._polymarket_passphrase = env.get('POLYMARKET_PASSPHRASE', '')
+        self._polymarket_private_key = env.get('POLYMARKET_PRIVATE_KEY', '')
+        self._environment = env.get('ENVIRONMENT', 'development')
+        self._log_level = env.get('LOG_LEVEL', 'INFO').upper()
+        self._database_path = env.get('DATABASE_PATH', self.get('database.path', 'data/polymarket.db'))
+
     def _validate_env_vars(self):
         """Validate that required environment variables are set."""
         required_vars = [
@@ -67,6 +111,19 @@ class Config:
             >>> config.get('monitoring.poll_interval_seconds')
             45
         """
+        value = self._resolve(key_path)
+        return default if value is _MISSING else value
+
+    def _resolve_uncached(self, key_path: str) -> Any:
+        """
+        Walk the configuration tree for a dot-separated path.
+
+        Args:
+            key_path: Dot-separated path to config value
+
+        Returns:
+            Configuration value, or _MISSING if the path is not present
+        """
         keys = key_path.split('.')
         value = self._config
 
@@ -74,7 +131,7 @@ class Config:
             if isinstance(value, dict) and key in value:
                 value = value[key]
             else:
-                return default
+                return _MISSING
 
         return value
 
@@ -82,70 +139,70 @@ class Config:
     @property
     def discord_bot_token(self) -> str:
         """Get Discord bot token from environment."""
-        return os.getenv('DISCORD_BOT_TOKEN', '')
+        return self._discord_bot_token
 
     @property
     def discord_channel_id(self) -> int:
         """Get Discord channel ID from environment."""
-        return int(os.getenv('DISCORD_CHANNEL_ID', '0'))
+        return self._discord_channel_id
 
     @property
     def polymarket_api_key(self) -> str:
         """Get Polymarket API key from environment (optional)."""
-        return os.getenv('POLYMARKET_API_KEY', '')
+        return self._polymarket_api_key
 
     @property
     def polymarket_api_secret(self) -> str:
         """Get Polymarket API secret from environment (optional)."""
-        return os.getenv('POLYMARKET_API_SECRET', '')
+        return self._polymarket_api_secret
 
     @property
     def polymarket_passphrase(self) -> str:
         """Get Polymarket API passphrase from environment (optional)."""
-        return os.getenv('POLYMARKET_PASSPHRASE', '')
+        return self._polymarket_passphrase
 
     @property
     def polymarket_private_key(self) -> str:
         """Get Polymarket private key from environment (optional)."""
-        return os.getenv('POLYMARKET_PRIVATE_KEY', '')
+        return self._polymarket_private_key
 
     @property
     def environment(self) -> str:
         """Get environment (development, production, etc.)."""
-        return os.getenv('ENVIRONMENT', 'development')
+        return self._environment
 
     @property
     def log_level(self) -> str:
         """Get log level from environment."""
-        return os.getenv('LOG_LEVEL', 'INFO').upper()
+        return self._log_level
 
     @property
     def database_path(self) -> str:
         """Get database path."""
-        return os.getenv('DATABASE_PATH', self.get('database.path', 'data/polymarket.db'))
+        return self._database_path
 
     # Monitoring configuration
-    @property
+    @cached_property
     def poll_interval_seconds(self) -> int:
         """Get polling interval in seconds."""
         return self.get('monitoring.poll_interval_seconds', 45)
 
-    @property
+    @cached_property
     def batch_size(self) -> int:
         """Get batch size for fetching trades."""
         return self.get('monitoring.batch_size', 100)
 
-    @property
+    @cached_property
     def max_markets(self) -> int:
         """Get maximum number of markets to monitor."""
         return self.get('monitoring.max_markets', 50)
 
-    @property
+    @cached_property
     def min_bet_size(self) -> float:
         """Get minimum bet size to process (in USD)."""
         return self.get('monitoring.filters.min_bet_size', 500.0)
 
-    @property
+    @cached_property
     def min_bet_date(self) -> str:
         """Get minimum bet date to process (ISO format)."""
         return self.get('monitoring.filters.min_date', '2025-12-01')
@@ -153,98 +210,105 @@ class Config:
     # Detection configuration
     def get_large_bet_thresholds(self) -> Dict[str, float]:
         """Get large bet detection thresholds."""
-        return {
-            'critical': self.get('detection.large_bet.thresholds.critical', 100000),
-            'high': self.get('detection.large_bet.thresholds.high', 50000),
-            'medium': self.get('detection.large_bet.thresholds.medium', 10000),
-        }
+        # Copy so callers can't modify the cached table
+        return dict(self._large_bet_thresholds)
 
-    @property
+    @cached_property
     def large_bet_volume_percentage(self) -> float:
         """Get volume percentage threshold for large bets."""
         return self.get('detection.large_bet.volume_percentage', 5.0)
 
-    @property
+    @cached_property
     def large_bet_statistical_sigma(self) -> float:
         """Get statistical sigma threshold for large bets."""
         return self.get('detection.large_bet.statistical_sigma', 3.0)
 
-    @property
+    @cached_property
     def rapid_succession_bet_count(self) -> int:
         """Get bet count threshold for rapid succession detection."""
         return self.get('detection.rapid_succession.bet_count', 5)
 
-    @property
+    @cached_property
     def rapid_succession_time_window_minutes(self) -> int:
         """Get time window in minutes for rapid succession detection."""
         return self.get('detection.rapid_succession.time_window_minutes', 5)
 
-    @property
+    @cached_property
     def statistical_anomaly_z_score(self) -> float:
         """Get z-score threshold for statistical anomaly detection."""
         return self.get('detection.statistical_anomaly.z_score_threshold', 3.0)
 
-    @property
+    @cached_property
     def statistical_anomaly_iqr_multiplier(self) -> float:
         """Get IQR multiplier for anomaly detection."""
         return self.get('detection.statistical_anomaly.iqr_multiplier', 1.5)
 
-    @property
+    @cached_property
     def statistical_anomaly_ma_window_hours(self) -> int:
         """Get moving average window in hours for anomaly detection."""
         return self.get('detection.statistical_anomaly.ma_window_hours', 24)
 
-    @property
+    @cached_property
     def new_account_threshold_hours(self) -> int:
         """Get new account threshold in hours."""
         return self.get('detection.new_account.new_account_threshold_hours', 72)
 
-    @property
+    @cached_property
     def new_account_first_n_bets(self) -> int:
         """Get number of first bets to monitor for new accounts."""
         return self.get('detection.new_account.first_n_bets', 10)
 
-    @property
+    @cached_property
     def new_account_large_bet_threshold(self) -> float:
         """Get large bet threshold for new accounts."""
         return self.get('detection.new_account.large_bet_threshold', 10000)
 
-    @property
+    @cached_property
     def new_account_suspicious_first_bet_threshold(self) -> float:
         """Get suspicious first bet threshold for new accounts."""
         return self.get('detection.new_account.suspicious_first_bet_threshold', 50000)
 
     # API configuration
-    @property
+    @cached_property
     def polymarket_base_url(self) -> str:
         """Get Polymarket API base URL."""
         return self.get('api.polymarket.base_url', 'https://clob.polymarket.com')
 
-    @property
+    @cached_property
     def api_timeout_seconds(self) -> int:
         """Get API timeout in seconds."""
         return self.get('api.polymarket.timeout_seconds', 30)
 
-    @property
+    @cached_property
     def api_max_retries(self) -> int:
         """Get maximum API retry attempts."""
         return self.get('api.polymarket.max_retries', 3)
 
-    @property
+    @cached_property
     def api_rate_limit_calls(self) -> int:
         """Get API rate limit (calls per period)."""
         return self.get('api.polymarket.rate_limit_calls', 60)
 
-    @property
+    @cached_property
     def api_rate_limit_period_seconds(self) -> int:
         """Get API rate limit period in seconds."""
         return self.get('api.polymarket.rate_limit_period_seconds', 60)
 
-    @property
+    @cached_property
     def api_backoff_factor(self) -> int:
         """Get exponential backoff factor for retries."""
         return self.get('api.polymarket.backoff_factor', 2)
 
+    @cached_property
+    def markets_cache_dir(self) -> Optional[str]:
+        """Get directory for the persistent market cache (None disables it)."""
+        return self.get('api.polymarket.markets_cache_dir')
+
+    @cached_property
+    def api_max_concurrent_requests(self) -> int:
+        """Get maximum concurrent Data API requests."""
+        return self.get('api.polymarket.max_concurrent_requests', 16)
+
     # Discord configuration
     def get_discord_embed_color(self, severity: str) -> int:
         """
@@ -256,77 +320,76 @@ class Config:
         Returns:
             Hex color code as integer
         """
-        color_map = {
-            'critical': self.get('discord.embed_color.critical', 0xFF0000),
-            'high': self.get('discord.embed_color.high', 0xFF6B35),
-            'medium': self.get('discord.embed_color.medium', 0xFFD700),
-            'low': self.get('discord.embed_color.low', 0x4169E1),
-        }
-        return color_map.get(severity.lower(), 0x808080)  # Default gray
+        return self._embed_colors.get(severity.lower(), 0x808080)  # Default gray
 
-    @property
+    @cached_property
     def discord_rate_limit_enabled(self) -> bool:
         """Get whether Discord rate limiting is enabled."""
         return self.get('discord.rate_limiting.enabled', True)
 
-    @property
+    @cached_property
     def discord_max_alerts_per_hour(self) -> int:
         """Get maximum alerts per hour."""
         return self.get('discord.rate_limiting.max_alerts_per_hour', 60)
 
-    @property
+    @cached_property
     def discord_max_alerts_per_batch(self) -> int:
         """Get maximum alerts per batch."""
         return self.get('discord.rate_limiting.max_alerts_per_batch', 2)
 
-    @property
+    @cached_property
     def discord_check_interval_seconds(self) -> int:
         """Get alert check interval in seconds."""
         return self.get('discord.rate_limiting.check_interval_seconds', 60)
 
-    @property
+    @cached_property
     def discord_delay_between_alerts(self) -> int:
         """Get delay between individual alerts in seconds."""
         return self.get('discord.rate_limiting.delay_between_alerts', 15)
 
     # Database configuration
-    @property
+    @cached_property
     def database_echo(self) -> bool:
         """Get database echo setting (SQL query logging)."""
         return self.get('database.echo', False)
 
-    @property
+    @cached_property
     def database_pool_size(self) -> int:
         """Get database connection pool size."""
         return self.get('database.pool_size', 5)
 
-    @property
+    @cached_property
     def database_max_overflow(self) -> int:
         """Get database max overflow connections."""
         return self.get('database.max_overflow', 10)
 
+    @cached_property
+    def database_pragmas(self) -> Dict[str, Any]:
+        """Get SQLite pragmas applied to each database connection."""
+        return self.get('database.pragmas', {})
+
     # Logging configuration
-    @property
+    @cached_property
     def log_format(self) -> str:
         """Get logging format ('json' or 'text')."""
         return self.get('logging.format', 'json')
 
-    @property
+    @cached_property
     def log_file_path(self) -> str:
         """Get log file path."""
         return self.get('logging.file_path', 'data/logs/bot.log')
 
-    @property
+    @cached_property
     def log_max_bytes(self) -> int:
         """Get maximum log file size in bytes."""
         return self.get('logging.max_bytes', 10485760)  # 10MB
 
-    @property
+    @cached_property
     def log_backup_count(self) -> int:
         """Get number of log file backups to keep."""
         return self.get('logging.backup_count', 5)
 
-    @property
+    @cached_property
     def log_console_output(self) -> bool:
         """Get console logging setting."""
         return self.get('logging.console_output', True)
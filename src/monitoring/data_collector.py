@@ -5,17 +5,161 @@ Fetches market data and trades from Polymarket CLOB API.
 """
 
 import asyncio
+import random
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from itertools import islice
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from py_clob_client.client import ClobClient
 from py_clob_client.clob_types import TradeParams, ApiCreds
 import aiohttp
+import numpy as np
+from yarl import URL
 
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+from utils.json_codec import loads as json_loads
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+def create_connector() -> aiohttp.TCPConnector:
+    """
+    Create a TCP connector tuned for the Polymarket APIs.
+
+    DNS answers are cached for five minutes so retries don't each block on
+    the resolver, and connections go over IPv4 only, which skips the
+    Happy Eyeballs dual-stack race on every new connection.
+
+    Returns:
+        New connector (the caller owns and closes it)
+    """
+    return aiohttp.TCPConnector(
+        limit=100,
+        limit_per_host=32,
+        use_dns_cache=True,
+        ttl_dns_cache=300,
+        family=socket.AF_INET,
+        keepalive_timeout=75
+    )
+
+
+# Public Data API trades endpoint (no authentication required), parsed once
+_DATA_API_TRADES_URL = URL("https://data-api.polymarket.com/trades")
+
+# First unix second past datetime.max (year 10000)
+_MAX_UNIX_SECONDS = 253402300800
+
+# Alternative keys for the same field, in order of preference
+_MARKET_ID_KEYS = ('condition_id', 'id')
+_MARKET_QUESTION_KEYS = ('question', 'title')
+_MARKET_SLUG_KEYS = ('market_slug', 'slug')
+_TRADE_ID_KEYS = ('id', 'trade_id')
+_TRADE_ADDRESS_KEYS = ('maker_address', 'taker_address')
+
+
+def _first(data: Dict[str, Any], keys: Tuple[str, ...], default: Any = None) -> Any:
+    """
+    Get the first truthy value among alternative keys.
+
+    Same result as ``data.get(k1) or data.get(k2, default)``: the last key
+    is returned as-is when present.
+
+    Args:
+        data: Raw API record
+        keys: Keys to try in order
+        default: Value if the last key is missing
+
+    Returns:
+        First truthy value, else the last key's value or default
+    """
+    get = data.get
+    for key in keys[:-1]:
+        value = get(key)
+        if value:
+            return value
+    return get(keys[-1], default)
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso(value: str) -> datetime:
+    """
+    Parse an ISO 8601 timestamp (cached; API timestamps repeat heavily).
+
+    Args:
+        value: ISO timestamp, optionally with a trailing 'Z'
+
+    Returns:
+        Datetime object
+    """
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+class AdaptiveLimiter:
+    """
+    Client-side concurrency window with AIMD adjustment.
+
+    The window of requests allowed in flight halves whenever the server
+    answers 429 and grows by one after a full window of successes, so the
+    collector backs off under throttling and recovers once it clears.
+    """
+
+    def __init__(self, max_window: int = 16, min_window: int = 1):
+        """
+        Initialize adaptive limiter.
+
+        Args:
+            max_window: Upper bound on requests in flight
+            min_window: Lower bound the window never shrinks below
+        """
+        self.max_window = max(1, max_window)
+        self.min_window = max(1, min(min_window, self.max_window))
+        self.window = self.max_window
+        self.success_streak = 0
+        self.last_429_ts: Optional[float] = None
+        self._inflight = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        """Wait until a request slot is free within the current window."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._inflight < self.window)
+            self._inflight += 1
+
+    async def release(self):
+        """Free a request slot and wake waiters."""
+        async with self._condition:
+            self._inflight -= 1
+            self._condition.notify_all()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release()
+
+    def on_success(self):
+        """Record a successful request (additive increase)."""
+        self.success_streak += 1
+        if self.success_streak >= self.window:
+            self.success_streak = 0
+            self.window = min(self.max_window, self.window + 1)
+
+    def on_throttle(self):
+        """Record a 429 response (multiplicative decrease)."""
+        self.success_streak = 0
+        self.last_429_ts = time.monotonic()
+        self.window = max(self.min_window, self.window // 2)
+
+
 class PolymarketDataCollector:
     """Collector for Polymarket market and trade data."""
 
@@ -27,7 +171,13 @@ class PolymarketDataCollector:
         api_passphrase: Optional[str] = None,
         timeout_seconds: int = 30,
         max_retries: int = 3,
-        backoff_factor: int = 2
+        backoff_factor: int = 2,
+        connector: Optional[aiohttp.TCPConnector] = None,
+        max_concurrent_requests: int = 16,
+        markets_cache_ttl: float = 30.0,
+        clob_max_workers: int = 4,
+        markets_disk_cache_dir: Optional[str] = None,
+        markets_disk_ttl: float = 900.0
     ):
         """
         Initialize Polymarket data collector.
@@ -40,6 +190,20 @@ class PolymarketDataCollector:
             timeout_seconds: Request timeout in seconds
             max_retries: Maximum number of retry attempts
             backoff_factor: Exponential backoff factor for retries
+            connector: Optional shared connector so HTTP connections (and
+                their TLS sessions and DNS lookups) are reused across calls;
+                the caller owns and closes it
+            max_concurrent_requests: Maximum Data API requests in flight at
+                once; the window shrinks below this while the API returns 429
+            markets_cache_ttl: Seconds a fetch_active_markets result is
+                reused for the same limit (0 disables caching)
+            clob_max_workers: Threads in the pool dedicated to the blocking
+                CLOB client, kept apart from the loop's default executor
+            markets_disk_cache_dir: Optional directory for a persistent
+                market cache (needs diskcache) that survives restarts and
+                covers API outages
+            markets_disk_ttl: Max age in seconds of a persisted market list
+                served at startup while a fresh one is fetched
         """
         self.base_url = base_url
         self.api_key = api_key
@@ -49,11 +213,35 @@ class PolymarketDataCollector:
         self.max_retries = max_retries
         self.backoff_factor = backoff_factor
         self.client = None  # Lazy initialization
+        self.connector = connector
+        self._session: Optional[aiohttp.ClientSession] = None  # Lazy initialization
+        self.rate_limiter = AdaptiveLimiter(max_window=max_concurrent_requests)
+        self.markets_cache_ttl = markets_cache_ttl
+        self._markets_cache: Dict[int, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._markets_locks: Dict[int, asyncio.Lock] = {}
+        self._inflight_trades: Dict[Tuple[str, Optional[datetime], int], asyncio.Task] = {}
+        self._trade_waiters: Dict[asyncio.Task, int] = {}  # Callers awaiting each fetch
+        self.clob_max_workers = clob_max_workers
+        self.markets_disk_ttl = markets_disk_ttl
+        self._markets_fetched: set = set()  # Limits fetched live at least once
+        self._markets_refresh_tasks: Dict[int, asyncio.Task] = {}
+        self._markets_disk = None
+        if markets_disk_cache_dir:
+            if diskcache is None:
+                logger.warning("diskcache not installed; persistent market cache disabled")
+            else:
+                self._markets_disk = diskcache.Cache(markets_disk_cache_dir, size_limit=256 << 20)
+        self._executor: Optional[ThreadPoolExecutor] = None  # Lazy initialization
 
         logger.info("Polymarket data collector initialized", extra={'base_url': base_url})
 
     def _get_client(self) -> ClobClient:
-        """Get or create the CLOB client (lazy initialization)."""
+        """
+        Get or create the CLOB client (lazy initialization).
+
+        Called on the event loop thread (construction does no I/O), so
+        fetches hand the client's bound methods straight to the executor.
+        """
         if self.client is None:
             # Check if we have API credentials (key + secret + passphrase)
             has_api_creds = self.api_key and self.api_secret and self.api_passphrase
@@ -82,23 +270,178 @@ class PolymarketDataCollector:
                 logger.info("CLOB client initialized (read-only mode)")
         return self.client
 
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get or create the HTTP session (lazy initialization).
+
+        One session is reused for all Data API requests so connections stay
+        pooled. Without an injected connector the session gets its own.
+
+        Returns:
+            Shared aiohttp session
+        """
+        if self._session is None or self._session.closed:
+            connector = self.connector or create_connector()
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                connector_owner=self.connector is None,
+                timeout=aiohttp.ClientTimeout(total=self.timeout_seconds),
+                cookie_jar=aiohttp.DummyCookieJar(),  # Public API; keep no cookies
+                # aiohttp already negotiates gzip/deflate (and br with Brotli
+                # installed) and decompresses transparently
+                headers={'Accept': 'application/json'}
+            )
+        return self._session
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get or create the thread pool for CLOB client calls (lazy initialization)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.clob_max_workers,
+                thread_name_prefix='clob'
+            )
+        return self._executor
+
+    async def aclose(self):
+        """Close the HTTP session (and its connector if owned), CLOB thread pool and caches."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        for task in self._markets_refresh_tasks.values():
+            task.cancel()
+        self._markets_refresh_tasks.clear()
+        for task in self._inflight_trades.values():
+            task.cancel()
+        self._inflight_trades.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._markets_disk is not None:
+            self._markets_disk.close()  # Reopens on next use
+
     async def fetch_active_markets(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
         Fetch active markets from Polymarket.
 
+        Results are cached per limit for markets_cache_ttl seconds, and
+        concurrent callers for the same limit share one upstream fetch.
+        With a persistent cache, the first call after a restart is served
+        from disk while a refresh runs in the background, and a failed
+        fetch falls back to the last persisted list.
+
         Args:
             limit: Maximum number of markets to fetch
 
         Returns:
             List of market dictionaries
         """
+        cached = self._get_cached_markets(limit)
+        if cached is not None:
+            return cached
+
+        lock = self._markets_locks.setdefault(limit, asyncio.Lock())
+        async with lock:
+            # Another caller may have refreshed the entry while we waited
+            cached = self._get_cached_markets(limit)
+            if cached is not None:
+                return cached
+
+            if limit not in self._markets_fetched:
+                persisted = self._get_disk_markets(limit, self.markets_disk_ttl)
+                if persisted is not None:
+                    self._schedule_markets_refresh(limit)
+                    return persisted
+
+            markets = await self._refresh_markets(limit)
+            if not markets:
+                # API outage: serve the last persisted list, however old
+                persisted = self._get_disk_markets(limit)
+                if persisted is not None:
+                    logger.warning(f"Serving {len(persisted)} persisted markets after failed fetch")
+                    return persisted
+            return list(markets)
+
+    async def _refresh_markets(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Fetch markets live and store a successful result in the caches.
+
+        Args:
+            limit: Maximum number of markets to fetch
+
+        Returns:
+            List of market dictionaries (empty on error)
+        """
+        self._markets_fetched.add(limit)
+        markets = await self._fetch_active_markets_uncached(limit)
+        if markets:
+            if self.markets_cache_ttl > 0:
+                self._markets_cache[limit] = (time.monotonic(), markets)
+            if self._markets_disk is not None:
+                self._markets_disk.set(('markets', limit), (time.time(), markets), expire=3600)
+        return markets
+
+    def _schedule_markets_refresh(self, limit: int):
+        """Refresh markets for a limit in the background unless already running."""
+        task = self._markets_refresh_tasks.get(limit)
+        if task is None or task.done():
+            self._markets_refresh_tasks[limit] = asyncio.create_task(self._refresh_markets(limit))
+
+    def _get_disk_markets(self, limit: int, max_age: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get persisted markets for a limit.
+
+        Args:
+            limit: Limit the markets were fetched with
+            max_age: Maximum age in seconds (None accepts any unexpired entry)
+
+        Returns:
+            Persisted market list, or None if absent or too old
+        """
+        if self._markets_disk is None:
+            return None
+        entry = self._markets_disk.get(('markets', limit))
+        if entry is None:
+            return None
+        fetched_at, markets = entry
+        if max_age is not None and time.time() - fetched_at >= max_age:
+            return None
+        return markets
+
+    def _get_cached_markets(self, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get cached markets for a limit if the entry is still fresh.
+
+        Args:
+            limit: Limit the markets were fetched with
+
+        Returns:
+            Copy of the cached market list, or None on a miss
+        """
+        entry = self._markets_cache.get(limit)
+        if entry is None:
+            return None
+        fetched_at, markets = entry
+        if time.monotonic() - fetched_at >= self.markets_cache_ttl:
+            return None
+        return list(markets)
+
+    async def _fetch_active_markets_uncached(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Fetch active markets from the CLOB API, bypassing the cache.
+
+        Args:
+            limit: Maximum number of markets to fetch
+
+        Returns:
+            List of market dictionaries (empty on error)
+        """
         try:
             loop = asyncio.get_event_loop()
 
-            # Get markets using py-clob-client (runs in thread pool since it's synchronous)
+            # Get markets using py-clob-client (runs in the CLOB thread pool since it's synchronous)
             markets_raw = await loop.run_in_executor(
-                None,
-                lambda: self._get_client().get_markets()
+                self._get_executor(),
+                self._get_client().get_markets
             )
 
             if not markets_raw:
@@ -109,11 +452,10 @@ class PolymarketDataCollector:
             markets = []
             # Handle both list and dict responses
             market_list = markets_raw if isinstance(markets_raw, list) else markets_raw.get('data', [])
-            for i, market in enumerate(market_list):
-                if i >= limit:  # Limit results
-                    break
+            parse_market = self._parse_market
+            for market in islice(market_list, limit):  # Limit results
                 try:
-                    parsed_market = self._parse_market(market)
+                    parsed_market = parse_market(market)
                     if parsed_market:
                         markets.append(parsed_market)
                 except Exception as e:
@@ -140,18 +482,15 @@ class PolymarketDataCollector:
         try:
             # Extract market data (structure may vary based on API response)
             if isinstance(market_raw, dict):
-                market_id = market_raw.get('condition_id') or market_raw.get('id')
-                question = market_raw.get('question') or market_raw.get('title', 'Unknown')
-                slug = market_raw.get('market_slug') or market_raw.get('slug', '')
-
+                get = market_raw.get
                 return {
-                    'id': str(market_id),
-                    'question': question,
-                    'slug': slug,
-                    'total_volume': float(market_raw.get('volume', 0.0)),
-                    'active': market_raw.get('active', True),
-                    'end_date': self._parse_datetime(market_raw.get('end_date_iso')),
-                    'category': market_raw.get('category', ''),
+                    'id': str(_first(market_raw, _MARKET_ID_KEYS)),
+                    'question': _first(market_raw, _MARKET_QUESTION_KEYS, 'Unknown'),
+                    'slug': _first(market_raw, _MARKET_SLUG_KEYS, ''),
+                    'total_volume': float(get('volume', 0.0)),
+                    'active': get('active', True),
+                    'end_date': self._parse_datetime(get('end_date_iso')),
+                    'category': get('category', ''),
                 }
             return None
 
@@ -168,6 +507,10 @@ class PolymarketDataCollector:
         """
         Fetch recent trades for a specific market using the public Data API.
 
+        Identical requests already in flight are coalesced: later callers
+        await the first caller's fetch instead of issuing their own. The
+        shared fetch is cancelled once every caller awaiting it is cancelled.
+
         Args:
             market_id: Market condition ID
             since: Fetch trades after this timestamp
@@ -176,32 +519,80 @@ class PolymarketDataCollector:
         Returns:
             List of trade dictionaries
         """
+        key = (market_id, since, limit)
+        task = self._inflight_trades.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_market_trades_uncached(market_id, since, limit))
+            self._inflight_trades[key] = task
+            self._trade_waiters[task] = 0
+        self._trade_waiters[task] += 1
+        try:
+            # Shielded so one caller's cancellation doesn't fail the others
+            return list(await asyncio.shield(task))
+        finally:
+            self._trade_waiters[task] -= 1
+            if not self._trade_waiters[task]:
+                # Last caller gone; stop the request if it is still running
+                del self._trade_waiters[task]
+                if self._inflight_trades.get(key) is task:
+                    del self._inflight_trades[key]
+                task.cancel()
+
+    async def _fetch_market_trades_uncached(
+        self,
+        market_id: str,
+        since: Optional[datetime],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch recent trades for a market from the Data API, without coalescing.
+
+        Args:
+            market_id: Market condition ID
+            since: Fetch trades after this timestamp
+            limit: Maximum number of trades to fetch
+
+        Returns:
+            List of trade dictionaries (empty on error)
+        """
         try:
-            # Use the public Data API endpoint (no authentication required)
-            url = "https://data-api.polymarket.com/trades"
             params = {
                 "market": market_id,
                 "limit": min(limit, 100),  # API allows up to 10,000 but we limit to 100
                 "offset": 0
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=self.timeout_seconds)) as response:
-                    if response.status != 200:
-                        logger.warning(f"Data API returned status {response.status} for market {market_id}")
-                        return []
-
-                    trades_raw = await response.json()
+            trades_raw = await exponential_backoff_retry(
+                self._request_trades_page,
+                self.max_retries,
+                self.backoff_factor,
+                market_id,
+                params,
+                limiter=self.rate_limiter
+            )
 
             if not trades_raw:
-                logger.debug(f"No trades found for market {market_id}")
+                logger.debug("No trades found for market %s", market_id)
                 return []
 
             # Parse trades from Data API format
+            timestamps = self._batch_unix_timestamps(trades_raw)
+            if timestamps is not None:
+                if since and since.tzinfo is None:
+                    # Drop old trades before building any records for them
+                    keep = timestamps >= np.datetime64(since, 'us')
+                    trades_raw = [trade for trade, k in zip(trades_raw, keep) if k]
+                    timestamps = timestamps[keep]
+                timestamps = timestamps.tolist()  # C-level datetime construction
+
             trades = []
-            for trade in trades_raw:
+            parse_trade = self._parse_trade_from_data_api
+            batch_now = datetime.utcnow()  # Shared fallback for trades without a timestamp
+            for i, trade in enumerate(trades_raw):
                 try:
-                    parsed_trade = self._parse_trade_from_data_api(trade, market_id)
+                    parsed_trade = parse_trade(
+                        trade, market_id, timestamps[i] if timestamps is not None else None, batch_now
+                    )
                     if parsed_trade:
                         # Filter by timestamp if specified
                         if since and parsed_trade['timestamp'] < since:
@@ -211,20 +602,95 @@ class PolymarketDataCollector:
                     logger.error(f"Error parsing trade: {e}", extra={'trade': str(trade)[:100]})
                     continue
 
-            logger.debug(f"Fetched {len(trades)} trades for market {market_id}")
+            logger.debug("Fetched %d trades for market %s", len(trades), market_id)
             return trades
 
         except Exception as e:
             logger.error(f"Error fetching trades for market {market_id}: {e}")
             return []
 
-    def _parse_trade_from_data_api(self, trade_raw: Any, market_id: str) -> Optional[Dict[str, Any]]:
+    async def _request_trades_page(self, market_id: str, params: Dict[str, Any]) -> Any:
+        """
+        Request one page of trades from the Data API.
+
+        Args:
+            market_id: Market condition ID (for logging)
+            params: Query parameters
+
+        Returns:
+            Decoded JSON body, or None for an empty body or non-200 status
+
+        Raises:
+            aiohttp.ClientResponseError: On HTTP 429, so the caller can back off
+        """
+        session = self._get_session()
+        async with self.rate_limiter:
+            # The session carries the request timeout
+            async with session.get(_DATA_API_TRADES_URL, params=params) as response:
+                if response.status == 429:
+                    raise aiohttp.ClientResponseError(
+                        response.request_info,
+                        response.history,
+                        status=response.status,
+                        message=f"Data API rate limited market {market_id}",
+                        headers=response.headers
+                    )
+                if response.status != 200:
+                    logger.warning(f"Data API returned status {response.status} for market {market_id}")
+                    return None
+
+                # Decode the raw body directly; skips aiohttp's charset and
+                # content-type handling
+                body = await response.read()
+                return json_loads(body) if body.strip() else None
+
+    @staticmethod
+    def _batch_unix_timestamps(trades_raw: Any) -> Optional[np.ndarray]:
+        """
+        Convert a batch of unix-second trade timestamps in one NumPy pass.
+
+        Only applies when every trade carries a positive integer timestamp
+        (as an int or digit string); anything else is left to the per-trade
+        parser so its handling of odd values is unchanged.
+
+        Args:
+            trades_raw: Raw trades from the Data API
+
+        Returns:
+            datetime64[s] array aligned with trades_raw, or None
+        """
+        if not isinstance(trades_raw, list):
+            return None
+        try:
+            raw = [trade['timestamp'] for trade in trades_raw]
+        except (TypeError, KeyError):
+            return None
+        for value in raw:
+            if type(value) is int or (type(value) is str and value.isdigit()):
+                continue
+            return None
+
+        seconds = np.array(raw, dtype=np.int64)
+        if seconds.size == 0 or seconds.min() <= 0 or seconds.max() >= _MAX_UNIX_SECONDS:
+            return None
+        return seconds.astype('datetime64[s]')
+
+    def _parse_trade_from_data_api(
+        self,
+        trade_raw: Any,
+        market_id: str,
+        timestamp: Optional[datetime] = None,
+        batch_now: Optional[datetime] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Parse trade data from the public Data API format.
 
         Args:
             trade_raw: Raw trade data from Data API
             market_id: Market ID
+            timestamp: Trade time if already parsed in bulk
+            batch_now: Fallback time for trades without a timestamp, taken
+                once per response (defaults to now)
 
         Returns:
             Parsed trade dictionary or None
@@ -232,24 +698,25 @@ class PolymarketDataCollector:
         try:
             if isinstance(trade_raw, dict):
                 # Data API format: proxyWallet, side, size, price, timestamp, conditionId, etc
-                timestamp = self._parse_datetime(trade_raw.get('timestamp'))
+                get = trade_raw.get
+                if timestamp is None:
+                    timestamp = self._parse_datetime(get('timestamp'))
 
                 # Calculate trade size in USD
-                price = float(trade_raw.get('price', 0.0))
-                size_tokens = float(trade_raw.get('size', 0.0))
-                size_usd = price * size_tokens  # Approximate USD value
+                price = float(get('price', 0.0))
+                size_usd = price * float(get('size', 0.0))  # Approximate USD value
 
                 return {
-                    'order_id': trade_raw.get('transactionHash', '')[:16],  # Use tx hash prefix as ID
-                    'market_id': trade_raw.get('conditionId', market_id),
-                    'address': trade_raw.get('proxyWallet', 'unknown'),
-                    'outcome': trade_raw.get('outcome', 'YES'),
+                    'order_id': get('transactionHash', '')[:16],  # Use tx hash prefix as ID
+                    'market_id': get('conditionId', market_id),
+                    'address': get('proxyWallet', 'unknown'),
+                    'outcome': get('outcome', 'YES'),
                     'size': size_usd,
                     'price': price,
-                    'side': trade_raw.get('side', 'BUY').upper(),
-                    'timestamp': timestamp or datetime.utcnow(),
+                    'side': get('side', 'BUY').upper(),
+                    'timestamp': timestamp or batch_now or datetime.utcnow(),
                     'fee': 0.0,  # Data API doesn't include fees
-                    'asset_id': trade_raw.get('asset', ''),
+                    'asset_id': get('asset', ''),
                 }
 
             return None
@@ -272,7 +739,7 @@ class PolymarketDataCollector:
         try:
             if isinstance(trade_raw, dict):
                 # Extract trade data
-                order_id = trade_raw.get('id') or trade_raw.get('trade_id', '')
+                order_id = _first(trade_raw, _TRADE_ID_KEYS, '')
                 timestamp = self._parse_datetime(trade_raw.get('timestamp'))
 
                 # Calculate trade size in USD
@@ -284,7 +751,7 @@ class PolymarketDataCollector:
                 return {
                     'order_id': str(order_id),
                     'market_id': market_id,
-                    'address': trade_raw.get('maker_address') or trade_raw.get('taker_address', 'unknown'),
+                    'address': _first(trade_raw, _TRADE_ADDRESS_KEYS, 'unknown'),
                     'outcome': trade_raw.get('outcome', 'YES'),
                     'size': size_usd,
                     'price': price,
@@ -300,6 +767,64 @@ class PolymarketDataCollector:
             logger.error(f"Error parsing trade data: {e}")
             return None
 
+    async def _iter_market_trades(
+        self,
+        market_ids: List[str],
+        since: Optional[datetime],
+        limit_per_market: int
+    ) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Fetch trades for markets concurrently, yielding each as it completes.
+
+        Args:
+            market_ids: List of market IDs
+            since: Fetch trades after this timestamp
+            limit_per_market: Maximum trades per market
+
+        Yields:
+            Tuples of (index into market_ids, trades for that market)
+        """
+        async def fetch(index: int, market_id: str):
+            return index, await self.fetch_market_trades(market_id, since, limit_per_market)
+
+        tasks = [
+            asyncio.create_task(fetch(index, market_id))
+            for index, market_id in enumerate(market_ids)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    yield await next_done
+                except Exception as e:
+                    logger.error(f"Error in concurrent fetch: {e}")
+        finally:
+            # Consumer stopped early or was cancelled; don't leak requests
+            for task in tasks:
+                task.cancel()
+
+    async def stream_recent_trades(
+        self,
+        market_ids: List[str],
+        since: Optional[datetime] = None,
+        limit_per_market: int = 100
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream recent trades per market as each market's fetch completes.
+
+        Lets callers start processing fast markets while slow ones are
+        still in flight.
+
+        Args:
+            market_ids: List of market IDs
+            since: Fetch trades after this timestamp
+            limit_per_market: Maximum trades per market
+
+        Yields:
+            List of trades for one market, in completion order
+        """
+        async for _, trades in self._iter_market_trades(market_ids, since, limit_per_market):
+            yield trades
+
     async def fetch_all_recent_trades(
         self,
         market_ids: List[str],
@@ -309,6 +834,9 @@ class PolymarketDataCollector:
         """
         Fetch recent trades for multiple markets concurrently.
 
+        Requests share one session and the adaptive limiter bounds how many
+        are in flight at a time.
+
         Args:
             market_ids: List of market IDs
             since: Fetch trades after this timestamp
@@ -317,27 +845,47 @@ class PolymarketDataCollector:
         Returns:
             Combined list of all trades
         """
-        tasks = [
-            self.fetch_market_trades(market_id, since, limit_per_market)
-            for market_id in market_ids
-        ]
+        # Reassemble in market order so trades with equal timestamps keep a
+        # deterministic order after the stable sort
+        results: List[List[Dict[str, Any]]] = [[] for _ in market_ids]
+        async for index, trades in self._iter_market_trades(market_ids, since, limit_per_market):
+            results[index] = trades
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Flatten results and filter out errors
-        all_trades = []
-        for result in results:
-            if isinstance(result, list):
-                all_trades.extend(result)
-            elif isinstance(result, Exception):
-                logger.error(f"Error in concurrent fetch: {result}")
+        all_trades = [trade for trades in results for trade in trades]
 
         # Sort by timestamp descending
-        all_trades.sort(key=lambda t: t['timestamp'], reverse=True)
+        all_trades = self._sort_trades_newest_first(all_trades)
 
         logger.info(f"Fetched {len(all_trades)} total trades across {len(market_ids)} markets")
         return all_trades
 
+    @staticmethod
+    def _sort_trades_newest_first(trades: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Sort trades by timestamp, newest first.
+
+        Naive UTC timestamps are sorted as an int64 array in NumPy instead of
+        with a Python key function; ties keep their fetch order.
+
+        Args:
+            trades: Parsed trade dictionaries
+
+        Returns:
+            Sorted list of trades
+        """
+        if len(trades) < 2:
+            return trades
+
+        timestamps = [trade['timestamp'] for trade in trades]
+        if timestamps[0].tzinfo is not None:
+            # ISO timestamps with offsets; NumPy has no timezone support
+            trades.sort(key=lambda t: t['timestamp'], reverse=True)
+            return trades
+
+        ts = np.array(timestamps, dtype='datetime64[us]').astype(np.int64)
+        order = np.argsort(-ts, kind='stable')
+        return [trades[i] for i in order]
+
     async def fetch_orderbook(self, market_id: str) -> Optional[Dict[str, Any]]:
         """
         Fetch order book for a market.
@@ -352,12 +900,13 @@ class PolymarketDataCollector:
             loop = asyncio.get_event_loop()
 
             orderbook = await loop.run_in_executor(
-                None,
-                lambda: self._get_client().get_order_book(market_id)
+                self._get_executor(),
+                self._get_client().get_order_book,
+                market_id
             )
 
             if not orderbook:
-                logger.debug(f"No orderbook data for market {market_id}")
+                logger.debug("No orderbook data for market %s", market_id)
                 return None
 
             return self._parse_orderbook(orderbook)
@@ -401,12 +950,14 @@ class PolymarketDataCollector:
 
             # Handle string values
             if isinstance(dt_value, str):
+                # Unix seconds fit in 11 digits and ISO timestamps are longer,
+                # so the length picks the format without scanning the string
+                if len(dt_value) < 12:
+                    if dt_value.isdigit():
+                        return datetime.utcfromtimestamp(int(dt_value))
                 # Try parsing ISO format
-                if 'T' in dt_value:
-                    return datetime.fromisoformat(dt_value.replace('Z', '+00:00'))
-                # Try parsing unix timestamp string
-                elif dt_value.isdigit():
-                    return datetime.utcfromtimestamp(int(dt_value))
+                elif 'T' in dt_value:
+                    return _parse_iso(dt_value)
 
             return None
 
@@ -422,7 +973,7 @@ class PolymarketDataCollector:
             True if API is healthy, False otherwise
         """
         try:
-            # Simple health check - try to fetch markets
+            # Simple health check - try to fetch markets (served from cache when fresh)
             markets = await self.fetch_active_markets(limit=1)
             is_healthy = len(markets) > 0
 
@@ -438,22 +989,50 @@ class PolymarketDataCollector:
             return False
 
 
+def _retry_after_seconds(headers) -> Optional[float]:
+    """
+    Read a delay in seconds from a Retry-After header.
+
+    Args:
+        headers: Response headers (may be None)
+
+    Returns:
+        Delay in seconds, or None if absent or not given in seconds
+    """
+    if not headers:
+        return None
+    value = headers.get('Retry-After')
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        # HTTP-date form; fall back to computed backoff
+        return None
+
+
 # Utility function for exponential backoff
 async def exponential_backoff_retry(
     func,
     max_retries: int = 3,
     backoff_factor: int = 2,
     *args,
+    max_delay: float = 60.0,
+    limiter: Optional[AdaptiveLimiter] = None,
     **kwargs
 ):
     """
     Execute function with exponential backoff retry logic.
 
+    Delays are jittered so concurrent callers do not retry in lockstep.
+    HTTP 429 errors honor the server's Retry-After header and, when a
+    limiter is given, shrink its window.
+
     Args:
         func: Async function to execute
         max_retries: Maximum retry attempts
         backoff_factor: Backoff multiplier
         *args: Function arguments
+        max_delay: Upper bound on a single wait in seconds
+        limiter: Optional adaptive limiter to signal on success and 429
         **kwargs: Function keyword arguments
 
     Returns:
@@ -466,14 +1045,26 @@ async def exponential_backoff_retry(
 
     for attempt in range(max_retries):
         try:
-            return await func(*args, **kwargs)
+            result = await func(*args, **kwargs)
+            if limiter is not None:
+                limiter.on_success()
+            return result
         except Exception as e:
             last_exception = e
+            retry_after = None
+            if isinstance(e, aiohttp.ClientResponseError) and e.status == 429:
+                if limiter is not None:
+                    limiter.on_throttle()
+                retry_after = _retry_after_seconds(e.headers)
+
             if attempt < max_retries - 1:
-                wait_time = backoff_factor ** attempt
+                if retry_after is not None:
+                    wait_time = min(max_delay, retry_after)
+                else:
+                    wait_time = min(max_delay, backoff_factor ** attempt * (0.5 + random.random()))
                 logger.warning(
                     f"Retry {attempt + 1}/{max_retries} after error: {e}. "
-                    f"Waiting {wait_time}s before retry"
+                    f"Waiting {wait_time:.1f}s before retry"
                 )
                 await asyncio.sleep(wait_time)
             else:
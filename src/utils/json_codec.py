@@ -0,0 +1,91 @@
+"""
+JSON encoding and decoding for Polymarket monitoring bot.
+
+Uses orjson when it is installed and falls back to the standard library
+json module otherwise. discord.py picks up orjson on its own as well.
+"""
+
+import json
+import math
+from typing import Any, Union
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """
+    Check whether an object contains an inf or NaN float.
+
+    orjson writes these as null, so callers fall back to json for them.
+
+    Args:
+        obj: Object to check
+
+    Returns:
+        True if any float in the object is not finite
+    """
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(v) for v in obj)
+    if isinstance(obj, (np.floating, np.ndarray)):
+        return np.issubdtype(obj.dtype, np.floating) and not np.isfinite(obj).all()
+    return False
+
+
+def _default(obj: Any) -> Any:
+    """Convert NumPy values for the stdlib encoder."""
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serialize an object to a JSON string.
+
+    Non-finite floats (e.g. a zero-variance z-score of inf) are written as
+    Infinity/NaN by the stdlib encoder so they survive a round trip.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        JSON string
+    """
+    if orjson is not None and not _has_non_finite(obj):
+        try:
+            return orjson.dumps(
+                obj,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ).decode()
+        except TypeError:
+            # Fall back for types orjson does not serialize
+            pass
+    return json.dumps(obj, default=_default)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Deserialize a JSON string or bytes.
+
+    Args:
+        data: JSON document
+
+    Returns:
+        Deserialized object
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            # Details written by the stdlib encoder may contain NaN/Infinity
+            pass
+    return json.loads(data)
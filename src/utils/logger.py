@@ -4,12 +4,20 @@ Structured logging configuration for Polymarket monitoring bot.
 Provides JSON and text logging formats with rotation support.
 """
 
+import atexit
+import copy
 import logging
+import queue
 import sys
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pythonjsonlogger.jsonlogger import JsonFormatter
-from typing import Optional
+from typing import Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class CustomJsonFormatter(JsonFormatter):
@@ -30,6 +38,50 @@ class CustomJsonFormatter(JsonFormatter):
         if record.exc_info:
             log_record['exception'] = self.formatException(record.exc_info)
 
+    def jsonify_log_record(self, log_record):
+        """Serialize log record with orjson when available."""
+        if orjson is not None:
+            try:
+                return orjson.dumps(
+                    log_record,
+                    default=self.json_default,
+                    option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                ).decode()
+            except TypeError:
+                # Fall back for values orjson cannot serialize
+                pass
+        return super().jsonify_log_record(log_record)
+
+
+class _LocalQueueHandler(QueueHandler):
+    """
+    Queue handler for a listener in the same process.
+
+    The stock QueueHandler pre-formats records with its own formatter and
+    drops exc_info, which would lose the structured exception field of the
+    JSON formatter. Records here only need their message merged with args.
+    """
+
+    def prepare(self, record):
+        """Merge message args so the record is safe to format later."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# Background listeners writing file logs, keyed by logger name
+_listeners: Dict[str, QueueListener] = {}
+
+
+def _stop_listener(name: str):
+    """Stop a logger's file listener, flushing queued records."""
+    listener = _listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
 
 def setup_logger(
     name: str = 'polymarket_bot',
@@ -43,6 +95,9 @@ def setup_logger(
     """
     Set up structured logger with file rotation and optional console output.
 
+    File output goes through a queue to a background listener thread, so
+    disk writes and rotation never block the caller (e.g. the event loop).
+
     Args:
         name: Logger name
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -60,6 +115,7 @@ def setup_logger(
 
     # Remove existing handlers to avoid duplicates
     logger.handlers.clear()
+    _stop_listener(name)
 
     # Create formatter based on format type
     if log_format == 'json':
@@ -91,7 +147,12 @@ def setup_logger(
             backupCount=backup_count
         )
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        _listeners[name] = listener
+        logger.addHandler(_LocalQueueHandler(log_queue))
 
     return logger
 
@@ -148,6 +209,25 @@ def init_logging(
     return _logger
 
 
+# Level names accepted by log_with_context
+_LEVELS = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+    'critical': logging.CRITICAL,
+}
+
+
+def shutdown_logging():
+    """Stop background log listeners, flushing queued records to disk."""
+    for name in list(_listeners):
+        _stop_listener(name)
+
+
+atexit.register(shutdown_logging)
+
+
 def log_with_context(logger: logging.Logger, level: str, message: str, **context):
     """
     Log message with additional context fields.
@@ -168,5 +248,7 @@ def log_with_context(logger: logging.Logger, level: str, message: str, **context
         ...     duration_ms=234
         ... )
     """
-    log_func = getattr(logger, level.lower())
-    log_func(message, extra={'context': context})
+    level_no = _LEVELS[level.lower()]
+    if not logger.isEnabledFor(level_no):
+        return
+    logger.log(level_no, message, extra={'context': context})
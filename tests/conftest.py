@@ -0,0 +1,64 @@
+"""
+Shared pytest fixtures for detection tests.
+"""
+
+import json
+import os
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from database.repository import DatabaseRepository
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+SAMPLE_DATA_JSON = FIXTURES_DIR / "sample_data.json"
+SAMPLE_DATA_PKL = SAMPLE_DATA_JSON.with_suffix(".pkl")
+
+
+def pytest_sessionstart(session):
+    """Re-dump sample_data.json as a pickle when the JSON is newer."""
+    if (SAMPLE_DATA_PKL.exists()
+            and SAMPLE_DATA_PKL.stat().st_mtime >= SAMPLE_DATA_JSON.stat().st_mtime):
+        return
+    data = json_loads(SAMPLE_DATA_JSON.read_bytes())
+    # Write then rename so a concurrent reader never sees a partial file
+    tmp_path = SAMPLE_DATA_PKL.with_suffix(f".pkl.{os.getpid()}.tmp")
+    tmp_path.write_bytes(pickle.dumps(data, protocol=5))
+    os.replace(tmp_path, SAMPLE_DATA_PKL)
+
+
+@pytest.fixture(scope="session")
+def fixtures():
+    """Sample market and bet data, loaded once per test session."""
+    return pickle.loads(SAMPLE_DATA_PKL.read_bytes())
+
+
+@pytest.fixture(scope="session")
+def market_volume(fixtures):
+    """Total volume of the first sample market."""
+    return fixtures['markets'][0]['total_volume']
+
+
+@pytest.fixture(scope="module")
+def zscore_data():
+    """Reference data for z-score tests, as a read-only array."""
+    data = np.array([10, 12, 11, 13, 10, 12, 11, 13, 12, 11], dtype=np.float64)
+    data.setflags(write=False)
+    return data
+
+
+@pytest.fixture
+def db():
+    """Empty in-memory database repository with tables created."""
+    repository = DatabaseRepository(":memory:")
+    repository.create_tables()
+    yield repository
+    repository.engine.dispose()
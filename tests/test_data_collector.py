@@ -0,0 +1,306 @@
+"""
+Unit tests for the Polymarket data collector.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from monitoring.data_collector import AdaptiveLimiter, PolymarketDataCollector
+from utils.json_codec import dumps
+
+
+@pytest.fixture
+def slow_collector():
+    """Collector whose trade fetches block until released, recording outcomes."""
+    collector = PolymarketDataCollector()
+    collector.release = asyncio.Event()
+    collector.outcomes = {'started': 0, 'finished': 0, 'cancelled': 0}
+
+    async def fetch(market_id, since, limit):
+        collector.outcomes['started'] += 1
+        try:
+            await collector.release.wait()
+        except asyncio.CancelledError:
+            collector.outcomes['cancelled'] += 1
+            raise
+        collector.outcomes['finished'] += 1
+        return [{'market_id': market_id}]
+
+    collector._fetch_market_trades_uncached = fetch
+    return collector
+
+
+async def _settle():
+    """Let pending callbacks and cancellations run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestFetchMarketTradesCoalescing:
+    """Test single-flight coalescing of identical trade requests."""
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_share_one_fetch(self, slow_collector):
+        """Test that concurrent identical requests issue a single fetch."""
+        callers = [asyncio.create_task(slow_collector.fetch_market_trades('m1')) for _ in range(3)]
+        await _settle()
+        slow_collector.release.set()
+
+        results = await asyncio.gather(*callers)
+
+        assert results == [[{'market_id': 'm1'}]] * 3
+        assert slow_collector.outcomes['started'] == 1
+        assert not slow_collector._inflight_trades
+
+    @pytest.mark.asyncio
+    async def test_one_cancelled_caller_keeps_shared_fetch(self, slow_collector):
+        """Test that cancelling one caller doesn't fail the others."""
+        first = asyncio.create_task(slow_collector.fetch_market_trades('m1'))
+        second = asyncio.create_task(slow_collector.fetch_market_trades('m1'))
+        await _settle()
+
+        first.cancel()
+        await _settle()
+        slow_collector.release.set()
+
+        assert await second == [{'market_id': 'm1'}]
+        assert first.cancelled()
+        assert slow_collector.outcomes == {'started': 1, 'finished': 1, 'cancelled': 0}
+
+    @pytest.mark.asyncio
+    async def test_last_cancelled_caller_cancels_fetch(self, slow_collector):
+        """Test that the shared fetch stops once every caller is cancelled."""
+        callers = [asyncio.create_task(slow_collector.fetch_market_trades('m1')) for _ in range(2)]
+        await _settle()
+
+        for caller in callers:
+            caller.cancel()
+        await _settle()
+
+        assert slow_collector.outcomes == {'started': 1, 'finished': 0, 'cancelled': 1}
+        assert not slow_collector._inflight_trades
+        assert not slow_collector._trade_waiters
+
+    @pytest.mark.asyncio
+    async def test_stream_closed_early_cancels_fetches(self, slow_collector):
+        """Test that closing a trade stream early cancels the outstanding fetches."""
+        stream = slow_collector.stream_recent_trades(['m1', 'm2', 'm3'])
+        consumer = asyncio.create_task(stream.__anext__())
+        await _settle()
+
+        consumer.cancel()
+        await _settle()
+        await stream.aclose()
+        await _settle()
+
+        assert slow_collector.outcomes == {'started': 3, 'finished': 0, 'cancelled': 3}
+
+    @pytest.mark.asyncio
+    async def test_aclose_cancels_inflight_fetches(self, slow_collector):
+        """Test that closing the collector cancels fetches still running."""
+        caller = asyncio.create_task(slow_collector.fetch_market_trades('m1'))
+        await _settle()
+
+        await slow_collector.aclose()
+        await _settle()
+
+        assert caller.cancelled()
+        assert slow_collector.outcomes['cancelled'] == 1
+
+
+class _FakeResponse:
+    """Data API response returning a fixed body."""
+
+    request_info = SimpleNamespace(real_url='https://data-api.polymarket.com/trades')
+    history = ()
+
+    def __init__(self, status, body, headers=None):
+        self.status = status
+        self._body = body
+        self.headers = headers or {}
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class _FakeSession:
+    """Session whose GETs return a fixed response, or the given responses in turn."""
+
+    def __init__(self, status=200, body=b'', headers=None, responses=None):
+        self.status = status
+        self.body = body
+        self.headers = headers
+        self.responses = list(responses or [])
+        self.calls = 0
+
+    def get(self, url, params=None):
+        self.calls += 1
+        if self.responses:
+            return self.responses.pop(0)
+        return _FakeResponse(self.status, self.body, self.headers)
+
+
+class TestAdaptiveLimiter:
+    """Test the AIMD concurrency window."""
+
+    def test_window_sequence(self):
+        """Test halving on 429 and growth by one per full window of successes."""
+        limiter = AdaptiveLimiter(max_window=8)
+        windows = []
+
+        limiter.on_throttle()
+        windows.append(limiter.window)  # 8 -> 4
+        limiter.on_throttle()
+        windows.append(limiter.window)  # 4 -> 2
+        for _ in range(2):
+            limiter.on_success()
+        windows.append(limiter.window)  # Full window of 2 -> 3
+        for _ in range(2):
+            limiter.on_success()
+        windows.append(limiter.window)  # Streak 2 of 3, unchanged
+        limiter.on_throttle()
+        windows.append(limiter.window)  # 3 -> 1, streak reset
+        limiter.on_success()
+        windows.append(limiter.window)  # 1 -> 2
+
+        assert windows == [4, 2, 3, 3, 1, 2]
+        assert limiter.last_429_ts is not None
+
+    def test_window_capped_at_max(self):
+        """Test that successes never grow the window past max_window."""
+        limiter = AdaptiveLimiter(max_window=4)
+
+        for _ in range(100):
+            limiter.on_success()
+
+        assert limiter.window == 4
+
+    @pytest.mark.parametrize("max_window,min_window,expected", [
+        pytest.param(8, 3, [4, 3, 3], id="floor"),
+        pytest.param(8, 1, [4, 2, 1], id="default_floor"),
+        pytest.param(4, 10, [4, 4, 4], id="min_above_max"),
+    ])
+    def test_min_window_floor(self, max_window, min_window, expected):
+        """Test that repeated 429s never shrink the window below min_window."""
+        limiter = AdaptiveLimiter(max_window=max_window, min_window=min_window)
+        windows = []
+
+        for _ in range(3):
+            limiter.on_throttle()
+            windows.append(limiter.window)
+
+        assert windows == expected
+
+    @pytest.mark.asyncio
+    async def test_acquire_respects_window(self):
+        """Test that no more requests than the window run at once."""
+        limiter = AdaptiveLimiter(max_window=4)
+        limiter.on_throttle()  # Window 2
+        running, peak = 0, 0
+
+        async def request():
+            nonlocal running, peak
+            async with limiter:
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0)
+                running -= 1
+
+        await asyncio.gather(*(request() for _ in range(10)))
+
+        assert peak == 2
+
+
+class TestBatchUnixTimestamps:
+    """Test bulk conversion of Data API trade timestamps."""
+
+    @pytest.mark.parametrize("trades", [
+        pytest.param([{'timestamp': 1700000000}, {'timestamp': 1700000000.5}], id="float"),
+        pytest.param([{'timestamp': 1700000000}, {'timestamp': '2023-11-14T22:13:20Z'}], id="iso"),
+        pytest.param([{'timestamp': '1700000000'}, {'timestamp': None}], id="mixed_none"),
+        pytest.param([{'timestamp': 1700000000}, {'timestamp': True}], id="bool"),
+        pytest.param([{'timestamp': 1700000000}, {}], id="missing"),
+        pytest.param([{'timestamp': 0}], id="zero"),
+        pytest.param([{'timestamp': 253402300800}], id="past_year_9999"),
+        pytest.param([], id="empty"),
+        pytest.param({'timestamp': 1700000000}, id="not_a_list"),
+    ])
+    def test_falls_back(self, trades):
+        """Test that anything but positive integer seconds is left to the per-trade parser."""
+        assert PolymarketDataCollector._batch_unix_timestamps(trades) is None
+
+    def test_matches_per_trade_parse(self):
+        """Test that bulk conversion agrees with parsing each trade."""
+        collector = PolymarketDataCollector()
+        trades = [{'timestamp': 1700000000}, {'timestamp': '1700000123'}, {'timestamp': 1}]
+
+        timestamps = PolymarketDataCollector._batch_unix_timestamps(trades)
+
+        assert timestamps.tolist() == [collector._parse_datetime(t['timestamp']) for t in trades]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("timestamps", [
+        pytest.param([1700000300, '1700000000', 1700000100, 1700000200, 1699990000], id="batched"),
+        pytest.param([1700000300, '1700000000', 1700000100.0, 1700000200, 1699990000], id="per_trade"),
+    ])
+    async def test_since_mask_matches_per_trade_filter(self, timestamps):
+        """Test that trades kept with the bulk since-mask match the per-trade filter."""
+        collector = PolymarketDataCollector()
+        trades = [
+            {'transactionHash': f'0x{i:04d}', 'proxyWallet': '0xa', 'price': 0.5, 'size': 10, 'timestamp': ts}
+            for i, ts in enumerate(timestamps)
+        ]
+        collector._get_session = lambda: _FakeSession(200, dumps(trades).encode())
+        # Boundary trade at exactly `since` is kept
+        since = collector._parse_datetime(1700000100)
+
+        fetched = await collector._fetch_market_trades_uncached('m1', since, 100)
+
+        expected = [
+            parsed for parsed in (collector._parse_trade_from_data_api(t, 'm1') for t in trades)
+            if parsed['timestamp'] >= since
+        ]
+        assert fetched == expected
+        assert [t['order_id'] for t in fetched] == ['0x0000', '0x0002', '0x0003']
+
+
+class TestFetchRateLimited:
+    """Test that Data API 429s are retried through the backoff helper."""
+
+    @pytest.mark.asyncio
+    async def test_retries_after_429(self):
+        """Test that a 429 honors Retry-After, halves the window, then returns trades."""
+        collector = PolymarketDataCollector()
+        trades = [{'transactionHash': '0x01', 'proxyWallet': '0xa', 'price': 0.5, 'size': 10,
+                   'timestamp': 1700000000}]
+        session = _FakeSession(responses=[
+            _FakeResponse(429, b'', headers={'Retry-After': '0'}),
+            _FakeResponse(200, dumps(trades).encode()),
+        ])
+        collector._get_session = lambda: session
+        window = collector.rate_limiter.window
+
+        fetched = await collector._fetch_market_trades_uncached('m1', None, 100)
+
+        assert [t['order_id'] for t in fetched] == ['0x01']
+        assert session.calls == 2
+        assert collector.rate_limiter.window == max(collector.rate_limiter.min_window, window // 2)
+        assert collector.rate_limiter.last_429_ts is not None
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        """Test that persistent 429s stop after max_retries attempts."""
+        collector = PolymarketDataCollector(max_retries=2)
+        session = _FakeSession(429, headers={'Retry-After': '0'})
+        collector._get_session = lambda: session
+
+        assert await collector._fetch_market_trades_uncached('m1', None, 100) == []
+        assert session.calls == 2
@@ -2,80 +2,135 @@
 Unit tests for detection algorithms.
 """
 
+import math
+import operator
+from pathlib import Path
+from types import MappingProxyType
+
+import numpy as np
 import pytest
 from datetime import datetime, timedelta
-import json
-from pathlib import Path
 
-from src.detection.anomaly_algorithms import (
+from detection.anomaly_algorithms import (
     ZScoreDetector,
     IQRDetector,
+    WelfordState,
     calculate_statistics,
     is_outlier_by_zscore,
     is_outlier_by_iqr
 )
+from database.models import Bet
+from detection._time import hours_ago, to_unix_seconds
+from detection.pattern_detector import PatternDetector, find_first_rapid_cluster, group_indices
+from detection.statistics_calculator import MarketBetBuffer, MarketStatisticsCalculator, to_cents
+from detection.large_bet_detector import LargeBetDetector
+from detection.new_account_detector import NewAccountDetector
+from monitoring.config import Config
+
+
+# Evenly spaced sample used by the statistics tests
+_RAMP_DATA = (10, 15, 20, 25, 30, 35, 40, 45, 50)
+
+# Quartiles follow NumPy's default (linear) percentile convention
+_RAMP_Q1, _RAMP_Q3 = np.percentile(_RAMP_DATA, [25, 75])
 
+_RAMP_EXPECTED = MappingProxyType({
+    'count': 9,
+    'mean': 30.0,
+    'median': 30.0,
+    'std_dev': math.sqrt(187.5),  # Sample variance 1500 / 8
+    'min': 10.0,
+    'max': 50.0,
+    'q1': float(_RAMP_Q1),
+    'q3': float(_RAMP_Q3),
+    'iqr': float(_RAMP_Q3 - _RAMP_Q1),
+})
 
-# Load test fixtures
-def load_fixtures():
-    """Load test fixture data."""
-    fixture_path = Path(__file__).parent / "fixtures" / "sample_data.json"
-    with open(fixture_path, 'r') as f:
-        return json.load(f)
+
+@pytest.fixture(scope="module")
+def ramp_stats():
+    """calculate_statistics output for _RAMP_DATA, computed once."""
+    return calculate_statistics(list(_RAMP_DATA))
+
+
+@pytest.fixture
+def config(monkeypatch):
+    """Config loaded from the shipped config.yaml."""
+    monkeypatch.setenv('DISCORD_BOT_TOKEN', 'test-token')
+    monkeypatch.setenv('DISCORD_CHANNEL_ID', '1')
+    return Config(str(Path(__file__).parent.parent / 'config' / 'config.yaml'))
+
+
+@pytest.fixture(scope="module")
+def zdet():
+    """Z-score detector shared across tests (it holds no per-call state)."""
+    return ZScoreDetector(threshold=3.0)
 
 
 class TestZScoreDetector:
     """Test Z-score anomaly detection."""
 
-    def test_detect_normal_value(self):
-        """Test that normal values are not flagged."""
+    @pytest.mark.parametrize("data,value,expect_anomaly,score_check,error", [
+        # data=None uses the shared zscore_data reference
+        pytest.param(None, 12, False, (operator.lt, 3.0), None, id="normal"),
+        pytest.param(None, 100, True, (operator.gt, 3.0), None, id="outlier"),
+        pytest.param([10], 12, False, None, 'insufficient_data', id="insufficient_data"),
+        pytest.param([10] * 5, 10, False, None, None, id="zero_variance_same"),
+        pytest.param([10] * 5, 15, True, (operator.eq, float('inf')), None, id="zero_variance_different"),
+    ])
+    def test_zscore(self, zdet, zscore_data, data, value, expect_anomaly, score_check, error):
+        """Test z-score detection across normal, outlier and edge cases."""
+        result = zdet.detect(value, zscore_data if data is None else data)
+
+        assert result.is_anomaly == expect_anomaly
+        assert result.method == 'z_score'
+        if score_check is not None:
+            compare, bound = score_check
+            assert compare(result.score, bound)
+        if error is not None:
+            assert result.details.get('error') == error
+
+    def test_detect_batch_matches_detect(self, zscore_data):
+        """Test that batch detection agrees with per-value detection."""
         detector = ZScoreDetector(threshold=3.0)
-        data = [10, 12, 11, 13, 10, 12, 11, 13, 12, 11]
-        value = 12
+        values = [12, 100, 1, 11.5, -50]
 
-        result = detector.detect(value, data)
+        mask = detector.detect_batch(values, zscore_data)
 
-        assert not result.is_anomaly
-        assert result.method == 'z_score'
-        assert result.score < 3.0
+        assert list(mask) == [detector.detect(v, zscore_data).is_anomaly for v in values]
 
-    def test_detect_outlier(self):
-        """Test that outliers are detected."""
-        detector = ZScoreDetector(threshold=3.0)
-        data = [10, 12, 11, 13, 10, 12, 11, 13, 12, 11]
-        value = 100  # Clear outlier
+    @pytest.mark.parametrize("values,expected", [
+        pytest.param([12, 100, 11, 1000], [False, True, False, True], id="mixed"),
+        pytest.param([1, -50, 11.5, 13], [True, True, False, False], id="low_side"),
+    ])
+    def test_detect_batch_sweep(self, zdet, zscore_data, values, expected):
+        """Test a sweep of values in one vectorized batch call."""
+        mask = zdet.detect_batch(np.asarray(values), zscore_data)
 
-        result = detector.detect(value, data)
+        assert mask.tolist() == expected
 
-        assert result.is_anomaly
-        assert result.method == 'z_score'
-        assert result.score > 3.0
-
-    def test_insufficient_data(self):
-        """Test handling of insufficient data."""
+    def test_detect_batch_zero_variance(self):
+        """Test batch detection with zero variance reference data."""
         detector = ZScoreDetector(threshold=3.0)
-        data = [10]  # Only one data point
-        value = 12
+        data = [10, 10, 10, 10, 10]
 
-        result = detector.detect(value, data)
+        mask = detector.detect_batch([10, 15], data)
 
-        assert not result.is_anomaly
-        assert 'error' in result.details
-        assert result.details['error'] == 'insufficient_data'
+        assert list(mask) == [False, True]
 
-    def test_zero_variance(self):
-        """Test handling of zero variance data."""
+    def test_detect_from_rolling_state(self, zscore_data):
+        """Test detection against a rolling window's running statistics."""
         detector = ZScoreDetector(threshold=3.0)
-        data = [10, 10, 10, 10, 10]  # All same value
-        value_same = 10
-        value_different = 15
+        expired = [500, 900]
 
-        result_same = detector.detect(value_same, data)
-        result_different = detector.detect(value_different, data)
+        state = WelfordState.from_values(np.concatenate([expired, zscore_data]))
+        state.remove_batch(expired)
 
-        assert not result_same.is_anomaly
-        assert result_different.is_anomaly
-        assert result_different.score == float('inf')
+        for value in [12, 100, 1]:
+            expected = detector.detect(value, zscore_data)
+            result = detector.detect_from_state(value, state)
+            assert result.is_anomaly == expected.is_anomaly
+            assert result.score == pytest.approx(expected.score)
 
 
 class TestIQRDetector:
@@ -131,20 +186,9 @@ class TestIQRDetector:
 class TestStatisticsCalculation:
     """Test statistical calculation functions."""
 
-    def test_calculate_statistics(self):
+    def test_calculate_statistics(self, ramp_stats):
         """Test comprehensive statistics calculation."""
-        data = [10, 15, 20, 25, 30, 35, 40, 45, 50]
-
-        stats = calculate_statistics(data)
-
-        assert stats['count'] == 9
-        assert stats['mean'] == 30.0
-        assert stats['median'] == 30.0
-        assert stats['min'] == 10.0
-        assert stats['max'] == 50.0
-        assert stats['q1'] == 17.5
-        assert stats['q3'] == 42.5
-        assert stats['iqr'] == 25.0
+        assert ramp_stats == pytest.approx(dict(_RAMP_EXPECTED), rel=1e-12)
 
     def test_calculate_statistics_empty(self):
         """Test statistics calculation with empty data."""
@@ -153,7 +197,20 @@ class TestStatisticsCalculation:
         stats = calculate_statistics(data)
 
         assert stats['count'] == 0
-        assert stats['mean'] == 0.0
+        assert stats['mean'] == pytest.approx(0.0)
+
+    def test_welford_state(self):
+        """Test running mean/variance matches batch statistics."""
+        data = [10, 15, 20, 25, 30, 35, 40, 45, 50]
+
+        state = WelfordState()
+        state.update(data[0])
+        state.update_batch(data[1:5])
+        state.update_batch(data[5:])
+
+        assert state.count == 9
+        assert state.mean == pytest.approx(30.0)
+        assert state.std_dev == pytest.approx(13.693064, rel=1e-6)
 
     def test_is_outlier_by_zscore(self):
         """Test z-score outlier check."""
@@ -163,12 +220,22 @@ class TestStatisticsCalculation:
         # Normal value (within 3 sigma)
         is_outlier, z_score = is_outlier_by_zscore(105, mean, std_dev, threshold=3.0)
         assert not is_outlier
-        assert z_score == 0.5
+        assert z_score == pytest.approx(0.5, rel=1e-12)
 
         # Outlier (beyond 3 sigma)
         is_outlier, z_score = is_outlier_by_zscore(140, mean, std_dev, threshold=3.0)
         assert is_outlier
-        assert z_score == 4.0
+        assert z_score == pytest.approx(4.0, rel=1e-12)
+
+    def test_is_outlier_by_zscore_zero_variance(self):
+        """Test z-score outlier check when every bet had the same size."""
+        is_outlier, z_score = is_outlier_by_zscore(100, 100.0, 0.0, threshold=3.0)
+        assert not is_outlier
+        assert z_score == pytest.approx(0.0)
+
+        is_outlier, z_score = is_outlier_by_zscore(101, 100.0, 0.0, threshold=3.0)
+        assert is_outlier
+        assert z_score == float('inf')
 
     def test_is_outlier_by_iqr(self):
         """Test IQR outlier check."""
@@ -185,80 +252,478 @@ class TestStatisticsCalculation:
         assert 200 > details['upper_bound']
 
 
+def _make_bet(i, size, timestamp=None):
+    """Unsaved Bet on market m1."""
+    return Bet(
+        order_id=f'o{i}', market_id='m1', address='0xa', outcome='YES',
+        size=float(size), price=0.5, timestamp=timestamp or datetime.utcnow()
+    )
+
+
+def _bet_data(bet):
+    """Insert dictionary for an unsaved Bet."""
+    return {column: getattr(bet, column) for column in
+            ('order_id', 'market_id', 'address', 'outcome', 'size', 'price', 'timestamp')}
+
+
+@pytest.mark.integration
 class TestLargeBetDetection:
     """Test large bet detection logic (integration-style tests)."""
 
-    def test_absolute_threshold_detection(self):
+    @pytest.mark.parametrize("bet,expected", [
+        pytest.param(9999.99, None, id="below_medium"),
+        pytest.param(10000, 'medium', id="medium_threshold"),
+        pytest.param(15000, 'medium', id="medium"),
+        pytest.param(55000, 'high', id="high"),
+        pytest.param(125000, 'critical', id="critical"),
+    ])
+    def test_absolute_threshold_detection(self, db, bet, expected):
         """Test absolute threshold detection."""
-        fixtures = load_fixtures()
-
-        # Test medium threshold
-        medium_bet = 15000
-        assert medium_bet >= 10000  # Medium threshold
-        assert medium_bet < 50000   # Below high threshold
+        # Market large enough that the market-relative tier stays quiet
+        db.upsert_market({'id': 'm1', 'question': 'Market 1', 'slug': 'm1', 'total_volume': 1e12})
+        detector = LargeBetDetector(db)
 
-        # Test high threshold
-        high_bet = 55000
-        assert high_bet >= 50000   # High threshold
-        assert high_bet < 100000   # Below critical threshold
+        detection = detector.detect(_make_bet(0, size=bet))
 
-        # Test critical threshold
-        critical_bet = 125000
-        assert critical_bet >= 100000  # Critical threshold
+        if expected is None:
+            assert detection is None
+        else:
+            assert detection.severity == expected
+            assert detection.triggered_tiers == ['absolute_threshold']
 
-    def test_market_relative_detection(self):
+    def test_market_relative_detection(self, market_volume):
         """Test market-relative detection."""
-        fixtures = load_fixtures()
-        market = fixtures['markets'][0]
-        market_volume = market['total_volume']  # 1,000,000
+        assert market_volume == 1000000
 
         # 5% of market volume
         threshold_pct = 5.0
         bet_size = market_volume * (threshold_pct / 100)  # 50,000
 
-        assert bet_size == 50000
+        assert bet_size == pytest.approx(50000, rel=1e-12)
         assert (bet_size / market_volume) * 100 >= threshold_pct
 
 
 class TestNewAccountDetection:
     """Test new account detection logic."""
 
-    def test_new_account_thresholds(self):
-        """Test new account detection thresholds."""
-        # Configuration values
-        new_account_threshold_hours = 72  # 3 days
-        first_n_bets = 10
-        large_bet_threshold = 10000
-        suspicious_first_bet_threshold = 50000
-
-        # Test thresholds
-        assert new_account_threshold_hours == 72
-        assert first_n_bets == 10
-        assert large_bet_threshold == 10000
-        assert suspicious_first_bet_threshold == 50000
-
-    def test_severity_calculation(self):
+    @pytest.mark.parametrize("config_attr,detector_attr,expected", [
+        pytest.param('new_account_threshold_hours', 'new_account_threshold_hours', 72,
+                     id="new_account_threshold_hours"),  # 3 days
+        pytest.param('new_account_first_n_bets', 'first_n_bets', 10, id="first_n_bets"),
+        pytest.param('new_account_large_bet_threshold', 'large_bet_threshold', 10000,
+                     id="large_bet_threshold"),
+        pytest.param('new_account_suspicious_first_bet_threshold', 'suspicious_first_bet_threshold', 50000,
+                     id="suspicious_first_bet_threshold"),
+    ])
+    def test_new_account_thresholds(self, config, db, config_attr, detector_attr, expected):
+        """Test that the shipped config and the detector defaults agree on thresholds."""
+        assert getattr(config, config_attr) == expected
+        assert getattr(NewAccountDetector(db), detector_attr) == expected
+
+    @pytest.mark.parametrize("bet_position,bet_size,age_hours,expected", [
+        # First bet above suspicious threshold = critical
+        pytest.param(1, 55000, 0, 'critical', id="first_bet_critical"),
+        # First bet large but below suspicious = high
+        pytest.param(1, 25000, 0, 'high', id="first_bet_high"),
+        # Large bet within the first 10 of a very new account
+        pytest.param(5, 15000, 12, 'medium', id="early_bet_large"),
+        pytest.param(5, 25000, 12, 'high', id="early_bet_twice_large"),
+        # Account 24-72 hours old, early bet
+        pytest.param(3, 60000, 48, 'high', id="newer_account_suspicious"),
+        # Outside the first 10 bets, or too small to alert
+        pytest.param(11, 15000, 12, None, id="after_first_n"),
+        pytest.param(5, 5000, 12, None, id="small_bet"),
+    ])
+    def test_severity_calculation(self, db, bet_position, bet_size, age_hours, expected):
         """Test severity calculation for new accounts."""
-        # First bet scenarios
-        assert 55000 >= 50000  # First bet above suspicious threshold = critical
-        assert 25000 >= 10000 and 25000 < 50000  # First bet large but below suspicious = high
-
-        # Early bet scenarios (within first 10)
-        bet_position_5 = 5
-        bet_size_15k = 15000
-        assert bet_position_5 <= 10  # Within monitoring window
-        assert bet_size_15k >= 10000  # Large bet
-
-    def test_account_age_calculation(self):
+        now = datetime.utcnow()
+        history = [
+            _make_bet(i, size=100.0, timestamp=now - timedelta(hours=age_hours, minutes=-i))
+            for i in range(bet_position - 1)
+        ]
+        bet = _make_bet(bet_position - 1, size=bet_size, timestamp=now)
+        if history:
+            db.insert_bets_bulk([_bet_data(b) for b in history + [bet]])
+        detector = NewAccountDetector(db)
+
+        detection = detector.detect(bet, now=now)
+
+        if expected is None:
+            assert detection is None
+        else:
+            assert detection.severity == expected
+            assert detection.bet_position == bet_position
+
+    @pytest.mark.parametrize("hours,checks", [
+        pytest.param(12, [(operator.lt, 24)], id="very_new"),  # < 24 hours
+        pytest.param(48, [(operator.ge, 24), (operator.le, 72)], id="new"),  # 24-72 hours
+        pytest.param(168, [(operator.gt, 72)], id="old"),  # > 72 hours (7 days)
+    ])
+    def test_account_age_calculation(self, hours, checks):
         """Test account age calculation."""
-        # Account age boundaries
-        very_new_hours = 12  # < 24 hours
-        new_hours = 48  # 24-72 hours
-        old_hours = 168  # > 72 hours (7 days)
-
-        assert very_new_hours < 24
-        assert 24 <= new_hours <= 72
-        assert old_hours > 72
+        for compare, bound in checks:
+            assert compare(hours, bound)
+
+
+# Bet times (in minutes past _T0) used by the rapid succession tests
+_T0 = datetime(2025, 1, 1, 12, 0, 0, 123456)
+
+
+def _sliding_window_clusters(timestamps, k, window_minutes):
+    """
+    Reference rapid succession scan: the original per-step sliding window.
+
+    Sorts by timestamp and, like the original loop, accepts a window of k
+    bets when its span is <= window_minutes; after a hit it restarts past
+    the cluster so every non-overlapping cluster is reported.
+    """
+    order = sorted(range(len(timestamps)), key=lambda i: timestamps[i])
+    clusters = []
+    i = 0
+    while i <= len(order) - k:
+        cluster = order[i:i + k]
+        time_span = (timestamps[cluster[-1]] - timestamps[cluster[0]]).total_seconds() / 60
+        if time_span <= window_minutes:
+            clusters.append(cluster)
+            i += k
+        else:
+            i += 1
+    return clusters
+
+
+class TestRapidSuccessionClusters:
+    """Test the vectorized rapid succession kernel against the sliding window loop."""
+
+    @pytest.mark.parametrize("minutes,k,window", [
+        pytest.param([0, 1, 2, 3, 5], 5, 5, id="k_bets_at_window_edge"),
+        pytest.param([0, 10, 20, 21, 22, 23, 25], 5, 5, id="k_bets_ending_at_last_bet"),
+        pytest.param([0, 5], 2, 5, id="span_exactly_window"),
+        pytest.param([0, 5 + 1e-6 / 60], 2, 5, id="span_just_over_window"),
+        pytest.param([0, 1, 2], 5, 5, id="fewer_than_k"),
+        pytest.param([], 5, 5, id="no_bets"),
+        pytest.param([4, 0, 3, 1, 2, 30, 9, 10], 5, 5, id="unsorted"),
+        pytest.param([0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 3, 2, id="back_to_back_clusters"),
+    ])
+    def test_matches_sliding_window(self, minutes, k, window):
+        """Test that the kernel finds the original loop's first cluster."""
+        timestamps = [_T0 + timedelta(minutes=m) for m in minutes]
+        sizes = np.arange(1.0, len(minutes) + 1)
+
+        ts = to_unix_seconds(timestamps) if timestamps else np.empty(0)
+        order = np.argsort(ts, kind='stable')
+        first_cluster = find_first_rapid_cluster(ts[order], sizes[order], k, window * 60)
+
+        expected = _sliding_window_clusters(timestamps, k, window)
+        if not expected:
+            assert first_cluster is None
+            return
+        start, end, total_volume = first_cluster
+        assert order[start:end + 1].tolist() == expected[0]
+        assert total_volume == pytest.approx(sizes[expected[0]].sum())
+
+    def test_matches_sliding_window_random(self):
+        """Test kernel/loop first-cluster agreement over random bet times."""
+        rng = np.random.default_rng(7)
+        for _ in range(200):
+            minutes = rng.uniform(0, 60, size=rng.integers(0, 40)).tolist()
+            timestamps = [_T0 + timedelta(minutes=m) for m in minutes]
+            ts = to_unix_seconds(timestamps) if timestamps else np.empty(0)
+            order = np.argsort(ts, kind='stable')
+
+            first_cluster = find_first_rapid_cluster(ts[order], np.ones(len(ts))[order], 4, 5 * 60)
+
+            expected = _sliding_window_clusters(timestamps, 4, 5)
+            if expected:
+                start, end, _ = first_cluster
+                assert order[start:end + 1].tolist() == expected[0]
+            else:
+                assert first_cluster is None
+
+    def test_detector_reports_first_cluster_from_unsorted_bets(self, db):
+        """Test that the detector reports the loop's first cluster for unsorted bets."""
+        detector = PatternDetector(db, rapid_succession_bet_count=3, rapid_succession_time_window_minutes=5)
+        minutes = [12, 3, 0, 20, 1, 11, 10]
+        bets = [
+            Bet(id=i, order_id=f'o{i}', market_id='m1', address='0xa', outcome='YES',
+                size=100.0 * (i + 1), price=0.5, timestamp=_T0 + timedelta(minutes=m))
+            for i, m in enumerate(minutes)
+        ]
+        ts = to_unix_seconds([bet.timestamp for bet in bets])
+        sizes = np.array([bet.size for bet in bets])
+
+        detection = detector._find_rapid_succession('m1', '0xa', bets, ts, sizes, 5)
+
+        first = _sliding_window_clusters([bet.timestamp for bet in bets], 3, 5)[0]
+        assert detection.bet_ids == tuple(first)
+        assert detection.details['bet_count'] == 3
+        assert detection.details['time_span_minutes'] == pytest.approx(3.0)
+        assert detection.details['total_volume'] == pytest.approx(sum(bets[i].size for i in first))
+
+    @pytest.mark.parametrize("min_size", [1, 2, 3])
+    def test_group_indices(self, min_size):
+        """Test that sort-based grouping matches grouping with a dict."""
+        keys = np.array(['0xb', '0xa', '0xc', '0xa', '0xb', '0xa', '0xd'])
+
+        expected = {}
+        for i, key in enumerate(keys.tolist()):
+            expected.setdefault(key, []).append(i)
+
+        groups = {key: indices.tolist() for key, indices in group_indices(keys, min_size)}
+
+        assert groups == {k: v for k, v in expected.items() if len(v) >= min_size}
+
+    def test_group_indices_empty(self):
+        """Test grouping with no keys."""
+        assert group_indices(np.array([])) == []
+
+
+def _buffer_matches_statistics(buffer, expected_sizes):
+    """Check a buffer's running and quantile statistics against calculate_statistics."""
+    expected = calculate_statistics(list(expected_sizes))
+    q1, median, q3 = np.quantile(buffer.sizes, [0.25, 0.5, 0.75])
+
+    assert len(buffer) == buffer.stats.count == expected['count']
+    assert buffer.stats.mean == pytest.approx(expected['mean'], rel=1e-9)
+    assert buffer.stats.std_dev == pytest.approx(expected['std_dev'], rel=1e-9, abs=1e-9)
+    assert (q1, median, q3) == pytest.approx((expected['q1'], expected['median'], expected['q3']))
+
+
+class TestMarketBetBuffer:
+    """Test the per-market rolling bet buffer."""
+
+    @pytest.mark.parametrize("sizes,expected", [
+        pytest.param([1.234, 1.236, 19.99, 0.0], [123, 124, 1999, 0], id="rounding"),
+        pytest.param([0.125, 0.375], [12, 38], id="half_to_even"),
+        pytest.param([1e9, -1e9], [np.iinfo(np.int32).max, np.iinfo(np.int32).min], id="int32_clamp"),
+    ])
+    def test_to_cents(self, sizes, expected):
+        """Test rounding and int32 clamping of bet sizes."""
+        cents = to_cents(sizes)
+
+        assert cents.dtype == np.int32
+        assert cents.tolist() == expected
+
+    def test_in_order_extend(self):
+        """Test statistics after appending bets in order."""
+        buffer = MarketBetBuffer()
+        buffer.extend(np.array([1.0, 2.0, 3.0]), np.array([10.0, 20.5, 31.25]))
+        buffer.extend(np.array([4.0, 5.0]), np.array([5.0, 100.0]))
+
+        assert buffer.timestamps.tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+        _buffer_matches_statistics(buffer, [10.0, 20.5, 31.25, 5.0, 100.0])
+
+    def test_out_of_order_extend(self):
+        """Test that late bets are merged into timestamp order."""
+        buffer = MarketBetBuffer()
+        buffer.extend(np.array([10.0, 30.0]), np.array([1.0, 3.0]))
+        earlier_view = buffer.sizes_since(0)
+
+        buffer.extend(np.array([40.0, 20.0, 5.0]), np.array([4.0, 2.0, 0.5]))
+
+        assert buffer.timestamps.tolist() == [5.0, 10.0, 20.0, 30.0, 40.0]
+        assert buffer.sizes.tolist() == [0.5, 1.0, 2.0, 3.0, 4.0]
+        assert earlier_view.tolist() == [1.0, 3.0]
+        _buffer_matches_statistics(buffer, [0.5, 1.0, 2.0, 3.0, 4.0])
+
+    def test_trim(self):
+        """Test that trimming drops old bets from the sizes and running statistics."""
+        buffer = MarketBetBuffer()
+        buffer.extend(np.arange(10.0), np.arange(1.0, 11.0))
+
+        buffer.trim(4.0)
+
+        assert buffer.timestamps.tolist() == [4.0, 5.0, 6.0, 7.0, 8.0, 9.0]
+        assert buffer.sizes_since(7.0).tolist() == [8.0, 9.0, 10.0]
+        _buffer_matches_statistics(buffer, [5.0, 6.0, 7.0, 8.0, 9.0, 10.0])
+
+    def test_trim_all_then_regrow(self):
+        """Test trimming every bet, then refilling past the old capacity."""
+        buffer = MarketBetBuffer()
+        buffer.extend(np.arange(50.0), np.full(50, 7.0))
+
+        buffer.trim(100.0)
+
+        assert len(buffer) == 0
+        assert buffer.stats.count == 0
+        assert buffer.sizes_since(0).size == 0
+
+        # Enough bets to force a grow-and-compact of the dead region
+        rng = np.random.default_rng(3)
+        sizes = np.round(rng.uniform(1, 5000, size=200), 2)
+        buffer.extend(np.arange(100.0, 300.0), sizes)
+
+        assert buffer.timestamps.tolist() == np.arange(100.0, 300.0).tolist()
+        _buffer_matches_statistics(buffer, sizes)
+
+        buffer.trim(250.0)
+        _buffer_matches_statistics(buffer, sizes[150:])
+
+    def test_trim_compacts_arrays(self):
+        """Test that trimming most bets shrinks the arrays without breaking old views."""
+        buffer = MarketBetBuffer()
+        buffer.extend(np.arange(1000.0), np.full(1000, 2.5))
+        earlier_view = buffer.sizes_since(995.0)
+
+        buffer.trim(990.0)
+
+        assert len(buffer._ts) == 64
+        assert buffer.timestamps.tolist() == np.arange(990.0, 1000.0).tolist()
+        assert earlier_view.tolist() == [2.5] * 5
+        _buffer_matches_statistics(buffer, [2.5] * 10)
+
+    def test_empty_buffers_not_kept(self, db):
+        """Test that markets without bets in the window hold no buffer."""
+        calculator = MarketStatisticsCalculator(db)
+        db.insert_bet({
+            'order_id': 'stale', 'market_id': 'm1', 'address': '0xa', 'outcome': 'YES',
+            'size': 10.0, 'price': 0.5, 'timestamp': datetime.utcnow() - timedelta(hours=25)
+        })
+
+        assert len(calculator.get_market_buffer('m1')) == 0
+        assert 'm1' not in calculator._buffers
+
+    def test_sweep_drops_expired_buffers(self, db):
+        """Test that a sweep drops buffers whose bets have all expired."""
+        calculator = MarketStatisticsCalculator(db)
+        for market_id in ('m1', 'm2'):
+            db.insert_bet({
+                'order_id': market_id, 'market_id': market_id, 'address': '0xa', 'outcome': 'YES',
+                'size': 10.0, 'price': 0.5, 'timestamp': datetime.utcnow() - timedelta(hours=1)
+            })
+            calculator.get_market_buffer(market_id)
+
+        calculator._sweep_buffers(window_start=hours_ago(0))
+
+        assert calculator._buffers == {}
+
+    def test_sorted_cache_drops_expired_keys(self, db):
+        """Test that expired percentile cache entries are removed on write."""
+        calculator = MarketStatisticsCalculator(db)
+        db.insert_bet({
+            'order_id': 'o1', 'market_id': 'm1', 'address': '0xa', 'outcome': 'YES',
+            'size': 10.0, 'price': 0.5, 'timestamp': datetime.utcnow() - timedelta(hours=1)
+        })
+        assert calculator.calculate_percentile_rank(10.0, 'm1') == 100.0
+        assert calculator.calculate_percentile_rank(10.0, 'gone') == 0.0
+
+        # Age both entries past the TTL, then rank another market
+        for key, (built, cents) in list(calculator._sorted_cache.items()):
+            calculator._sorted_cache[key] = (built - calculator.SORTED_CACHE_SECONDS, cents)
+        calculator.calculate_percentile_rank(10.0, 'm1', hours=6)
+
+        assert list(calculator._sorted_cache) == [('m1', 6)]
+
+    def test_get_market_buffer_incremental_sync(self, db):
+        """Test that repeat calls load only new bets, including late-arriving ones."""
+        calculator = MarketStatisticsCalculator(db)
+        now = datetime.utcnow()
+
+        def insert(order_id, size, minutes_ago, market_id='m1'):
+            db.insert_bet({
+                'order_id': order_id, 'market_id': market_id, 'address': '0xa',
+                'outcome': 'YES', 'size': size, 'price': 0.5,
+                'timestamp': now - timedelta(minutes=minutes_ago)
+            })
+
+        insert('stale', 999.0, 25 * 60)  # Outside the buffer window
+        insert('other', 55.0, 10, market_id='m2')
+        for i, (size, minutes_ago) in enumerate([(10.0, 120), (20.0, 60), (30.0, 30)]):
+            insert(f'a{i}', size, minutes_ago)
+
+        buffer = calculator.get_market_buffer('m1')
+        first_id = buffer.last_bet_id
+        _buffer_matches_statistics(buffer, [10.0, 20.0, 30.0])
+
+        # A newer bet plus one that arrives late with an older timestamp
+        insert('b0', 40.0, 5)
+        insert('b1', 15.0, 90)
+
+        assert calculator.get_market_buffer('m1') is buffer
+        assert buffer.last_bet_id > first_id
+        assert buffer.sizes.tolist() == [10.0, 15.0, 20.0, 30.0, 40.0]
+        _buffer_matches_statistics(buffer, [10.0, 15.0, 20.0, 30.0, 40.0])
+
+        # Nothing new: the buffer is unchanged
+        calculator.get_market_buffer('m1')
+        assert len(buffer) == 5
+
+
+@pytest.fixture
+def scan_db(db):
+    """Repository holding bets for new account scans, with a shared timestamp."""
+    now = datetime.utcnow()
+    db.upsert_market({'id': 'm1', 'question': 'Market 1', 'slug': 'm1', 'total_volume': 2.0})
+    db.upsert_market({'id': 'm2', 'question': 'Market 2', 'slug': 'm2', 'total_volume': 1.0})
+    db.upsert_market({'id': 'm3', 'question': 'Closed', 'slug': 'm3', 'active': False})
+
+    tie = now - timedelta(hours=2)
+    bets = [
+        # (address, market, size, hours ago)
+        ('0xold', 'm1', 500.0, 24 * 10),  # First seen 10 days ago
+        ('0xold', 'm1', 20000.0, 1),
+        ('0xnew', 'm1', 20000.0, 3),
+        ('0xnew', 'm2', 60000.0, 2),
+        ('0xnew', 'm1', 15000.0, 2),
+        ('0xsmall', 'm2', 500.0, 2),
+        ('0xtie', 'm2', 12000.0, 2),
+        ('0xtie', 'm1', 30000.0, 2),
+        ('0xclosed', 'm3', 90000.0, 1),
+        ('0xlate', 'm2', 11000.0, 0.5),
+    ]
+    db.insert_bets_bulk([
+        {
+            'order_id': f'o{i}', 'market_id': market_id, 'address': address,
+            'outcome': 'YES', 'size': size, 'price': 0.5,
+            # Bets placed "2 hours ago" all share one timestamp
+            'timestamp': tie if age_hours == 2 else now - timedelta(hours=age_hours)
+        }
+        for i, (address, market_id, size, age_hours) in enumerate(bets)
+    ])
+    return db
+
+
+class TestNewAccountScan:
+    """Test paginated new account scans against a real repository."""
+
+    def test_get_recent_bets_pages(self, scan_db):
+        """Test that keyset pages return every bet once, ties included."""
+        expected = scan_db.get_recent_bets()
+
+        pages, cursor = [], None
+        while True:
+            page = scan_db.get_recent_bets(after=cursor, limit=2)
+            pages.extend(page)
+            if len(page) < 2:
+                break
+            cursor = (page[-1].timestamp, page[-1].id)
+
+        assert [bet.id for bet in pages] == [bet.id for bet in expected]
+        assert len(expected) == 10
+
+    @pytest.mark.parametrize("batch_size", [1, 2, 3, 500])
+    def test_detections_across_pages(self, scan_db, batch_size):
+        """Test that page size doesn't change which bets are detected."""
+        detector = NewAccountDetector(scan_db, aggregation_window_seconds=0)
+
+        detections = list(detector.iter_new_account_detections(batch_size=batch_size))
+
+        assert [d.bet.order_id for d in detections] == ['o2', 'o3', 'o4', 'o6', 'o7', 'o9']
+
+    def test_aggregation_across_pages(self, scan_db):
+        """Test one detection per address even when its bets span pages."""
+        detector = NewAccountDetector(scan_db)
+
+        detections = list(detector.iter_new_account_detections(batch_size=2))
+
+        assert [d.address for d in detections] == ['0xnew', '0xtie', '0xlate']
+
+    def test_limit_detections(self, scan_db):
+        """Test that the scan stops after limit_detections."""
+        detector = NewAccountDetector(scan_db, aggregation_window_seconds=0)
+
+        detections = list(detector.iter_new_account_detections(limit_detections=2, batch_size=2))
+
+        assert [d.bet.order_id for d in detections] == ['o2', 'o3']
 
 
 if __name__ == '__main__':
@@ -0,0 +1,49 @@
+"""
+Unit tests for JSON encoding of alert details.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from detection.anomaly_algorithms import ZScoreDetector
+from utils.json_codec import dumps, loads
+
+
+class TestJsonCodec:
+    """Test dumps/loads round trips."""
+
+    def test_round_trip_inf_score(self):
+        """Test that a zero-variance z-score of inf survives a round trip."""
+        result = ZScoreDetector(threshold=3.0).detect(15, [10] * 5)
+        details = {'patterns': [{'details': {'method': 'z_score', 'score': result.score}}]}
+
+        decoded = loads(dumps(details))
+
+        assert decoded['patterns'][0]['details']['score'] == float('inf')
+
+    @pytest.mark.parametrize("value", [
+        pytest.param(float('-inf'), id="neg_inf"),
+        pytest.param(np.float64('inf'), id="numpy_inf"),
+        pytest.param([1.0, float('inf')], id="list"),
+        pytest.param(np.array([1.0, np.inf]), id="array"),
+    ])
+    def test_round_trip_non_finite(self, value):
+        """Test that non-finite floats are not written as null."""
+        decoded = loads(dumps({'score': value}))['score']
+
+        assert decoded is not None
+        assert np.array_equal(decoded, value)
+
+    def test_round_trip_nan(self):
+        """Test that NaN decodes as NaN rather than None."""
+        decoded = loads(dumps({'score': float('nan')}))
+
+        assert math.isnan(decoded['score'])
+
+    def test_round_trip_finite(self):
+        """Test that finite payloads round trip unchanged."""
+        details = {'score': 4.5, 'bet_size': np.float64(50000.0), 'n': 3, 'tags': ['a']}
+
+        assert loads(dumps(details)) == details
@@ -0,0 +1,62 @@
+"""
+Unit tests for the database repository.
+"""
+
+from datetime import datetime, timedelta
+
+from database.models import Bet
+
+
+def _bet(order_id, size=100.0, minutes_ago=0):
+    """Bet data dictionary for insert calls."""
+    return {
+        'order_id': order_id, 'market_id': 'm1', 'address': '0xa',
+        'outcome': 'YES', 'size': size, 'price': 0.5,
+        'timestamp': datetime.utcnow() - timedelta(minutes=minutes_ago)
+    }
+
+
+class TestInsertBetsBulk:
+    """Test bulk bet inserts."""
+
+    def test_returns_new_bets_in_input_order(self, db):
+        """Test that inserted bets come back with IDs, in input order."""
+        inserted = db.insert_bets_bulk([_bet('o2', 20.0), _bet('o1', 10.0)])
+
+        assert [bet.order_id for bet in inserted] == ['o2', 'o1']
+        assert all(bet.id for bet in inserted)
+        assert [bet.size for bet in inserted] == [20.0, 10.0]
+
+    def test_duplicates_within_batch(self, db):
+        """Test that a trade repeated in one batch is inserted once, first copy kept."""
+        inserted = db.insert_bets_bulk([_bet('o1', 10.0), _bet('o2'), _bet('o1', 99.0)])
+
+        assert [bet.order_id for bet in inserted] == ['o1', 'o2']
+        assert [bet.size for bet in db.get_recent_bets() if bet.order_id == 'o1'] == [10.0]
+
+    def test_existing_order_id_skipped(self, db):
+        """Test that re-inserting a stored order_id returns only the new bets."""
+        db.insert_bet(_bet('o1', 10.0, minutes_ago=5))
+
+        inserted = db.insert_bets_bulk([_bet('o1', 99.0), _bet('o2')])
+
+        assert [bet.order_id for bet in inserted] == ['o2']
+        assert sorted(bet.order_id for bet in db.get_recent_bets()) == ['o1', 'o2']
+
+    def test_all_existing(self, db):
+        """Test a batch that is entirely already stored."""
+        db.insert_bets_bulk([_bet('o1'), _bet('o2')])
+
+        assert db.insert_bets_bulk([_bet('o2'), _bet('o1')]) == []
+        assert len(db.get_recent_bets()) == 2
+
+    def test_empty_batch(self, db):
+        """Test that an empty batch inserts nothing."""
+        assert db.insert_bets_bulk([]) == []
+
+    def test_sessions_share_in_memory_database(self, db):
+        """Test that every session of an in-memory repository sees the same data."""
+        db.insert_bets_bulk([_bet('o1')])
+
+        with db.get_session() as session:
+            assert session.query(Bet).count() == 1